@@ -8,9 +8,18 @@ __author__ = """MIT Data To AI Lab"""
 __email__ = 'dailabmit@gmail.com'
 __version__ = '0.3.7.dev0'
 
-from sdv.demo import get_available_demos, load_demo
-from sdv.metadata import Metadata
-from sdv.sdv import SDV
+import importlib
+import sys
+
+# Public names and the modules that define them. They are imported on first
+# access, so that ``import sdv`` does not pull in the heavy dependencies.
+_LAZY_ATTRIBUTES = {
+    'get_available_demos': 'sdv.demo',
+    'load_demo': 'sdv.demo',
+    'Metadata': 'sdv.metadata',
+    'SDV': 'sdv.sdv',
+}
+_LAZY_SUBMODULES = ('benchmark', 'demo', 'evaluation', 'metadata')
 
 __all__ = (
     'get_available_demos',
@@ -18,3 +27,26 @@ __all__ = (
     'Metadata',
     'SDV',
 )
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module('sdv.' + name)
+
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_SUBMODULES))
+
+
+if sys.version_info < (3, 7):
+    # Module level ``__getattr__`` (PEP 562) is not supported, import eagerly.
+    from sdv.demo import get_available_demos, load_demo  # noqa: F401
+    from sdv.metadata import Metadata  # noqa: F401
+    from sdv.sdv import SDV  # noqa: F401
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+"""SDV Constraints Benchmarking."""
+
+import logging
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from sdv.constraints.tabular import (
+    Between, Chain, ColumnFormula, CustomConstraint, GreaterThan, UniqueCombinations)
+
+LOGGER = logging.getLogger(__name__)
+
+METHODS = ('fit', 'transform', 'reverse_transform', 'is_valid')
+
+
+def _log(table_data):
+    return np.log(table_data)
+
+
+def _exp(table_data):
+    return np.exp(table_data)
+
+
+def _is_positive(table_data):
+    return (table_data > 0).all(axis=1)
+
+
+def _add(low, high):
+    return low + high
+
+
+def get_benchmark_data(num_rows=10000, cardinality=10, random_state=None):
+    """Generate a table that fulfills all the benchmark constraints.
+
+    Args:
+        num_rows (int):
+            Number of rows to generate. Defaults to 10000.
+        cardinality (int):
+            Number of distinct values of each categorical column. The number of
+            distinct combinations of the two categorical columns is at most
+            ``cardinality * 2``. Defaults to 10.
+        random_state (int or numpy.random.Generator):
+            Seed or ``Generator`` used to generate the data.
+
+    Returns:
+        pandas.DataFrame:
+            Generated table.
+    """
+    random_state = np.random.default_rng(random_state)
+    categories = random_state.integers(cardinality, size=num_rows)
+    low = random_state.uniform(1, 100, size=num_rows)
+    high = low + random_state.exponential(10, size=num_rows)
+    steps = random_state.exponential(1, size=(num_rows, 2)).cumsum(axis=1)
+
+    return pd.DataFrame({
+        'category': categories.astype(str),
+        'subcategory': (categories * 2 + random_state.integers(2, size=num_rows)).astype(str),
+        'low': low,
+        'high': high,
+        'total': low + high,
+        'between': low + random_state.uniform(size=num_rows) * (high - low),
+        'first': low,
+        'second': low + steps[:, 0],
+        'third': low + steps[:, 1],
+    })
+
+
+def get_benchmark_constraints():
+    """Build one unfitted instance of every constraint in ``sdv.constraints.tabular``.
+
+    The constraints are built for the columns of the ``get_benchmark_data`` table.
+
+    Returns:
+        dict:
+            Constraints by name.
+    """
+    return {
+        'CustomConstraint': CustomConstraint(
+            transform=_log, reverse_transform=_exp, is_valid=_is_positive, columns=['low']),
+        'UniqueCombinations': UniqueCombinations(['category', 'subcategory']),
+        'GreaterThan': GreaterThan('low', 'high'),
+        'ColumnFormula': ColumnFormula(
+            'total', _add, columns=['low', 'high'], vectorized=True),
+        'Chain': Chain(['first', 'second', 'third']),
+        'Between': Between('between', 'low', 'high'),
+    }
+
+
+def _measure(function, table_data, iterations):
+    """Measure the fastest run of ``function`` and the peak memory allocated by it.
+
+    Memory is traced in a separate run, since tracing slows down the execution.
+    """
+    seconds = float('inf')
+    for _ in range(iterations):
+        start = time.perf_counter()
+        output = function(table_data)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.clear_traces()
+    else:
+        tracemalloc.start()
+
+    current = tracemalloc.get_traced_memory()[0]
+    function(table_data)
+    peak_memory = tracemalloc.get_traced_memory()[1] - current
+
+    if not tracing:
+        tracemalloc.stop()
+
+    return output, seconds, peak_memory
+
+
+def benchmark_constraints(num_rows=10000, cardinality=10, iterations=3, random_state=0):
+    """Measure the cost of the methods of every constraint.
+
+    ``fit``, ``transform``, ``reverse_transform`` and ``is_valid`` are run on a
+    table generated by ``get_benchmark_data``, keeping the fastest of several
+    runs, and the peak memory allocated by each method is traced with
+    ``tracemalloc``.
+
+    Args:
+        num_rows (int):
+            Number of rows of the benchmark table. Defaults to 10000.
+        cardinality (int):
+            Number of distinct values of the categorical columns. Defaults to 10.
+        iterations (int):
+            Number of times that each method is run. Defaults to 3.
+        random_state (int or numpy.random.Generator):
+            Seed or ``Generator`` used to generate the data. Defaults to 0.
+
+    Returns:
+        pandas.DataFrame:
+            One row per constraint and method with the number of ``rows``, the
+            ``seconds`` taken, the ``rows_per_second`` and the ``peak_memory``
+            in bytes.
+    """
+    table_data = get_benchmark_data(num_rows, cardinality, random_state)
+
+    results = list()
+    for name, constraint in get_benchmark_constraints().items():
+        LOGGER.info('Benchmarking constraint %s', name)
+        _, fit_seconds, fit_memory = _measure(constraint.fit, table_data, iterations)
+        transformed, transform_seconds, transform_memory = _measure(
+            constraint.transform, table_data, iterations)
+        _, reverse_seconds, reverse_memory = _measure(
+            constraint.reverse_transform, transformed, iterations)
+        _, valid_seconds, valid_memory = _measure(constraint.is_valid, table_data, iterations)
+
+        measures = zip(
+            METHODS,
+            (fit_seconds, transform_seconds, reverse_seconds, valid_seconds),
+            (fit_memory, transform_memory, reverse_memory, valid_memory),
+        )
+        for method, seconds, peak_memory in measures:
+            results.append({
+                'constraint': name,
+                'method': method,
+                'rows': num_rows,
+                'seconds': seconds,
+                'rows_per_second': num_rows / seconds if seconds else float('inf'),
+                'peak_memory': peak_memory,
+            })
+
+    return pd.DataFrame(results)
+
+
+def check_regressions(results, baseline, threshold=0.2, min_seconds=0.001):
+    """Check that the throughput of the constraints did not drop below a baseline.
+
+    Args:
+        results (pandas.DataFrame):
+            Output of ``benchmark_constraints``.
+        baseline (pandas.DataFrame or str):
+            Output of a previous ``benchmark_constraints`` run, or path to a CSV
+            file where it was stored. Constraints and methods missing from it
+            are not checked.
+        threshold (float):
+            Maximum allowed drop of ``rows_per_second``, relative to the
+            baseline. Defaults to 0.2.
+        min_seconds (float):
+            Methods that took less than this number of seconds are not checked,
+            since their timings are dominated by noise. Defaults to 0.001.
+
+    Returns:
+        pandas.DataFrame:
+            The results merged with the ``baseline_rows_per_second`` and the
+            relative ``change`` in throughput.
+
+    Raises:
+        ValueError:
+            If the throughput of any method dropped more than the threshold.
+    """
+    if isinstance(baseline, str):
+        baseline = pd.read_csv(baseline)
+
+    baseline = baseline[['constraint', 'method', 'rows_per_second']]
+    baseline = baseline.rename(columns={'rows_per_second': 'baseline_rows_per_second'})
+    comparison = results.merge(baseline, on=['constraint', 'method'])
+    comparison['change'] = (
+        comparison['rows_per_second'] / comparison['baseline_rows_per_second'] - 1)
+
+    regressed = comparison['change'] < -threshold
+    regressions = comparison[regressed & (comparison['seconds'] >= min_seconds)]
+    if not regressions.empty:
+        raise ValueError('Throughput dropped more than {:.0%} for: {}'.format(
+            threshold,
+            ', '.join(
+                '{}.{} ({:.0%})'.format(row.constraint, row.method, row.change)
+                for row in regressions.itertuples()
+            )
+        ))
+
+    return comparison
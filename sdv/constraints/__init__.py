@@ -1,7 +1,9 @@
 """SDV Constraints module."""
 
 from sdv.constraints.base import Constraint
+from sdv.constraints.plan import ConstraintPlan
 
 __all__ = [
     'Constraint',
+    'ConstraintPlan',
 ]
@@ -62,11 +62,22 @@ class ConstraintMeta(type):
 
 
 class Constraint(metaclass=ConstraintMeta):
-    """Constraint base class."""
+    """Constraint base class.
+
+    Subclasses whose ``transform``, ``reverse_transform`` and ``make_valid``
+    methods accept an ``inplace`` argument set ``_supports_inplace`` to ``True``.
+    Callers that own the table they pass, such as the ``Table`` pipeline, use
+    ``inplace=True`` to let them modify it instead of working on a copy.
+
+    The random values drawn by ``make_valid`` come from the ``Generator`` given
+    to ``set_random_state``, or from the global random state if none was given.
+    """
 
     _handling_strategy = 'all'
+    _supports_inplace = False
+    _random_state = None
 
-    def _identity(self, table_data):
+    def _identity(self, table_data, inplace=False):
         return table_data
 
     def __init__(self):
@@ -75,17 +86,36 @@ class Constraint(metaclass=ConstraintMeta):
         elif self._handling_strategy == 'reject_sampling':
             self.transform = self._identity
             self.reverse_transform = self._identity
+        elif self._handling_strategy == 'conditional_sampling':
+            if type(self).make_valid is Constraint.make_valid:
+                raise ValueError('{} does not support conditional sampling'.format(
+                    self.__class__.__name__))
+
+            self.transform = self._identity
+            self.reverse_transform = self.make_valid
+            self.filter_valid = self._identity
+
+    def set_random_state(self, random_state):
+        """Set the generator that ``make_valid`` draws its random values from.
+
+        Args:
+            random_state (numpy.random.Generator or None):
+                Generator to use. If ``None``, the global random state is used.
+        """
+        self._random_state = random_state
 
     def fit(self, table_data):
         """No-op method."""
         pass
 
-    def transform(self, table_data):
+    def transform(self, table_data, inplace=False):
         """Identity method for completion. To be optionally overwritten by subclasses.
 
         Args:
             table_data (pandas.DataFrame):
                 Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
 
         Returns:
             pandas.DataFrame:
@@ -93,26 +123,34 @@ class Constraint(metaclass=ConstraintMeta):
         """
         return table_data
 
-    def fit_transform(self, table_data):
+    def fit_transform(self, table_data, inplace=False):
         """Fit this Constraint to the data and then transform it.
 
         Args:
             table_data (pandas.DataFrame):
                 Table data.
+            inplace (bool):
+                Whether the table data can be modified. Only used if
+                ``_supports_inplace`` is ``True``. Defaults to ``False``.
 
         Returns:
             pandas.DataFrame:
                 Transformed data.
         """
         self.fit(table_data)
+        if self._supports_inplace:
+            return self.transform(table_data, inplace=inplace)
+
         return self.transform(table_data)
 
-    def reverse_transform(self, table_data):
+    def reverse_transform(self, table_data, inplace=False):
         """Identity method for completion. To be optionally overwritten by subclasses.
 
         Args:
             table_data (pandas.DataFrame):
                 Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
 
         Returns:
             pandas.DataFrame:
@@ -133,6 +171,27 @@ class Constraint(metaclass=ConstraintMeta):
         """
         return pd.Series(True, index=table_data.index)
 
+    def make_valid(self, table_data, inplace=False):
+        """Replace the constrained values of the invalid rows.
+
+        The new values are sampled from a distribution learned during ``fit``,
+        so that every row is valid without rejecting any of them. Each subclass
+        documents which part of the row, if any, this distribution is conditioned
+        on. To be implemented by the subclasses that support the
+        ``conditional_sampling`` handling strategy.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
+
+        Returns:
+            pandas.DataFrame:
+                Table data with all the rows valid.
+        """
+        raise NotImplementedError()
+
     def filter_valid(self, table_data):
         """Get only the rows that are valid.
 
@@ -0,0 +1,125 @@
+"""Compiled evaluation of the constraints of a table."""
+
+import logging
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ConstraintPlan:
+    """Evaluate the ``is_valid`` method of several constraints at once.
+
+    Instead of filtering the data with each constraint in turn, which slices
+    the table once per constraint, the ``is_valid`` masks of all the constraints
+    are combined into a single boolean array and the table is sliced once.
+
+    Only the constraints that filter rows are evaluated, which excludes those
+    handled with the ``transform`` and ``conditional_sampling`` strategies.
+
+    The number of rows rejected by each constraint is accumulated across
+    calls for diagnostics. A row that breaks several constraints is counted
+    once for each one of them. The number of rows that fulfill all of them
+    gives an estimate of the acceptance rate of the constraint set.
+
+    Args:
+        constraints (list[Constraint]):
+            Fitted constraints to evaluate.
+    """
+
+    FILTERING_STRATEGIES = ('all', 'reject_sampling')
+
+    def __init__(self, constraints):
+        self._constraints = [
+            (position, constraint)
+            for position, constraint in enumerate(constraints)
+            if constraint._handling_strategy in self.FILTERING_STRATEGIES
+        ]
+        self.reset()
+
+    @staticmethod
+    def _get_name(position, constraint):
+        return '{}_{}'.format(constraint.__class__.__name__, position)
+
+    def reset(self):
+        """Reset the rejection counters."""
+        self._num_evaluated = 0
+        self._num_valid = 0
+        self._num_rejected = {
+            self._get_name(position, constraint): 0
+            for position, constraint in self._constraints
+        }
+
+    def is_valid(self, table_data):
+        """Say whether the given table rows fulfill all the constraints.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+
+        Returns:
+            numpy.ndarray:
+                Boolean array indicating whether each row is valid.
+        """
+        valid = np.ones(len(table_data), dtype=bool)
+        for position, constraint in self._constraints:
+            constraint_valid = np.asarray(constraint.is_valid(table_data), dtype=bool)
+            self._num_rejected[self._get_name(position, constraint)] += int(
+                len(constraint_valid) - constraint_valid.sum())
+            valid &= constraint_valid
+
+        self._num_evaluated += len(table_data)
+        self._num_valid += int(valid.sum())
+        return valid
+
+    def filter_valid(self, table_data):
+        """Get only the rows that fulfill all the constraints.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+
+        Returns:
+            pandas.DataFrame:
+                Table containing only the valid rows.
+        """
+        if not self._constraints:
+            return table_data
+
+        valid = self.is_valid(table_data)
+        if valid.all():
+            return table_data
+
+        LOGGER.debug('%s invalid rows out of %s.', len(valid) - valid.sum(), len(valid))
+        return table_data[valid]
+
+    def get_rejections(self):
+        """Get the number of rows evaluated and rejected by each constraint.
+
+        Returns:
+            dict:
+                Number of ``evaluated`` rows, number of ``valid`` rows and number of
+                ``rejected`` rows per constraint, named after their class and
+                position in the list.
+        """
+        return {
+            'evaluated': self._num_evaluated,
+            'valid': self._num_valid,
+            'rejected': dict(self._num_rejected),
+        }
+
+    def get_acceptance_rate(self):
+        """Estimate the proportion of sampled rows that fulfill all the constraints.
+
+        Returns:
+            float:
+                Proportion of the evaluated rows that were valid, ``1.0`` if there are
+                no constraints to evaluate, or ``None`` if no rows were evaluated yet.
+        """
+        if not self._constraints:
+            return 1.0
+
+        if not self._num_evaluated:
+            return None
+
+        return self._num_valid / self._num_evaluated
@@ -0,0 +1,137 @@
+"""Relational constraints.
+
+This module contains constraints that relate the rows of a child table with
+the row of their parent table. They are evaluated by the ``Sampler`` on the
+child rows sampled for each parent row, in the original data space, and the
+child rows that break them are sampled again.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class CrossTableConstraint:
+    """Constraint between the rows of a child table and the row of their parent.
+
+    Args:
+        parent (str):
+            Name of the parent table.
+        child (str):
+            Name of the child table.
+    """
+
+    def __init__(self, parent, child):
+        self.parent = parent
+        self.child = child
+
+    def is_valid(self, parent_row, child_rows):
+        """Say whether each child row is valid given its parent row.
+
+        Args:
+            parent_row (pandas.Series):
+                Parent row.
+            child_rows (pandas.DataFrame):
+                Rows of the child table that belong to the parent row.
+
+        Returns:
+            pandas.Series:
+                Whether each child row is valid.
+        """
+        return pd.Series(True, index=child_rows.index)
+
+
+class ChildGreaterThan(CrossTableConstraint):
+    """Ensure that a child column is greater than a column of the parent.
+
+    For example, that the ``date`` of each transaction is after the
+    ``created_at`` date of its account.
+
+    Args:
+        parent (str):
+            Name of the parent table.
+        child (str):
+            Name of the child table.
+        parent_column (str):
+            Name of the column of the parent table that contains the low value.
+        child_column (str):
+            Name of the column of the child table that contains the high value.
+        strict (bool):
+            Whether the child value must be strictly greater. Defaults to ``False``.
+    """
+
+    def __init__(self, parent, child, parent_column, child_column, strict=False):
+        super().__init__(parent, child)
+        self.parent_column = parent_column
+        self.child_column = child_column
+        self.strict = strict
+
+    def is_valid(self, parent_row, child_rows):
+        """Say whether the child column is greater than the parent column in each row.
+
+        Args:
+            parent_row (pandas.Series):
+                Parent row.
+            child_rows (pandas.DataFrame):
+                Rows of the child table that belong to the parent row.
+
+        Returns:
+            pandas.Series:
+                Whether each child row is valid.
+        """
+        low = parent_row[self.parent_column]
+        if self.strict:
+            return child_rows[self.child_column] > low
+
+        return child_rows[self.child_column] >= low
+
+
+class ChildSumLessThan(CrossTableConstraint):
+    """Ensure that the sum of a child column does not exceed a column of the parent.
+
+    For example, that the ``amount`` of the transactions of an account
+    does not add up to more than its ``limit``. The child rows are accumulated
+    in order, and only those that would make the sum exceed the limit are
+    considered invalid, so the sum of the valid ones never exceeds it.
+
+    Args:
+        parent (str):
+            Name of the parent table.
+        child (str):
+            Name of the child table.
+        parent_column (str):
+            Name of the column of the parent table that contains the maximum sum.
+        child_column (str):
+            Name of the column of the child table to sum.
+        strict (bool):
+            Whether the sum must be strictly less. Defaults to ``False``.
+    """
+
+    def __init__(self, parent, child, parent_column, child_column, strict=False):
+        super().__init__(parent, child)
+        self.parent_column = parent_column
+        self.child_column = child_column
+        self.strict = strict
+
+    def is_valid(self, parent_row, child_rows):
+        """Say whether the sum of the child column is below the parent column.
+
+        Args:
+            parent_row (pandas.Series):
+                Parent row.
+            child_rows (pandas.DataFrame):
+                Rows of the child table that belong to the parent row.
+
+        Returns:
+            pandas.Series:
+                Whether each child row is valid.
+        """
+        high = parent_row[self.parent_column]
+        total = 0
+        valid = np.zeros(len(child_rows), dtype=bool)
+        for position, value in enumerate(child_rows[self.child_column].values):
+            new_total = total + value
+            valid[position] = new_total < high if self.strict else new_total <= high
+            if valid[position]:
+                total = new_total
+
+        return pd.Series(valid, index=child_rows.index)
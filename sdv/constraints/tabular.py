@@ -5,12 +5,79 @@ and which can affect one or more columns at a time, as well as one or more
 rows.
 """
 
+import functools
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
 
 from sdv.constraints.base import Constraint, import_object
 
 
+def _apply_in_chunks(function, table_data, n_jobs):
+    """Apply a row-wise function to chunks of the table across ``n_jobs`` processes.
+
+    Args:
+        function (callable):
+            Picklable function that takes a ``pandas.DataFrame`` and returns
+            an array with one value per row.
+        table_data (pandas.DataFrame):
+            Table data.
+        n_jobs (int):
+            Number of processes to use. If ``-1``, one process per CPU is used.
+
+    Returns:
+        numpy.ndarray:
+            Concatenated results of all the chunks.
+    """
+    if n_jobs < 0:
+        n_jobs = os.cpu_count()
+
+    bounds = np.linspace(0, len(table_data), n_jobs + 1).astype(int)
+    chunks = [table_data.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        results = executor.map(function, chunks)
+        return np.concatenate([np.asarray(result) for result in results])
+
+
+def _apply_formula(formula, columns, vectorized, table_data):
+    """Apply a ``ColumnFormula`` formula to the given columns of the table."""
+    if vectorized:
+        return formula(*[table_data[column].values for column in columns])
+
+    return formula(table_data[columns])
+
+
+def _get_nanoseconds(values):
+    """Get the ``int64`` nanoseconds of datetime or timedelta values and their ``NaT`` mask.
+
+    Timezone aware datetimes are given in UTC.
+    """
+    values = np.asarray(values)
+    unit = 'M8[ns]' if values.dtype.kind == 'M' else 'm8[ns]'
+    values = values.astype(unit, copy=False)
+    return values.view(np.int64), np.isnat(values)
+
+
+def _from_nanoseconds(nanoseconds, missing, dtype):
+    """Build datetime or timedelta values of the given ``dtype`` from ``int64`` nanoseconds.
+
+    Timezone aware datetimes are converted back from UTC to their timezone.
+    """
+    unit = 'M8[ns]' if dtype.kind == 'M' else 'm8[ns]'
+    values = np.array(nanoseconds, dtype=np.int64).view(unit)
+    values[missing] = np.datetime64('NaT') if dtype.kind == 'M' else np.timedelta64('NaT')
+    if getattr(dtype, 'tz', None) is not None:
+        return pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(dtype.tz).astype(dtype)
+
+    if isinstance(dtype, np.dtype):
+        values = values.astype(dtype, copy=False)
+
+    return values
+
+
 class CustomConstraint(Constraint):
     """Custom Constraint Class.
 
@@ -18,6 +85,10 @@ class CustomConstraint(Constraint):
     and ``is_valid`` methods as optional arguments, so users can
     pass custom functions for each one of them.
 
+    If ``columns`` are given, the functions only receive those columns of the
+    table. The columns returned by ``transform`` and ``reverse_transform`` replace
+    them in the table, and ``is_valid`` returns one value per row.
+
     Args:
         tranform (callable):
             Function to replace the ``tranform`` method.
@@ -25,17 +96,60 @@ class CustomConstraint(Constraint):
             Function to replace the ``reverse_tranform`` method.
         is_valid (callable):
             Function to replace the ``is_valid`` method.
+        columns (list[str]):
+            Names of the columns read by the functions. If ``None``, the
+            functions receive the complete table.
     """
 
-    def __init__(self, transform=None, reverse_transform=None, is_valid=None):
+    _transform = None
+    _reverse_transform = None
+    _is_valid = None
+
+    def __init__(self, transform=None, reverse_transform=None, is_valid=None, columns=None):
+        self._columns = columns
+        # Only the restricted methods accept ``inplace``, the user functions do not.
+        self._supports_inplace = columns is not None
         if transform is not None:
-            self.transform = import_object(transform)
+            self._transform = import_object(transform)
+            self.transform = self._transform if columns is None else self._restricted_transform
 
         if reverse_transform is not None:
-            self.reverse_transform = import_object(reverse_transform)
+            self._reverse_transform = import_object(reverse_transform)
+            self.reverse_transform = (
+                self._reverse_transform if columns is None else self._restricted_reverse_transform)
 
         if is_valid is not None:
-            self.is_valid = import_object(is_valid)
+            self._is_valid = import_object(is_valid)
+            self.is_valid = self._is_valid if columns is None else self._restricted_is_valid
+
+    def _restrict(self, function, table_data, inplace):
+        """Apply a transformation to ``self._columns`` and write back the columns it returns.
+
+        The returned columns overwrite the existing ones in their position, new
+        ones are added at the end and the columns not returned are removed.
+        """
+        transformed = function(table_data[self._columns])
+        if not inplace:
+            table_data = table_data.copy()
+
+        for column in self._columns:
+            if column not in transformed:
+                del table_data[column]
+
+        for column in transformed.columns:
+            table_data[column] = transformed[column].values
+
+        return table_data
+
+    def _restricted_transform(self, table_data, inplace=False):
+        return self._restrict(self._transform, table_data, inplace)
+
+    def _restricted_reverse_transform(self, table_data, inplace=False):
+        return self._restrict(self._reverse_transform, table_data, inplace)
+
+    def _restricted_is_valid(self, table_data):
+        valid = self._is_valid(table_data[self._columns])
+        return pd.Series(np.asarray(valid, dtype=bool), index=table_data.index)
 
 
 class UniqueCombinations(Constraint):
@@ -51,16 +165,28 @@ class UniqueCombinations(Constraint):
     found in the sampled data always stay within the combinations previously
     seen during training.
 
+    With the ``conditional_sampling`` strategy, the invalid rows get a
+    combination sampled among those seen with the same value in the first
+    of the columns, or among all of them if that value was not seen,
+    proportionally to their frequency.
+
     Args:
         columns (list[str]):
             Names of the columns that need to produce unique combinations.
         handling_strategy (str):
-            How this Constraint should be handled, which can be ``transform``
-            or ``reject_sampling``.
+            How this Constraint should be handled, which can be ``transform``,
+            ``reject_sampling`` or ``conditional_sampling``.
     """
 
     _separator = None
     _joint_column = None
+    _uniques = None
+    _combination_keys = None
+    _combinations = None
+    _combination_order = None
+    _combination_first_codes = None
+    _combination_cumulative_counts = None
+    _supports_inplace = True
 
     def __init__(self, columns, handling_strategy='transform'):
         self._columns = columns
@@ -70,10 +196,8 @@ class UniqueCombinations(Constraint):
     def _valid_separator(self, table_data):
         """Return True if separator is valid for this data.
 
-        If the separator is contained within any of the columns
-        or the column name obtained after joining the column
-        names using the separator already exists, the separator
-        is not valid.
+        If the column name obtained after joining the column names
+        using the separator already exists, the separator is not valid.
 
         Args:
             table_data (pandas.DataFrame):
@@ -83,14 +207,7 @@ class UniqueCombinations(Constraint):
             bool:
                 Whether the separator is valid for this data or not.
         """
-        for column in self._columns:
-            if table_data[column].str.contains(self._separator).any():
-                return False
-
-            if self._separator.join(self._columns) in table_data:
-                return False
-
-        return True
+        return self._separator.join(self._columns) not in table_data
 
     def fit(self, table_data):
         """Fit this Constraint to the data.
@@ -100,6 +217,8 @@ class UniqueCombinations(Constraint):
               current data by iteratively adding `#` to it.
             - Generating the joint column name by concatenating
               the names of ``self._columns`` with the separator.
+            - Indexing the combinations seen in the data, which
+              are stored in a lookup table with one array per column.
 
         Args:
             table_data (pandas.DataFrame):
@@ -110,7 +229,70 @@ class UniqueCombinations(Constraint):
             self._separator += '#'
 
         self._joint_column = self._separator.join(self._columns)
-        self._combinations = set(table_data[self._columns].itertuples(index=False))
+
+        self._uniques = [
+            pd.Index(table_data[column].unique())
+            for column in self._columns
+        ]
+        self._combination_keys = []
+        codes = self._uniques[0].get_indexer(table_data[self._columns[0]])
+        for column, uniques in zip(self._columns[1:], self._uniques[1:]):
+            keys = self._get_keys(codes, uniques.get_indexer(table_data[column]), len(uniques))
+            combination_keys = pd.Index(pd.unique(keys))
+            self._combination_keys.append(combination_keys)
+            codes = combination_keys.get_indexer(keys)
+
+        # Codes are numbered by first appearance, so the first row of each code
+        # is found in code order. A trailing ``NaN`` is gathered by code ``-1``.
+        first_rows = np.unique(codes, return_index=True)[1]
+        self._combinations = {
+            column: np.append(table_data[column].values[first_rows].astype(object), np.nan)
+            for column in self._columns
+        }
+
+        # Combinations sorted by the code of their first column value, with the
+        # cumulative counts used to sample them within each first column value.
+        first_codes = self._uniques[0].get_indexer(self._combinations[self._columns[0]][:-1])
+        self._combination_order = np.argsort(first_codes, kind='mergesort')
+        self._combination_first_codes = first_codes[self._combination_order]
+        counts = np.bincount(codes, minlength=len(first_rows))
+        self._combination_cumulative_counts = np.cumsum(counts[self._combination_order])
+
+    @staticmethod
+    def _get_keys(codes, column_codes, num_uniques):
+        """Combine the codes of the previous columns with the codes of a new one.
+
+        Rows where any of the codes is ``-1``, which marks an unseen value, get
+        the key ``-1``, which never matches a seen combination.
+        """
+        keys = codes.astype(np.int64) * num_uniques + column_codes
+        keys[(codes < 0) | (column_codes < 0)] = -1
+        return keys
+
+    def _get_codes(self, table_data):
+        """Get the position of the combination of each row within the seen ones.
+
+        The values of each column are replaced by their position within the
+        values seen during fit, and the positions of every new column are combined
+        with the previous ones into integer keys, which are looked up among the keys
+        seen during fit. This keeps the keys below the number of rows seen during
+        fit regardless of the number of columns.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+
+        Returns:
+            numpy.ndarray:
+                Code of the combination of each row, or ``-1`` if it was not seen.
+        """
+        codes = self._uniques[0].get_indexer(table_data[self._columns[0]])
+        columns = zip(self._columns[1:], self._uniques[1:], self._combination_keys)
+        for column, uniques, combination_keys in columns:
+            keys = self._get_keys(codes, uniques.get_indexer(table_data[column]), len(uniques))
+            codes = combination_keys.get_indexer(keys)
+
+        return codes
 
     def is_valid(self, table_data):
         """Say whether the column values are within the original combinations.
@@ -123,54 +305,106 @@ class UniqueCombinations(Constraint):
             pandas.Series:
                 Whether each row is valid.
         """
-        tuples = pd.Series(
-            table_data[self._columns].itertuples(index=False),
-            index=table_data.index
-        )
-        return tuples.isin(self._combinations)
+        return pd.Series(self._get_codes(table_data) >= 0, index=table_data.index)
+
+    def make_valid(self, table_data, inplace=False):
+        """Replace the combinations not seen during fit with sampled ones.
 
-    def transform(self, table_data):
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
+
+        Returns:
+            pandas.DataFrame:
+                Table data with all the combinations seen during fit.
+        """
+        invalid = self._get_codes(table_data) < 0
+        if not invalid.any():
+            return table_data
+
+        first_codes = self._uniques[0].get_indexer(table_data[self._columns[0]].values[invalid])
+        sorted_first_codes = self._combination_first_codes
+        starts = np.searchsorted(sorted_first_codes, first_codes, side='left')
+        ends = np.searchsorted(sorted_first_codes, first_codes, side='right')
+        unseen = starts == ends
+        starts[unseen] = 0
+        ends[unseen] = len(sorted_first_codes)
+
+        cumulative_counts = np.append(0, self._combination_cumulative_counts)
+        offsets = cumulative_counts[starts]
+        totals = cumulative_counts[ends] - offsets
+        draws = offsets + (self._random_state or np.random).random(len(first_codes)) * totals
+        positions = np.searchsorted(self._combination_cumulative_counts, draws, side='right')
+        codes = self._combination_order[positions]
+
+        if not inplace:
+            table_data = table_data.copy()
+
+        for column in self._columns:
+            values = table_data[column].values.astype(object)
+            values[invalid] = self._combinations[column][codes]
+            table_data[column] = values
+
+        return table_data
+
+    def transform(self, table_data, inplace=False):
         """Transform the table data.
 
         The transformation consist on removing all the ``self._columns`` from
-        the dataframe, concatenating them using the found separator, and
-        setting them back to the data as a single name with the previously
-        computed name.
+        the dataframe and setting in their place a single categorical column,
+        named with the previously computed name, which contains the code of
+        the combination of each row. Combinations not seen during fit are
+        given a ``NaN`` code.
 
         Args:
             table_data (pandas.DataFrame):
                 Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
 
         Returns:
             pandas.DataFrame:
                 Transformed data.
         """
-        lists_series = pd.Series(table_data[self._columns].values.tolist())
-        table_data = table_data.drop(self._columns, axis=1)
-        table_data[self._joint_column] = lists_series.str.join(self._separator)
+        codes = self._get_codes(table_data).astype(object)
+        codes[codes == -1] = np.nan
+        if inplace:
+            for column in self._columns:
+                del table_data[column]
+        else:
+            table_data = table_data.drop(self._columns, axis=1)
+
+        table_data[self._joint_column] = codes
 
         return table_data
 
-    def reverse_transform(self, table_data):
+    def reverse_transform(self, table_data, inplace=False):
         """Reverse transform the table data.
 
         The transformation is reversed by popping the joint column from
-        the table, splitting it by the previously found separator and
-        them setting all the columns back to the table with the original
-        names.
+        the table and gathering the values of each combination code from
+        the lookup table of combinations seen during fit, setting all the
+        columns back to the table with the original names.
 
         Args:
             table_data (pandas.DataFrame):
                 Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
 
         Returns:
             pandas.DataFrame:
                 Transformed data.
         """
-        table_data = table_data.copy()
-        columns = table_data.pop(self._joint_column).str.split(self._separator)
-        for index, column in enumerate(self._columns):
-            table_data[column] = columns.str[index]
+        if not inplace:
+            table_data = table_data.copy()
+
+        codes = pd.to_numeric(table_data.pop(self._joint_column), errors='coerce')
+        codes = codes.fillna(-1).values.astype(np.int64)
+        for column in self._columns:
+            table_data[column] = self._combinations[column][codes]
 
         return table_data
 
@@ -182,13 +416,33 @@ class GreaterThan(Constraint):
     difference between it and the ``low`` value and then computing back the ``high``
     value by adding it the ``low`` value when reversing the transformation.
 
+    With the ``conditional_sampling`` strategy, the ``high`` value of the invalid
+    rows is replaced by the ``low`` value plus a difference sampled from the
+    marginal distribution of the valid differences seen during fit, which does
+    not depend on the rest of the row.
+
+    Datetime and timedelta columns are handled natively: the ``high`` value is
+    replaced with its difference in ``int64`` nanoseconds, without the logarithm,
+    so that the values are rebuilt exactly, keeping their dtype and timezone.
+    If any value is missing, the differences are stored as floats with ``NaN``.
+
     Args:
         low (str):
             Name of the column that contains the low value.
         high (str):
             Name of the column that contains the high value.
+        strict (bool):
+            Whether ``high`` must be strictly greater than ``low``.
+            Defaults to ``False``.
+        handling_strategy (str):
+            How this Constraint should be handled, which can be ``transform``,
+            ``reject_sampling`` or ``conditional_sampling``.
     """
 
+    NUM_DIFF_QUANTILES = 1001
+    _supports_inplace = True
+    _is_datetime = False
+
     def __init__(self, low, high, strict=False, handling_strategy='transform'):
         self._low = low
         self._high = high
@@ -197,13 +451,89 @@ class GreaterThan(Constraint):
         super().__init__()
 
     def fit(self, table_data):
-        """Learn the dtype of the high column.
+        """Learn the dtype of the high column and the distribution of the differences.
+
+        The distribution of the valid differences between ``high`` and ``low``
+        is stored as ``NUM_DIFF_QUANTILES`` evenly spaced quantiles.
 
         Args:
             table_data (pandas.DataFrame):
                 The Table data.
         """
         self._dtype = table_data[self._high].dtype
+        self._is_datetime = self._dtype.kind in 'mM'
+
+        diffs = self._get_diffs(table_data)[self.is_valid(table_data).values]
+        diffs = diffs[~np.isnan(diffs)]
+        if not len(diffs):
+            diffs = np.array([1.0 if self._strict else 0.0])
+
+        self._diff_quantiles = np.quantile(diffs, np.linspace(0, 1, self.NUM_DIFF_QUANTILES))
+
+    def _get_diffs(self, table_data):
+        """Get the differences between ``high`` and ``low``.
+
+        Datetime and timedelta differences are given in ``int64`` nanoseconds,
+        or as floats with ``NaN`` for the missing values if there are any.
+        """
+        if not self._is_datetime:
+            return (table_data[self._high] - table_data[self._low]).values.astype(float)
+
+        high, high_missing = _get_nanoseconds(table_data[self._high].values)
+        low, low_missing = _get_nanoseconds(table_data[self._low].values)
+        diffs = high - low
+        missing = high_missing | low_missing
+        if missing.any():
+            diffs = diffs.astype(float)
+            diffs[missing] = np.nan
+
+        return diffs
+
+    def _add_diffs(self, low, diffs):
+        """Add the differences to the ``low`` values, handling datetimes in nanoseconds."""
+        if not self._is_datetime:
+            return low + diffs
+
+        low, missing = _get_nanoseconds(low)
+        missing = missing | ~np.isfinite(diffs)
+        nanoseconds = low + np.where(missing, 0, diffs).astype(np.int64)
+        return _from_nanoseconds(nanoseconds, missing, self._dtype)
+
+    def make_valid(self, table_data, inplace=False):
+        """Replace the ``high`` value of the invalid rows.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
+
+        Returns:
+            pandas.DataFrame:
+                Table data with all the rows valid.
+        """
+        invalid = ~self.is_valid(table_data).values
+        if not invalid.any():
+            return table_data
+
+        levels = np.linspace(0, 1, len(self._diff_quantiles))
+        draws = (self._random_state or np.random).random(invalid.sum())
+        diffs = np.interp(draws, levels, self._diff_quantiles)
+        if self._is_datetime or self._dtype.kind in 'iu':
+            diffs = diffs.round()
+
+        high = self._add_diffs(table_data[self._low].values[invalid], diffs)
+        if not self._is_datetime:
+            high = high.astype(self._dtype)
+
+        if not inplace:
+            table_data = table_data.copy()
+
+        values = table_data[self._high].copy()
+        values[invalid] = high
+        table_data[self._high] = values
+
+        return table_data
 
     def is_valid(self, table_data):
         """Say whether ``high`` is greater than ``low`` in each row.
@@ -221,7 +551,7 @@ class GreaterThan(Constraint):
 
         return table_data[self._high] >= table_data[self._low]
 
-    def transform(self, table_data):
+    def transform(self, table_data, inplace=False):
         """Transform the table data.
 
         The transformation consist on replacing the ``high`` value with difference
@@ -229,21 +559,27 @@ class GreaterThan(Constraint):
 
         Afterwards, a logarithm is applied to the difference + 1 to be able to ensure
         that the value stays positive when reverted afterwards using an exponential.
+        Datetime and timedelta differences are kept in nanoseconds instead.
 
         Args:
             table_data (pandas.DataFrame):
                 Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
 
         Returns:
             pandas.DataFrame:
                 Transformed data.
         """
-        table_data = table_data.copy()
-        table_data[self._high] = np.log(table_data.pop(self._high) - table_data[self._low] + 1)
+        diffs = self._get_diffs(table_data)
+        if not inplace:
+            table_data = table_data.copy()
+
+        table_data[self._high] = diffs if self._is_datetime else np.log(diffs + 1)
 
         return table_data
 
-    def reverse_transform(self, table_data):
+    def reverse_transform(self, table_data, inplace=False):
         """Reverse transform the table data.
 
         The transformation is reversed by computing an exponential of the given
@@ -251,19 +587,28 @@ class GreaterThan(Constraint):
         clipping the value to 0 on the low end to ensure the value is positive.
 
         Finally, the obtained value is added to the ``low`` column to get the final
-        ``high`` value.
+        ``high`` value. Datetime and timedelta differences are only rounded to
+        whole nanoseconds and clipped before being added.
 
         Args:
             table_data (pandas.DataFrame):
                 Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
 
         Returns:
             pandas.DataFrame:
                 Transformed data.
         """
-        table_data = table_data.copy()
-        diff = (np.exp(table_data[self._high]).round().astype(self._dtype) - 1).clip(0)
-        table_data[self._high] = table_data[self._low] + diff
+        if not inplace:
+            table_data = table_data.copy()
+
+        if self._is_datetime:
+            diffs = np.clip(np.round(table_data[self._high].values), int(self._strict), None)
+            table_data[self._high] = self._add_diffs(table_data[self._low].values, diffs)
+        else:
+            diff = (np.exp(table_data[self._high]).round().astype(self._dtype) - 1).clip(0)
+            table_data[self._high] = table_data[self._low] + diff
 
         return table_data
 
@@ -276,19 +621,77 @@ class ColumnFormula(Constraint):
     During the reverse transformation, the column is re-generated by
     applying the whole table to the given function.
 
+    If the ``columns`` read by the formula are given, the formula is applied
+    only to those columns instead of the whole table, either as a
+    ``pandas.DataFrame`` or, if ``vectorized``, as one ``numpy.ndarray`` per
+    column. In that case the formula must compute each row independently of
+    the others, so that tables with more than ``MIN_PARALLEL_ROWS`` rows can be
+    split in chunks and computed across ``n_jobs`` processes. This is meant for
+    slow row-wise Python formulas; ``vectorized`` formulas are usually faster
+    in a single process, since the chunks must be copied to the workers.
+
     Args:
         column (str):
             Name of the column to compute applying the formula.
         formula (callable):
             Function to use for the computation.
+        handling_strategy (str):
+            How this Constraint should be handled, which can be ``transform``
+            or ``reject_sampling``.
+        columns (list[str]):
+            Names of the columns read by the formula. If ``None``, the formula
+            is applied to the whole table.
+        vectorized (bool):
+            Whether the formula takes the arrays of the ``columns`` as positional
+            arguments instead of a ``pandas.DataFrame``. Defaults to ``False``.
+        n_jobs (int):
+            Number of processes used to compute the formula when ``columns`` are
+            given, which requires the formula to be picklable, such as a module
+            level function or its import path. If ``-1``, one process per CPU is
+            used. Defaults to ``None``, which computes the whole table at once.
     """
 
-    def __init__(self, column, formula, handling_strategy='transform'):
+    MIN_PARALLEL_ROWS = 100000
+    _supports_inplace = True
+
+    def __init__(self, column, formula, handling_strategy='transform', columns=None,
+                 vectorized=False, n_jobs=None):
         self._column = column
         self._formula = import_object(formula)
         self._handling_strategy = handling_strategy
+        self._columns = columns
+        self._vectorized = vectorized
+        self._n_jobs = n_jobs
+        if n_jobs not in (None, 1):
+            try:
+                pickle.dumps(self._formula)
+            except Exception:
+                raise ValueError('The formula must be picklable to use n_jobs')
+
         super().__init__()
 
+    def _compute(self, table_data):
+        """Compute the formula on the table.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+
+        Returns:
+            pandas.Series or numpy.ndarray:
+                The output of the formula if applied to the whole table,
+                or an array with one value per row otherwise.
+        """
+        if self._columns is None:
+            return self._formula(table_data)
+
+        function = functools.partial(
+            _apply_formula, self._formula, self._columns, self._vectorized)
+        if self._n_jobs in (None, 1) or len(table_data) < self.MIN_PARALLEL_ROWS:
+            return np.asarray(function(table_data))
+
+        return _apply_in_chunks(function, table_data[self._columns], self._n_jobs)
+
     def is_valid(self, table_data):
         """Say whether the data fulfills the formula.
 
@@ -300,10 +703,13 @@ class ColumnFormula(Constraint):
             pandas.Series:
                 Whether each row is valid.
         """
-        computed = self._formula(table_data)
-        return table_data[self._column] == computed
+        computed = self._compute(table_data)
+        if self._columns is None:
+            return table_data[self._column] == computed
+
+        return pd.Series(table_data[self._column].values == computed, index=table_data.index)
 
-    def transform(self, table_data):
+    def transform(self, table_data, inplace=False):
         """Transform the table data.
 
         The transformation consist on simply dropping the indicated column from the
@@ -312,17 +718,21 @@ class ColumnFormula(Constraint):
         Args:
             table_data (pandas.DataFrame):
                 Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
 
         Returns:
             pandas.DataFrame:
                 Transformed data.
         """
-        table_data = table_data.copy()
-        del table_data[self._column]
+        if inplace:
+            del table_data[self._column]
+        else:
+            table_data = table_data.drop(self._column, axis=1)
 
         return table_data
 
-    def reverse_transform(self, table_data):
+    def reverse_transform(self, table_data, inplace=False):
         """Reverse transform the table data.
 
         The transformation is reversed by applying the given formula function
@@ -331,12 +741,354 @@ class ColumnFormula(Constraint):
         Args:
             table_data (pandas.DataFrame):
                 Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
 
         Returns:
             pandas.DataFrame:
                 Transformed data.
         """
-        table_data = table_data.copy()
-        table_data[self._column] = self._formula(table_data)
+        computed = self._compute(table_data)
+        if not inplace:
+            table_data = table_data.copy()
+
+        table_data[self._column] = computed
+
+        return table_data
+
+
+class Chain(Constraint):
+    """Ensure that the values of several columns are in ascending order.
+
+    This generalizes ``GreaterThan`` to chains such as ``start <= pay_date <= end``.
+
+    The transformation strategy keeps the first column and replaces every other
+    column with the logarithm of its difference with the previous one, plus 1 if
+    the order is not strict, so that all the transformed columns are unconstrained.
+    The reverse transformation exponentiates the differences and accumulates them
+    over the first column, so every sampled row is valid.
+
+    Datetime and timedelta columns are chained through their differences in
+    ``int64`` nanoseconds, without the logarithm, like in ``GreaterThan``. The
+    differences of a column with missing values are stored as floats with ``NaN``.
+
+    Args:
+        columns (list[str]):
+            Names of the columns, from the lowest to the highest.
+        strict (bool):
+            Whether each column must be strictly greater than the previous one.
+            Defaults to ``False``.
+        handling_strategy (str):
+            How this Constraint should be handled, which can be ``transform``
+            or ``reject_sampling``.
+    """
+
+    _supports_inplace = True
+    _is_datetime = False
+
+    def __init__(self, columns, strict=False, handling_strategy='transform'):
+        self._columns = columns
+        self._strict = strict
+        self._handling_strategy = handling_strategy
+        super().__init__()
+
+    def fit(self, table_data):
+        """Learn the dtypes of the columns.
+
+        Args:
+            table_data (pandas.DataFrame):
+                The Table data.
+        """
+        self._dtypes = table_data[self._columns].dtypes
+        self._is_datetime = self._dtypes.iloc[0].kind in 'mM'
+
+    def _get_diffs(self, table_data):
+        """Get the differences between each column and the previous one.
+
+        Datetime and timedelta differences are given in ``int64`` nanoseconds.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]:
+                Differences and mask of the differences that involve missing values.
+        """
+        if not self._is_datetime:
+            diffs = np.diff(table_data[self._columns].values.astype(float), axis=1)
+            return diffs, np.isnan(diffs)
+
+        columns = [_get_nanoseconds(table_data[column].values) for column in self._columns]
+        values = np.column_stack([nanoseconds for nanoseconds, _ in columns])
+        missing = np.column_stack([missing for _, missing in columns])
+        return np.diff(values, axis=1), missing[:, 1:] | missing[:, :-1]
+
+    def is_valid(self, table_data):
+        """Say whether the columns are in ascending order in each row.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+
+        Returns:
+            pandas.Series:
+                Whether each row is valid.
+        """
+        diffs, missing = self._get_diffs(table_data)
+        if self._strict:
+            valid = (diffs > 0).all(axis=1)
+        else:
+            valid = (diffs >= 0).all(axis=1)
+
+        valid &= ~missing.any(axis=1)
+        return pd.Series(valid, index=table_data.index)
+
+    def transform(self, table_data, inplace=False):
+        """Transform the table data.
+
+        The transformation consist on replacing each column except the first one
+        with the logarithm of its difference with the previous column.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
+
+        Returns:
+            pandas.DataFrame:
+                Transformed data.
+        """
+        diffs, missing = self._get_diffs(table_data)
+        if not self._is_datetime:
+            diffs = np.log(diffs if self._strict else diffs + 1)
+
+        if not inplace:
+            table_data = table_data.copy()
+
+        for position, column in enumerate(self._columns[1:]):
+            column_diffs = diffs[:, position]
+            if missing[:, position].any():
+                column_diffs = np.where(missing[:, position], np.nan, column_diffs)
+
+            table_data[column] = column_diffs
+
+        return table_data
+
+    def reverse_transform(self, table_data, inplace=False):
+        """Reverse transform the table data.
+
+        The transformation is reversed by exponentiating the transformed values
+        and adding them one after the other to the first column. The integer
+        columns are rounded on their own, to values that keep the order with the
+        previous column, so the differences leading to float columns are not rounded.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
+
+        Returns:
+            pandas.DataFrame:
+                Transformed data.
+        """
+        if not inplace:
+            table_data = table_data.copy()
+
+        if self._is_datetime:
+            self._reverse_transform_datetime(table_data)
+            return table_data
+
+        previous = table_data[self._columns[0]].values.astype(float)
+        for column in self._columns[1:]:
+            diffs = np.exp(table_data[column].values.astype(float))
+            if not self._strict:
+                diffs = np.maximum(diffs - 1, 0)
+
+            values = previous + diffs
+            if self._dtypes[column].kind in 'iu':
+                minimum = np.floor(previous) + 1 if self._strict else np.ceil(previous)
+                values = np.maximum(values.round(), minimum)
+
+            table_data[column] = values.astype(self._dtypes[column])
+            previous = values
+
+        return table_data
+
+    def _reverse_transform_datetime(self, table_data):
+        """Add the nanosecond differences one after the other to the first column."""
+        previous, missing = _get_nanoseconds(table_data[self._columns[0]].values)
+        for column in self._columns[1:]:
+            diffs = np.clip(np.round(table_data[column].values), int(self._strict), None)
+            missing = missing | ~np.isfinite(diffs)
+            previous = previous + np.where(missing, 0, diffs).astype(np.int64)
+            table_data[column] = _from_nanoseconds(previous, missing, self._dtypes[column])
+
+
+class Between(Constraint):
+    """Ensure that the values of a column stay between a low and a high bound.
+
+    Each bound can be either the name of a column or a constant value.
+
+    The transformation strategy scales the value to the ``[0, 1]`` interval defined
+    by the bounds of its row and applies a logit function to it, which maps it
+    to an unconstrained value. The reverse transformation applies a sigmoid
+    function and scales the value back to the bounds, so every sampled row is valid.
+
+    Datetime and timedelta columns are scaled in ``int64`` nanoseconds. Their
+    constant bounds must be given as ``Timestamp``/``Timedelta`` compatible values.
+
+    Args:
+        column (str):
+            Name of the column to constrain.
+        low (str or float):
+            Name of the column that contains the low bound, or its value.
+        high (str or float):
+            Name of the column that contains the high bound, or its value.
+        strict (bool):
+            Whether the value must be strictly between the bounds.
+            Defaults to ``False``.
+        handling_strategy (str):
+            How this Constraint should be handled, which can be ``transform``
+            or ``reject_sampling``.
+    """
+
+    EPSILON = 1e-9
+    _supports_inplace = True
+    _is_datetime = False
+
+    def __init__(self, column, low, high, strict=False, handling_strategy='transform'):
+        self._column = column
+        self._low = low
+        self._high = high
+        self._strict = strict
+        self._handling_strategy = handling_strategy
+        super().__init__()
+
+    def _get_values(self, table_data, value):
+        """Get a column or a constant as numbers, along with their missing values mask.
+
+        Datetime and timedelta values are given as ``int64`` nanoseconds.
+        """
+        if not isinstance(value, str):
+            if self._is_datetime:
+                scalar = pd.Timedelta if self._dtype.kind == 'm' else pd.Timestamp
+                value = scalar(value).value
+
+            return np.full(len(table_data), value), np.zeros(len(table_data), dtype=bool)
+
+        if self._is_datetime:
+            return _get_nanoseconds(table_data[value].values)
+
+        values = table_data[value].values.astype(float)
+        return values, np.isnan(values)
+
+    def fit(self, table_data):
+        """Learn the dtype of the column.
+
+        Args:
+            table_data (pandas.DataFrame):
+                The Table data.
+        """
+        self._dtype = table_data[self._column].dtype
+        self._is_datetime = self._dtype.kind in 'mM'
+
+    def is_valid(self, table_data):
+        """Say whether the column is between the bounds in each row.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+
+        Returns:
+            pandas.Series:
+                Whether each row is valid.
+        """
+        values, missing = self._get_values(table_data, self._column)
+        low, low_missing = self._get_values(table_data, self._low)
+        high, high_missing = self._get_values(table_data, self._high)
+        if self._strict:
+            valid = (low < values) & (values < high)
+        else:
+            valid = (low <= values) & (values <= high)
+
+        valid &= ~(missing | low_missing | high_missing)
+        return pd.Series(valid, index=table_data.index)
+
+    def transform(self, table_data, inplace=False):
+        """Transform the table data.
+
+        The transformation consist on replacing the value with the logit of its
+        relative position between the bounds, clipped to ``[EPSILON, 1 - EPSILON]``.
+        Rows whose bounds are equal are given the position ``0.5``.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
+
+        Returns:
+            pandas.DataFrame:
+                Transformed data.
+        """
+        values, missing = self._get_values(table_data, self._column)
+        low, low_missing = self._get_values(table_data, self._low)
+        high, high_missing = self._get_values(table_data, self._high)
+        width = (high - low).astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            position = np.where(width > 0, (values - low).astype(float) / width, 0.5)
+
+        position = np.clip(position, self.EPSILON, 1 - self.EPSILON)
+        position[missing | low_missing | high_missing] = np.nan
+
+        if not inplace:
+            table_data = table_data.copy()
+
+        table_data[self._column] = np.log(position / (1 - position))
+
+        return table_data
+
+    def reverse_transform(self, table_data, inplace=False):
+        """Reverse transform the table data.
+
+        The transformation is reversed by applying a sigmoid function to the value
+        and scaling it back to the bounds of each row. Integer values are rounded
+        and clipped to the bounds, excluding them if ``strict``.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Table data.
+            inplace (bool):
+                Whether the table data can be modified. Defaults to ``False``.
+
+        Returns:
+            pandas.DataFrame:
+                Transformed data.
+        """
+        position = 1 / (1 + np.exp(-table_data[self._column].values.astype(float)))
+        low, low_missing = self._get_values(table_data, self._low)
+        high, high_missing = self._get_values(table_data, self._high)
+
+        if not inplace:
+            table_data = table_data.copy()
+
+        if self._is_datetime:
+            missing = low_missing | high_missing | np.isnan(position)
+            offsets = np.where(missing, 0, position) * (high - low).astype(float)
+            values = low + offsets.round().astype(np.int64)
+            if self._strict:
+                low, high = low + 1, high - 1
+
+            values = np.clip(values, low, high)
+            table_data[self._column] = _from_nanoseconds(values, missing, self._dtype)
+            return table_data
+
+        values = low + position * (high - low)
+        if self._dtype.kind in 'iu':
+            if self._strict:
+                low, high = low + 1, high - 1
+
+            values = np.clip(values.round(), low, high)
+
+        table_data[self._column] = values.astype(self._dtype)
 
         return table_data
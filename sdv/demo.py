@@ -8,7 +8,6 @@ from zipfile import ZipFile
 
 import numpy as np
 import pandas as pd
-from faker import Faker
 
 from sdv.metadata import Metadata
 
@@ -198,6 +197,8 @@ def load_demo(dataset_name=None, data_path=DATA_PATH, metadata=False):
 
 def load_tabular_demo():
     """Load a dummy tabular demo dataframe."""
+    from faker import Faker  # Lazy import to speed up importing sdv
+
     age = np.random.randint(30, 50, 12)
     age_when_joined = age - np.random.randint(0, 10, 12)
     faker = Faker()
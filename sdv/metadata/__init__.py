@@ -1,6 +1,7 @@
 """Metadata class."""
 
 import copy
+import importlib
 import json
 import logging
 import os
@@ -10,7 +11,6 @@ import numpy as np
 import pandas as pd
 from rdt import HyperTransformer, transformers
 
-from sdv.metadata import visualization
 from sdv.metadata.errors import MetadataError
 from sdv.metadata.table import Table
 
@@ -24,6 +24,14 @@ __all__ = [
 LOGGER = logging.getLogger(__name__)
 
 
+def __getattr__(name):
+    # ``visualization`` imports graphviz, so it is only loaded when needed.
+    if name == 'visualization':
+        return importlib.import_module('sdv.metadata.visualization')
+
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
 def _read_csv_dtypes(table_meta):
     """Get the dtypes specification that needs to be passed to read_csv."""
     dtypes = dict()
@@ -519,6 +527,9 @@ class Metadata:
     def reverse_transform(self, table_name, data):
         """Reverse the transformed data for a given table.
 
+        Id fields missing from the data, such as foreign keys that have not
+        been assigned yet, are skipped.
+
         Args:
             table_name (str):
                 Name of the table to reverse transform.
@@ -532,7 +543,8 @@ class Metadata:
         reversed_data = hyper_transformer.reverse_transform(data)
 
         for name, dtype in self.get_dtypes(table_name, ids=True).items():
-            reversed_data[name] = reversed_data[name].dropna().astype(dtype)
+            if name in reversed_data:
+                reversed_data[name] = reversed_data[name].dropna().astype(dtype)
 
         return reversed_data
 
@@ -1009,4 +1021,6 @@ class Metadata:
                 just return the ``graphviz.Digraph`` object.
                 Defaults to ``None``.
         """
+        from sdv.metadata import visualization  # Lazy import to avoid loading graphviz
+
         return visualization.visualize(self, path)
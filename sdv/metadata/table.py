@@ -1,32 +1,114 @@
 """Metadata for a single table."""
 
 import copy
+import hashlib
+import itertools
 import json
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import pandas as pd
 import rdt
-from faker import Faker
 
 from sdv.constraints.base import Constraint
+from sdv.constraints.plan import ConstraintPlan
+from sdv.constraints.tabular import UniqueCombinations
 from sdv.metadata.errors import MetadataError
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _get_faker_function(faker, category):
+    """Return the faker function to anonymize data.
+
+    Args:
+        faker (faker.Faker):
+            Faker instance to generate the values with.
+        category (str or tuple):
+            Fake category to use. If a tuple is passed, the first element is
+            the category and the rest are additional arguments for the Faker.
+
+    Returns:
+        function:
+            Faker function to generate new fake data instances.
+
+    Raises:
+        ValueError:
+            A ``ValueError`` is raised if the faker category we want don't exist.
+    """
+    if isinstance(category, (tuple, list)):
+        category, *args = category
+    else:
+        args = tuple()
+
+    try:
+        faker_method = getattr(faker, category)
+    except AttributeError:
+        raise ValueError('Category "{}" couldn\'t be found on faker'.format(category))
+
+    if not args:
+        return faker_method
+
+    def faker_function():
+        return faker_method(*args)
+
+    return faker_function
+
+
+def _generate_fake_values(category, size, seed=None):
+    """Generate ``size`` fake values with a new ``Faker`` instance.
+
+    This is a module level function so it can be run in other processes.
+    """
+    from faker import Faker  # Lazy import to speed up importing sdv
+
+    faker = Faker()
+    if seed is not None:
+        faker.seed_instance(seed)
+
+    faker_function = _get_faker_function(faker, category)
+    return [faker_function() for _ in range(size)]
+
+
+def _drop_duplicates(values):
+    """Drop the duplicated values keeping the order, if they can be hashed."""
+    values = pd.Series(values, dtype=object)
+    try:
+        return values[~values.duplicated()]
+    except TypeError:
+        return values
+
+
 class Table:
     """Table Metadata.
 
     The Metadata class provides a unified layer of abstraction over the metadata
     of a single Table, which includes both the necessary details to load the data
     from the filesystem and to know how to parse and transform it to numerical data.
+
+    The fake values used to anonymize the PII fields are generated by a single
+    ``Faker`` instance, seeded with ``random_state`` if given, and across
+    ``n_jobs`` processes for the fields with many unique values. The constraints
+    draw the values used to make the sampled rows valid from a ``Generator``
+    seeded with the same ``random_state``.
+
+    If an ``anonymization_key`` is given, the fake value of each original value
+    is instead generated by a ``Faker`` seeded with a keyed hash of the value.
+    This produces the same pseudonyms on every fit that uses the same key and
+    does not require storing the mapping, but different values may get the
+    same pseudonym.
     """
 
+    _fields_metadata = None
     _hyper_transformer = None
     _anonymization_mappings = None
-    _fakers = None
+    _random_state = None
+    _n_jobs = None
+    _anonymization_key = None
     _constraint_instances = None
+    _constraint_plan = None
 
     _FIELD_TEMPLATES = {
         'i': {
@@ -58,45 +140,12 @@ class Table:
         ('id', 'integer'): 'int',
         ('id', 'string'): 'str'
     }
-
-    def _get_faker(self, category):
-        """Return the faker object to anonymize data.
-
-        Args:
-            category (str or tuple):
-                Fake category to use. If a tuple is passed, the first element is
-                the category and the rest are additional arguments for the Faker.
-
-        Returns:
-            function:
-                Faker function to generate new fake data instances.
-
-        Raises:
-            ValueError:
-                A ``ValueError`` is raised if the faker category we want don't exist.
-        """
-        if isinstance(category, (tuple, list)):
-            category, *args = category
-        else:
-            args = tuple()
-
-        try:
-            faker_method = getattr(Faker(), category)
-
-            if not args:
-                return faker_method
-
-            def faker():
-                return faker_method(*args)
-
-            return faker
-
-        except AttributeError:
-            raise ValueError('Category "{}" couldn\'t be found on faker'.format(category))
+    MAX_FAKER_ATTEMPTS = 10
+    MIN_PARALLEL_FAKE_VALUES = 100000
 
     def __init__(self, field_names=None, field_types=None, anonymize_fields=None,
                  primary_key=None, constraints=None, transformer_templates=None,
-                 model_kwargs=None):
+                 model_kwargs=None, random_state=None, n_jobs=None, anonymization_key=None):
         self._field_names = field_names
         self._field_types = field_types or {}
         self._anonymize_fields = anonymize_fields or {}
@@ -105,6 +154,9 @@ class Table:
         self._primary_key = primary_key
         self._constraints = constraints or []
         self._transformer_templates = transformer_templates or {}
+        self._random_state = random_state
+        self._n_jobs = n_jobs
+        self._anonymization_key = anonymization_key
 
     def get_model_kwargs(self, model_name):
         """Return the required model kwargs for the indicated model."""
@@ -155,6 +207,52 @@ class Table:
 
         return dtypes
 
+    def get_level_columns(self, data):
+        """Get the groups of columns whose values are only known if seen during ``fit``.
+
+        The categorical and boolean transformers can only transform the values
+        that they were fitted on, and ``UniqueCombinations`` only the combinations
+        that it was fitted on, so every value of these groups of columns must be
+        found in the data passed to ``fit``. The columns of a ``UniqueCombinations``
+        are only returned within its group, and the PII fields are left out since
+        their values are replaced before being transformed.
+
+        Args:
+            data (pandas.DataFrame):
+                Data, or a chunk of it, used to infer the type of the fields
+                that do not have one yet.
+
+        Returns:
+            list[list[str]]:
+                Groups of column names.
+        """
+        combinations = list()
+        for constraint in self._constraints:
+            if isinstance(constraint, dict):
+                constraint = Constraint.from_dict(constraint)
+
+            if isinstance(constraint, UniqueCombinations):
+                combinations.append(list(constraint._columns))
+
+        combined = set(column for columns in combinations for column in columns)
+        excluded = combined.union(self._anonymize_fields, [self._primary_key])
+        fields = self._fields_metadata or self._field_types
+        level_columns = list()
+        for name, dtype in data.dtypes.items():
+            field_meta = fields.get(name, {})
+            ignored = self._field_names and name not in self._field_names
+            if ignored or name in excluded or field_meta.get('pii'):
+                continue
+
+            field_type = field_meta.get('type')
+            if field_type is None:
+                field_type = self._FIELD_TEMPLATES.get(dtype.kind, {}).get('type')
+
+            if field_type in ('categorical', 'boolean'):
+                level_columns.append([name])
+
+        return level_columns + combinations
+
     def _build_fields_metadata(self, data):
         """Build all the fields metadata.
 
@@ -230,7 +328,26 @@ class Table:
 
         return transformers
 
+    @staticmethod
+    def _apply_constraint(method, constraint, data):
+        """Apply a constraint method to a table owned by this pipeline.
+
+        Constraints that support it modify the table in place instead of copying it.
+        """
+        if constraint._supports_inplace:
+            return method(data, inplace=True)
+
+        return method(data)
+
     def _fit_transform_constraints(self, data):
+        if self._constraints:
+            # Copy once so that the constraints can modify the data in place.
+            data = data.copy()
+
+        random_state = None
+        if self._random_state is not None:
+            random_state = np.random.default_rng(self._random_state)
+
         for idx, constraint in enumerate(self._constraints):
             if isinstance(constraint, type):
                 constraint = constraint().to_dict()
@@ -239,9 +356,12 @@ class Table:
                 constraint = constraint.to_dict()
 
             constraint = Constraint.from_dict(constraint)
+            constraint.set_random_state(random_state)
             self._constraints[idx] = constraint
 
-            data = constraint.fit_transform(data)
+            data = self._apply_constraint(constraint.fit_transform, constraint, data)
+
+        self._constraint_plan = ConstraintPlan(self._constraints)
 
         return data
 
@@ -315,23 +435,157 @@ class Table:
 
         self._primary_key = field_name
 
+    def _generate_fake_values_parallel(self, category, size):
+        """Generate the fake values across ``n_jobs`` processes.
+
+        Each process uses its own ``Faker`` instance, seeded from ``random_state``
+        and the process number if a ``random_state`` was given.
+        """
+        n_jobs = self._n_jobs
+        if n_jobs < 0:
+            n_jobs = os.cpu_count()
+
+        sizes = [len(part) for part in np.array_split(np.arange(size), n_jobs)]
+        if self._random_state is None:
+            seeds = [None] * n_jobs
+        else:
+            seeds = [self._random_state + job + 1 for job in range(n_jobs)]
+
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            parts = executor.map(_generate_fake_values, [category] * n_jobs, sizes, seeds)
+            return [value for part in parts for value in part]
+
+    def _make_fake_values(self, faker, name, category, size):
+        """Generate ``size`` fake values, unique as long as the category allows it.
+
+        Values are generated in bulk and the duplicates replaced in up to
+        ``MAX_FAKER_ATTEMPTS`` additional rounds. Fields with more than
+        ``MIN_PARALLEL_FAKE_VALUES`` values are generated across ``n_jobs``
+        processes if ``n_jobs`` is given.
+
+        Args:
+            faker (faker.Faker):
+                Faker instance shared by all the fields.
+            name (str):
+                Name of the field.
+            category (str or tuple):
+                Fake category to use.
+            size (int):
+                Number of values to generate.
+
+        Returns:
+            numpy.ndarray:
+                Array of fake values.
+        """
+        faker_function = _get_faker_function(faker, category)
+        parallel = self._n_jobs not in (None, 1) and size >= self.MIN_PARALLEL_FAKE_VALUES
+        if parallel:
+            values = self._generate_fake_values_parallel(category, size)
+        else:
+            values = [faker_function() for _ in range(size)]
+
+        values = _drop_duplicates(values)
+        for _ in range(self.MAX_FAKER_ATTEMPTS):
+            missing = size - len(values)
+            if not missing:
+                break
+
+            new_values = [faker_function() for _ in range(missing)]
+            values = _drop_duplicates(values.tolist() + new_values)
+
+        values = values.values
+        if len(values) < size:
+            LOGGER.warning('Could only generate %s unique fake values for field %s, '
+                           'some of its %s values will share the same fake value',
+                           len(values), name, size)
+            values = np.resize(values, size)
+
+        return values
+
+    def _get_pii_fields(self):
+        return {
+            name: field_metadata['pii_category']
+            for name, field_metadata in self._fields_metadata.items()
+            if field_metadata.get('pii')
+        }
+
     def _make_anonymization_mappings(self, data):
-        mappings = {}
-        for name, field_metadata in self._fields_metadata.items():
-            if field_metadata.get('pii'):
-                faker = self._get_faker(field_metadata['pii_category'])
+        """Generate the fake values of the unique values of each PII field.
+
+        The mapping of each field is stored as an ``Index`` of the original values
+        and an array with their fake values followed by a ``NaN``, which is the
+        value given to the values not seen during fit.
+        """
+        pii_fields = self._get_pii_fields()
+        if not pii_fields or self._anonymization_key is not None:
+            self._anonymization_mappings = {}
+            return
 
-                uniques = data[name].unique()
-                fake_values = [faker() for _ in range(len(uniques))]
-                mappings[name] = dict(zip(uniques, fake_values))
+        from faker import Faker  # Lazy import to speed up importing sdv
+
+        faker = Faker()
+        if self._random_state is not None:
+            faker.seed_instance(self._random_state)
+
+        mappings = {}
+        for name, category in pii_fields.items():
+            uniques = pd.Index(data[name].unique())
+            fake_values = self._make_fake_values(faker, name, category, len(uniques))
+            mappings[name] = (uniques, np.append(fake_values.astype(object), np.nan))
 
         self._anonymization_mappings = mappings
 
+    def _make_hashed_fake_values(self, category, uniques):
+        """Generate the fake value of each unique value from its keyed hash."""
+        from faker import Faker  # Lazy import to speed up importing sdv
+
+        hash_key = hashlib.md5(str(self._anonymization_key).encode()).hexdigest()[:16]
+        hashes = pd.util.hash_pandas_object(pd.Series(uniques), index=False, hash_key=hash_key)
+
+        faker = Faker()
+        faker_function = _get_faker_function(faker, category)
+        fake_values = np.empty(len(uniques) + 1, dtype=object)
+        for position, value_hash in enumerate(hashes.values):
+            faker.seed_instance(int(value_hash))
+            fake_values[position] = faker_function()
+
+        fake_values[-1] = np.nan
+        return fake_values
+
+    @staticmethod
+    def _get_mapping_arrays(mapping):
+        """Get the original values and the fake values of an anonymization mapping.
+
+        Tables fitted by older versions store each mapping as a ``dict`` of original
+        values and fake values, which is converted to the ``Index`` and array format.
+        """
+        if isinstance(mapping, dict):
+            fake_values = pd.Series(list(mapping.values()), dtype=object).values
+            return pd.Index(list(mapping)), np.append(fake_values, np.nan)
+
+        return mapping
+
     def _anonymize(self, data):
-        if self._anonymization_mappings:
+        """Replace the values of the PII fields with their fake values.
+
+        Values are mapped through the integer positions of the original values,
+        so each fake value is looked up with an array indexing operation.
+        """
+        if self._anonymization_key is not None:
+            mappings = {}
+            for name, category in self._get_pii_fields().items():
+                uniques = pd.Index(data[name].unique())
+                mappings[name] = (uniques, self._make_hashed_fake_values(category, uniques))
+
+        else:
+            mappings = self._anonymization_mappings
+
+        if mappings:
             data = data.copy()
-            for name, mapping in self._anonymization_mappings.items():
-                data[name] = data[name].map(mapping)
+            for name, mapping in mappings.items():
+                uniques, fake_values = self._get_mapping_arrays(mapping)
+                codes = uniques.get_indexer(data[name])
+                data[name] = fake_values[codes]
 
         return data
 
@@ -365,16 +619,79 @@ class Table:
             pandas.DataFrame:
                 Transformed data.
         """
+        # Selecting the fields creates a new table owned by this pipeline
         data = self._anonymize(data[self._field_names])
 
         for constraint in self._constraints:
-            data = constraint.transform(data)
+            data = self._apply_constraint(constraint.transform, constraint, data)
 
         return self._hyper_transformer.transform(data)
 
+    def _make_ids(self, name, num_rows, offset=0):
+        """Generate the values of an id field.
+
+        Integer ids, and string ids without a ``regex``, are consecutive numbers
+        starting at ``offset``. String ids with a ``regex`` are the values
+        enumerated from it, skipping the first ``offset`` ones.
+
+        Args:
+            name (str):
+                Name of the id field.
+            num_rows (int):
+                Number of values to generate.
+            offset (int):
+                Number of values to skip. Defaults to 0.
+
+        Returns:
+            numpy.ndarray or list:
+                Generated values.
+
+        Raises:
+            ValueError:
+                If the ``regex`` of the field cannot generate enough values.
+        """
+        field_meta = self._fields_metadata[name]
+        regex = field_meta.get('regex')
+        if field_meta.get('subtype') != 'string' or regex is None:
+            return np.arange(offset, offset + num_rows)
+
+        import exrex  # Lazy import to speed up importing sdv
+
+        values = list(itertools.islice(exrex.generate(regex), offset, offset + num_rows))
+        if len(values) < num_rows:
+            raise ValueError('Not enough values to generate ids for field {}'.format(name))
+
+        return values
+
+    def set_ids(self, data, offset=0):
+        """Replace the values of the id fields with new ones.
+
+        Used to number the ids of rows sampled in several chunks, so that they
+        are unique within all of them.
+
+        Args:
+            data (pandas.DataFrame):
+                Reverse transformed data. It is modified in place.
+            offset (int):
+                Number of ids generated for the previous chunks. Defaults to 0.
+
+        Returns:
+            pandas.DataFrame:
+                The given data with the new ids.
+        """
+        dtypes = self.get_dtypes(ids=True)
+        for name, field_meta in self._fields_metadata.items():
+            if field_meta['type'] == 'id':
+                ids = pd.Series(self._make_ids(name, len(data), offset), index=data.index)
+                data[name] = ids.astype(dtypes[name])
+
+        return data
+
     def reverse_transform(self, data):
         """Reverse the transformed data to the original format.
 
+        New values are generated for the id fields, starting from the first one.
+
         Args:
             data (pandas.DataFrame):
                 Data to be reverse transformed.
@@ -385,13 +702,15 @@ class Table:
         reversed_data = self._hyper_transformer.reverse_transform(data)
 
         for constraint in self._constraints:
-            reversed_data = constraint.reverse_transform(reversed_data)
+            reversed_data = self._apply_constraint(
+                constraint.reverse_transform, constraint, reversed_data)
 
         fields = self._fields_metadata
         for name, dtype in self.get_dtypes(ids=True).items():
             field_type = fields[name]['type']
             if field_type == 'id':
-                field_data = pd.Series(np.arange(len(reversed_data)))
+                field_data = pd.Series(
+                    self._make_ids(name, len(reversed_data)), index=reversed_data.index)
             else:
                 field_data = reversed_data[name]
 
@@ -399,6 +718,12 @@ class Table:
 
         return reversed_data[self._field_names]
 
+    def _get_constraint_plan(self):
+        if self._constraint_plan is None:
+            self._constraint_plan = ConstraintPlan(self._constraints)
+
+        return self._constraint_plan
+
     def filter_valid(self, data):
         """Filter the data using the constraints and return only the valid rows.
 
@@ -410,10 +735,27 @@ class Table:
             pandas.DataFrame:
                 Table containing only the valid rows.
         """
-        for constraint in self._constraints:
-            data = constraint.filter_valid(data)
+        return self._get_constraint_plan().filter_valid(data)
 
-        return data
+    def get_constraint_rejections(self):
+        """Get the number of sampled rows rejected by each constraint.
+
+        Returns:
+            dict:
+                Number of ``evaluated`` rows and number of ``rejected`` rows per
+                constraint. See ``ConstraintPlan.get_rejections``.
+        """
+        return self._get_constraint_plan().get_rejections()
+
+    def get_acceptance_rate(self):
+        """Estimate the proportion of sampled rows that fulfill the constraints.
+
+        Returns:
+            float:
+                Estimated acceptance rate, or ``None`` if no rows were evaluated yet.
+                See ``ConstraintPlan.get_acceptance_rate``.
+        """
+        return self._get_constraint_plan().get_acceptance_rate()
 
     # ###################### #
     # Metadata Serialization #
@@ -430,6 +772,8 @@ class Table:
             'fields': copy.deepcopy(self._fields_metadata),
             'constraints': [constraint.to_dict() for constraint in self._constraints],
             'model_kwargs': copy.deepcopy(self._model_kwargs),
+            'anonymization_key': self._anonymization_key,
+            'n_jobs': self._n_jobs,
         }
 
     def to_json(self, path):
@@ -450,7 +794,10 @@ class Table:
             metadata_dict (dict):
                 Dict metadata to load.
         """
-        instance = cls()
+        instance = cls(
+            n_jobs=metadata_dict.get('n_jobs'),
+            anonymization_key=metadata_dict.get('anonymization_key')
+        )
         instance._fields_metadata = copy.deepcopy(metadata_dict['fields'])
         instance._constraints = copy.deepcopy(metadata_dict.get('constraints', []))
         instance._model_kwargs = copy.deepcopy(metadata_dict.get('model_kwargs'))
@@ -17,12 +17,15 @@ class SDVModel:
         """
         raise NotImplementedError
 
-    def sample(self, num_samples):
+    def sample(self, num_samples, random_state=None):
         """Sample ``num_samples`` rows from the model.
 
         Args:
             num_samples (int):
                 Amount of rows to sample.
+            random_state (numpy.random.Generator):
+                If given, draw the rows from this generator instead of the
+                global random state.
 
         Returns:
             pandas.DataFrame:
@@ -8,7 +8,7 @@ from copulas.univariate import GaussianUnivariate
 from sdv.models.base import SDVModel
 from sdv.tabular.utils import (
     check_matrix_symmetric_positive_definite, flatten_dict, impute, make_positive_definite,
-    square_matrix, unflatten_dict)
+    sample_gaussian_multivariate, square_matrix, unflatten_dict)
 
 
 class GaussianCopula(SDVModel):
@@ -53,18 +53,24 @@ class GaussianCopula(SDVModel):
         self.model = GaussianMultivariate(distribution=self.distribution)
         self.model.fit(table_data)
 
-    def sample(self, num_samples):
+    def sample(self, num_samples, random_state=None):
         """Sample ``num_samples`` rows from the model.
 
         Args:
             num_samples (int):
                 Amount of rows to sample.
+            random_state (numpy.random.Generator):
+                If given, draw the rows from this generator instead of the
+                global random state.
 
         Returns:
             pandas.DataFrame:
                 Sampled data with the number of rows specified in ``num_samples``.
         """
-        return self.model.sample(num_samples)
+        if random_state is None:
+            return self.model.sample(num_samples)
+
+        return sample_gaussian_multivariate(self.model, num_samples, random_state)
 
     def get_parameters(self):
         """Get copula model parameters.
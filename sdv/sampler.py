@@ -1,11 +1,15 @@
 """SDV Sampler."""
 
 import itertools
+import logging
 
-import exrex
 import numpy as np
 import pandas as pd
 
+from sdv.tabular.utils import get_random_generator
+
+LOGGER = logging.getLogger(__name__)
+
 
 class Sampler:
     """Sampler class.
@@ -19,14 +23,28 @@ class Sampler:
             Model class to sample data.
         model_kwargs (dict):
             Additional arguments to create the ``SDVModel``.
+        table_sizes (dict):
+            Number of rows of each table in the original dataset.
+        random_state (int or numpy.random.Generator):
+            Seed or ``Generator`` used for all the random draws made while
+            sampling. If ``None``, the global random state is used.
+        constraints (list[sdv.constraints.relational.CrossTableConstraint]):
+            Constraints between child and parent rows. The child rows sampled for
+            each parent row that break them are sampled again, up to
+            ``MAX_CONSTRAINT_RETRIES`` times, after which they are dropped.
     """
 
     metadata = None
     models = None
     primary_key = None
     remaining_primary_key = None
+    _random_state = None
+    _constraints = ()
 
-    def __init__(self, metadata, models, model, model_kwargs, table_sizes):
+    MAX_CONSTRAINT_RETRIES = 100
+
+    def __init__(self, metadata, models, model, model_kwargs, table_sizes, random_state=None,
+                 constraints=None):
         self.metadata = metadata
         self.models = models
         self.primary_key = dict()
@@ -34,6 +52,43 @@ class Sampler:
         self.model = model
         self.model_kwargs = model_kwargs
         self.table_sizes = table_sizes
+        self._random_state = get_random_generator(random_state)
+        self._constraints = constraints or []
+
+    @staticmethod
+    def get_required_tables(metadata, table_names, sample_children=True):
+        """Get the tables whose models are needed to sample the given ones.
+
+        These are the given tables, their descendants if ``sample_children``,
+        and the parents of all of them, which are sampled to find the parent
+        ids of the rows whose foreign keys are not set while sampling.
+
+        Args:
+            metadata (Metadata):
+                Dataset Metadata.
+            table_names (list[str]):
+                Names of the tables to sample.
+            sample_children (bool):
+                Whether the child tables are sampled as well. Defaults to ``True``.
+
+        Returns:
+            set:
+                Names of the required tables.
+        """
+        sampled = set()
+        pending = list(table_names)
+        while pending:
+            table_name = pending.pop()
+            if table_name not in sampled:
+                sampled.add(table_name)
+                if sample_children:
+                    pending.extend(metadata.get_children(table_name))
+
+        required = set(sampled)
+        for table_name in sampled:
+            required.update(metadata.get_parents(table_name))
+
+        return required
 
     def _reset_primary_keys_generators(self):
         """Reset the primary key generators."""
@@ -111,6 +166,8 @@ class Sampler:
                     generator = itertools.count()
                     remaining = np.inf
                 elif subtype == 'string':
+                    import exrex  # Lazy import to speed up importing sdv
+
                     regex = field.get('regex', r'^[a-zA-Z]+$')
                     generator = exrex.generate(regex)
                     remaining = exrex.count(regex)
@@ -168,7 +225,11 @@ class Sampler:
         """
         primary_key_name, primary_key_values = self._get_primary_keys(table_name, num_rows)
 
-        sampled = model.sample(num_rows)
+        if self._random_state is None:
+            sampled = model.sample(num_rows)
+        else:
+            sampled = model.sample(num_rows, random_state=self._random_state)
+
         if primary_key_name:
             sampled[primary_key_name] = primary_key_values
 
@@ -180,6 +241,61 @@ class Sampler:
             for _, row in table_rows.iterrows():
                 self._sample_child_rows(child_name, table_name, row, sampled_data)
 
+    def _reverse_transform(self, table_name, table_rows):
+        """Reverse transform the sampled rows to evaluate the constraints on them."""
+        return self.metadata.reverse_transform(table_name, table_rows.copy())
+
+    def _apply_constraints(self, model, table_name, parent_name, parent_row, table_rows):
+        """Sample again the child rows that break the constraints with their parent row.
+
+        Args:
+            model (SDVModel):
+                Model used to sample the child rows.
+            table_name (str):
+                Name of the child table.
+            parent_name (str):
+                Name of the parent table.
+            parent_row (pandas.Series):
+                Sampled parent row.
+            table_rows (pandas.DataFrame):
+                Child rows sampled for the parent row.
+
+        Returns:
+            pandas.DataFrame:
+                Child rows that fulfill all the constraints.
+        """
+        constraints = [
+            constraint
+            for constraint in self._constraints
+            if constraint.parent == parent_name and constraint.child == table_name
+        ]
+        if not constraints or table_rows.empty:
+            return table_rows
+
+        parent_data = pd.DataFrame([parent_row]).infer_objects()
+        parent_data = self._reverse_transform(parent_name, parent_data).iloc[0]
+
+        for retry in range(self.MAX_CONSTRAINT_RETRIES + 1):
+            reversed_rows = self._reverse_transform(table_name, table_rows)
+            valid = np.ones(len(table_rows), dtype=bool)
+            for constraint in constraints:
+                valid &= np.asarray(constraint.is_valid(parent_data, reversed_rows), dtype=bool)
+
+            num_invalid = len(valid) - valid.sum()
+            if not num_invalid or retry == self.MAX_CONSTRAINT_RETRIES:
+                break
+
+            resampled = self._sample_rows(model, num_invalid, table_name)
+            table_rows = pd.concat([table_rows[valid], resampled]).reset_index(drop=True)
+
+        if num_invalid:
+            LOGGER.warning('Dropping %s rows of table %s that break its constraints with '
+                           'table %s after %s retries', num_invalid, table_name, parent_name,
+                           self.MAX_CONSTRAINT_RETRIES)
+            table_rows = table_rows[valid].reset_index(drop=True)
+
+        return table_rows
+
     def _sample_child_rows(self, table_name, parent_name, parent_row, sampled_data):
         parameters = self._extract_parameters(parent_row, table_name)
 
@@ -188,6 +304,9 @@ class Sampler:
         num_rows = max(round(parameters['child_rows']), 0)
 
         table_rows = self._sample_rows(model, num_rows, table_name)
+        if self._constraints:
+            table_rows = self._apply_constraints(
+                model, table_name, parent_name, parent_row, table_rows)
 
         parent_key = self.metadata.get_primary_key(parent_name)
         foreign_key = self.metadata.get_foreign_key(parent_name, table_name)
@@ -202,7 +321,7 @@ class Sampler:
         self._sample_children(table_name, sampled_data)
 
     @staticmethod
-    def _find_parent_id(likelihoods, num_rows):
+    def _find_parent_id(likelihoods, num_rows, random_state=None):
         mean = likelihoods.mean()
         if (likelihoods == 0).all():
             # All rows got 0 likelihood, fallback to num_rows
@@ -219,7 +338,7 @@ class Sampler:
 
         weights = likelihoods.values / likelihoods.sum()
 
-        return np.random.choice(likelihoods.index, p=weights)
+        return (random_state or np.random).choice(likelihoods.index, p=weights)
 
     def _get_likelihoods(self, table_rows, parent_rows, table_name):
         likelihoods = dict()
@@ -249,7 +368,8 @@ class Sampler:
         num_rows = parent_rows['__' + table_name + '__child_rows'].clip(0)
 
         likelihoods = self._get_likelihoods(table_rows, parent_rows, table_name)
-        return likelihoods.apply(self._find_parent_id, axis=1, num_rows=num_rows)
+        return likelihoods.apply(self._find_parent_id, axis=1, num_rows=num_rows,
+                                 random_state=self._random_state)
 
     def sample(self, table_name, num_rows=None, reset_primary_keys=False,
                sample_children=True, sample_parents=True):
@@ -278,6 +398,12 @@ class Sampler:
                   and child tables.
                 - Returns a ``pandas.DataFrame`` when ``sample_children`` is ``False``.
         """
+        required = self.get_required_tables(self.metadata, [table_name], sample_children)
+        missing = sorted(name for name in required if name not in self.models)
+        if missing:
+            raise ValueError('Cannot sample table {} because the models of tables {} '
+                             'were not loaded'.format(table_name, missing))
+
         if reset_primary_keys:
             self._reset_primary_keys_generators()
 
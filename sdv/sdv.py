@@ -2,10 +2,12 @@
 
 """Main SDV module."""
 
+import os
 import pickle
 
 from copulas.univariate import GaussianUnivariate
 
+from sdv import serialization
 from sdv.metadata import Metadata
 from sdv.modeler import Modeler
 from sdv.models.copulas import GaussianCopula
@@ -32,12 +34,23 @@ class SDV:
             ``sdv.models.copulas.GaussianCopula``.
         model_kwargs (dict):
             Keyword arguments to pass to the model. Defaults to ``None``.
+        random_state (int or numpy.random.Generator):
+            Seed or ``Generator`` used for all the random draws made while
+            sampling. If ``None``, the global random state is used.
+        constraints (list[sdv.constraints.relational.CrossTableConstraint]):
+            Constraints between the rows of child and parent tables, enforced
+            while sampling the child rows of each parent row. Defaults to ``None``.
     """
 
     sampler = None
+    random_state = None
+    constraints = None
 
-    def __init__(self, model=DEFAULT_MODEL, model_kwargs=None):
+    def __init__(self, model=DEFAULT_MODEL, model_kwargs=None, random_state=None,
+                 constraints=None):
         self.model = model
+        self.random_state = random_state
+        self.constraints = constraints
         if model_kwargs is None:
             self.model_kwargs = DEFAULT_MODEL_KWARGS.copy()
         else:
@@ -68,7 +81,8 @@ class SDV:
         self.modeler = Modeler(self.metadata, self.model, self.model_kwargs)
         self.modeler.model_database(tables)
         self.sampler = Sampler(self.metadata, self.modeler.models, self.model,
-                               self.model_kwargs, self.modeler.table_sizes)
+                               self.model_kwargs, self.modeler.table_sizes, self.random_state,
+                               self.constraints)
 
     def sample(self, table_name, num_rows=None, sample_children=True, reset_primary_keys=False):
         """Sample ``num_rows`` rows from the indicated table.
@@ -125,23 +139,136 @@ class SDV:
 
         return self.sampler.sample_all(num_rows, reset_primary_keys=reset_primary_keys)
 
-    def save(self, path):
-        """Save this SDV instance to the given path using pickle.
+    def _save_compact(self, path):
+        """Store this SDV instance in the compact format.
+
+        The directory will contain an ``sdv`` index with the metadata and the
+        global settings, and a ``tables`` folder with the model and the fitted
+        ``HyperTransformer`` of each table stored separately, so that they can
+        be loaded independently.
+        """
+        if self.sampler is None:
+            raise NotFittedError('SDV instance has not been fitted')
+
+        os.makedirs(os.path.join(path, 'tables'), exist_ok=True)
+
+        tables = dict()
+        hyper_transformers = self.metadata._hyper_transformers
+        hyper_transformer_tables = [
+            table_name for table_name in self.sampler.models
+            if hyper_transformers.get(table_name) is not None
+        ]
+        for index, (table_name, model) in enumerate(self.sampler.models.items()):
+            table_path = os.path.join('tables', 'table_{}'.format(index))
+            serialization.dump({
+                'model': model,
+                'hyper_transformer': hyper_transformers.get(table_name),
+            }, os.path.join(path, table_path))
+            tables[table_name] = table_path
+
+        serialization.dump({
+            'model': self.model,
+            'model_kwargs': self.model_kwargs,
+            'random_state': self.random_state,
+            'constraints': self.constraints,
+            'metadata': self.metadata.to_dict(),
+            'root_path': self.metadata.root_path,
+            'table_sizes': self.sampler.table_sizes,
+            'sampler_random_state': self.sampler._random_state,
+            'tables': tables,
+            'hyper_transformer_tables': hyper_transformer_tables,
+        }, os.path.join(path, 'sdv'))
+
+    def save(self, path, compact=False):
+        """Save this SDV instance to the given path.
+
+        By default the instance is serialized using pickle. If ``compact``
+        is ``True``, ``path`` is used as a directory where the metadata and
+        the models of each table are stored as JSON files alongside ``.npz``
+        files which contain all their arrays, without pickling anything.
+        The state of the primary key generators is not stored.
 
         Args:
             path (str):
                 Path where the SDV instance will be serialized.
+            compact (bool):
+                Whether to use the compact format instead of pickle.
+                Defaults to ``False``.
         """
+        if compact:
+            self._save_compact(path)
+            return
+
         with open(path, 'wb') as output:
             pickle.dump(self, output)
 
     @classmethod
-    def load(cls, path):
+    def _load_compact(cls, path, tables=None, lazy=False, max_loaded_tables=None,
+                      allowed_modules=None):
+        index = serialization.load(os.path.join(path, 'sdv'), allowed_modules)
+
+        instance = cls(index['model'], index['model_kwargs'], index['random_state'],
+                       index.get('constraints'))
+        instance.metadata = Metadata(index['metadata'], index['root_path'])
+
+        if tables is not None:
+            tables = Sampler.get_required_tables(instance.metadata, tables)
+
+        table_paths = {
+            table_name: os.path.join(path, table_path)
+            for table_name, table_path in index['tables'].items()
+            if tables is None or table_name in tables
+        }
+        if lazy:
+            store = serialization.LazyStore(table_paths, max_loaded_tables, allowed_modules)
+            models = store.view('model')
+            instance.metadata._hyper_transformers = store.view(
+                'hyper_transformer', index.get('hyper_transformer_tables'))
+        else:
+            models = dict()
+            for table_name, table_path in table_paths.items():
+                table = serialization.load(table_path, allowed_modules)
+                models[table_name] = table['model']
+                if table['hyper_transformer'] is not None:
+                    instance.metadata._hyper_transformers[table_name] = table['hyper_transformer']
+
+        instance.sampler = Sampler(instance.metadata, models, instance.model,
+                                   instance.model_kwargs, index['table_sizes'],
+                                   index['sampler_random_state'], instance.constraints)
+
+        return instance
+
+    @classmethod
+    def load(cls, path, tables=None, lazy=False, max_loaded_tables=None, allowed_modules=None):
         """Load a SDV instance from a given path.
 
+        If ``path`` is a directory, the instance is loaded from the
+        compact format, and otherwise it is unpickled.
+
         Args:
             path (str):
                 Path from which to load the SDV instance.
+            tables (list[str]):
+                Names of the tables whose models will be loaded when using the
+                compact format, along with the models of their child tables and
+                of the parents of all of them, which are needed to sample them.
+                Only these tables can be sampled afterwards. If ``None``, all
+                the tables are loaded. Defaults to ``None``.
+            lazy (bool):
+                Whether to read only the index of the compact format and load
+                the model and transformers of each table the first time the
+                ``Sampler`` needs them. Defaults to ``False``.
+            max_loaded_tables (int):
+                When ``lazy`` is ``True``, maximum number of tables to keep
+                loaded, discarding the least recently used ones. If ``None``,
+                tables are never discarded. Defaults to ``None``.
+            allowed_modules (list[str]):
+                Names of additional modules from which the compact format can
+                import classes and functions, such as the one that defines a
+                custom model. Defaults to ``None``.
         """
+        if os.path.isdir(path):
+            return cls._load_compact(path, tables, lazy, max_loaded_tables, allowed_modules)
+
         with open(path, 'rb') as f:
             return pickle.load(f)
@@ -0,0 +1,475 @@
+"""Compact serialization of fitted SDV objects.
+
+Objects are stored as a pair of files: a JSON document that describes the
+structure of the object and a ``.npz`` file that contains all its numerical
+arrays. Nothing is pickled: classes and functions are referenced by their
+qualified names and instances are rebuilt from their attributes, except
+for ``copulas`` models, which are rebuilt from their ``to_dict`` output.
+
+When loading, classes and functions are only imported from ``ALLOWED_MODULES``,
+besides a few builtin types, unless more modules are explicitly trusted.
+``torch`` and ``ctgan`` objects are not supported.
+"""
+
+import json
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Mapping, MutableMapping
+
+import numpy as np
+import pandas as pd
+
+from sdv.constraints.base import get_qualified_name, import_object
+
+FORMAT_VERSION = 1
+MIN_LIST_ARRAY_SIZE = 16
+DICT_SERIALIZED_MODULES = ('copulas.', )
+UNSUPPORTED_MODULES = ('ctgan', 'torch')
+ALLOWED_MODULES = ('sdv', 'rdt', 'copulas', 'numpy', 'pandas')
+ALLOWED_TYPES = frozenset(
+    get_qualified_name(allowed_type)
+    for allowed_type in (
+        bool, int, float, complex, str, bytes, list, tuple, dict, set, frozenset, object,
+        OrderedDict, defaultdict, Counter,
+    )
+)
+
+
+def _is_importable(obj):
+    return '<' not in getattr(obj, '__qualname__', '<')
+
+
+def _get_state(obj):
+    """Get the attributes of an object, honoring ``__getstate__`` if it returns a dict."""
+    getstate = getattr(obj, '__getstate__', None)
+    state = getstate() if getstate is not None else None
+    if not isinstance(state, dict):
+        state = vars(obj)
+
+    return state
+
+
+def _check_supported(obj):
+    for module in (getattr(obj, '__module__', None), type(obj).__module__):
+        if isinstance(module, str) and module.split('.')[0] in UNSUPPORTED_MODULES:
+            raise TypeError(
+                '{} objects cannot be stored in the compact format, use pickle instead'.format(
+                    module.split('.')[0]))
+
+
+def _import_object(name, modules):
+    """Import an object from its qualified name if it belongs to one of the given modules."""
+    allowed = name in ALLOWED_TYPES or any(
+        name.startswith(module + '.') for module in modules)
+    if not allowed:
+        raise ValueError(
+            'Cannot load {}: only objects from the modules {} can be loaded. Add its '
+            'module to allowed_modules if it can be trusted.'.format(name, ', '.join(modules)))
+
+    return import_object(name)
+
+
+def _add_array(array, arrays):
+    key = str(len(arrays))
+    arrays[key] = array
+    return key
+
+
+def _list_to_array(values):
+    try:
+        array = np.array(values)
+    except ValueError:
+        return None
+
+    if array.dtype.kind in 'if' and array.size >= MIN_LIST_ARRAY_SIZE:
+        return array
+
+    return None
+
+
+def _encode(obj, arrays, owner=None):
+    """Encode an object as JSON compatible values, storing its arrays aside."""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind == 'O':
+            values = [_encode(value, arrays) for value in obj.ravel()]
+            return {'__object_array__': values, 'shape': obj.shape}
+
+        return {'__array__': _add_array(obj, arrays)}
+
+    if isinstance(obj, (np.bool_, np.integer, np.floating)):
+        return obj.item()
+
+    if isinstance(obj, np.generic):
+        return {'__scalar__': _add_array(np.array(obj), arrays)}
+
+    if obj is pd.NaT:
+        return {'__nat__': True}
+
+    if isinstance(obj, pd.Timestamp):
+        return {'__timestamp__': obj.value, 'tz': None if obj.tz is None else str(obj.tz)}
+
+    if isinstance(obj, pd.Timedelta):
+        return {'__timedelta__': obj.value}
+
+    if isinstance(obj, np.dtype):
+        return {'__dtype__': obj.str}
+
+    if isinstance(obj, np.random.Generator):
+        return {'__generator__': _encode(obj.bit_generator.state, arrays)}
+
+    if isinstance(obj, pd.DataFrame):
+        columns = [[_encode(name, arrays), _encode(obj[name], arrays)] for name in obj.columns]
+        return {'__frame__': columns, 'index': _encode(obj.index, arrays)}
+
+    if isinstance(obj, pd.Series):
+        return {
+            '__series__': _encode(np.asarray(obj.values), arrays),
+            'index': _encode(obj.index, arrays),
+            'name': _encode(obj.name, arrays),
+        }
+
+    if isinstance(obj, pd.Index):
+        return {
+            '__index__': _encode(np.asarray(obj.values), arrays),
+            'name': _encode(obj.name, arrays),
+        }
+
+    if isinstance(obj, list):
+        array = _list_to_array(obj)
+        if array is not None:
+            return {'__list__': _add_array(array, arrays)}
+
+        return [_encode(value, arrays, owner) for value in obj]
+
+    if isinstance(obj, tuple):
+        return {'__tuple__': [_encode(value, arrays, owner) for value in obj]}
+
+    if isinstance(obj, (set, frozenset)):
+        return {'__set__': [_encode(value, arrays, owner) for value in obj]}
+
+    if isinstance(obj, dict):
+        plain = type(obj) is dict
+        if plain and all(isinstance(key, str) and not key.startswith('__') for key in obj):
+            return {key: _encode(value, arrays, owner) for key, value in obj.items()}
+
+        encoded = {'__dict__': [
+            [_encode(key, arrays, owner), _encode(value, arrays, owner)]
+            for key, value in obj.items()
+        ]}
+        if not plain:
+            # Keep the class of dict subclasses, such as ``OrderedDict``, and their attributes.
+            encoded['class'] = get_qualified_name(type(obj))
+            if isinstance(obj, defaultdict):
+                encoded['default_factory'] = _encode(obj.default_factory, arrays, owner)
+
+            state = getattr(obj, '__dict__', None)
+            if state:
+                encoded['state'] = {
+                    key: _encode(value, arrays, obj) for key, value in state.items()}
+
+        return encoded
+
+    _check_supported(obj)
+
+    if isinstance(obj, type) or (callable(obj) and hasattr(obj, '__qualname__')):
+        if getattr(obj, '__self__', None) is not None:
+            if obj.__self__ is owner:
+                return {'__method__': obj.__name__}
+        elif _is_importable(obj):
+            return {'__import__': get_qualified_name(obj)}
+
+    elif hasattr(obj, '__dict__'):
+        name = get_qualified_name(obj)
+        if name.startswith(DICT_SERIALIZED_MODULES) and hasattr(obj, 'to_dict'):
+            return {'__object__': name, 'dict': _encode(obj.to_dict(), arrays)}
+
+        state = {key: _encode(value, arrays, obj) for key, value in _get_state(obj).items()}
+        return {'__object__': name, 'state': state}
+
+    raise TypeError('Object of type {} cannot be serialized'.format(type(obj).__name__))
+
+
+def _decode(obj, arrays, modules, owner=None):
+    """Rebuild an object from its encoded representation."""
+    if isinstance(obj, list):
+        return [_decode(value, arrays, modules, owner) for value in obj]
+
+    if not isinstance(obj, dict):
+        return obj
+
+    if '__array__' in obj:
+        return arrays[obj['__array__']]
+
+    if '__list__' in obj:
+        return arrays[obj['__list__']].tolist()
+
+    if '__object_array__' in obj:
+        decoded = _decode(obj['__object_array__'], arrays, modules)
+        values = np.empty(len(decoded), dtype=object)
+        for position, value in enumerate(decoded):
+            values[position] = value
+
+        return values.reshape(obj['shape'])
+
+    if '__scalar__' in obj:
+        return arrays[obj['__scalar__']][()]
+
+    if '__nat__' in obj:
+        return pd.NaT
+
+    if '__timestamp__' in obj:
+        return pd.Timestamp(obj['__timestamp__'], tz=obj['tz'])
+
+    if '__timedelta__' in obj:
+        return pd.Timedelta(obj['__timedelta__'])
+
+    if '__dtype__' in obj:
+        return np.dtype(obj['__dtype__'])
+
+    if '__generator__' in obj:
+        generator = np.random.default_rng()
+        generator.bit_generator.state = _decode(obj['__generator__'], arrays, modules)
+        return generator
+
+    if '__frame__' in obj:
+        columns = [
+            (_decode(name, arrays, modules), _decode(values, arrays, modules))
+            for name, values in obj['__frame__']
+        ]
+        index = _decode(obj['index'], arrays, modules)
+        data = pd.DataFrame(dict(columns), index=index)
+        return data[[name for name, _ in columns]]
+
+    if '__series__' in obj:
+        index = _decode(obj['index'], arrays, modules)
+        name = _decode(obj['name'], arrays, modules)
+        return pd.Series(_decode(obj['__series__'], arrays, modules), index=index, name=name)
+
+    if '__index__' in obj:
+        name = _decode(obj['name'], arrays, modules)
+        return pd.Index(_decode(obj['__index__'], arrays, modules), name=name)
+
+    if '__tuple__' in obj:
+        return tuple(_decode(obj['__tuple__'], arrays, modules, owner))
+
+    if '__set__' in obj:
+        return set(_decode(obj['__set__'], arrays, modules, owner))
+
+    if '__dict__' in obj:
+        items = [
+            (_decode(key, arrays, modules, owner), _decode(value, arrays, modules, owner))
+            for key, value in obj['__dict__']
+        ]
+        if 'class' not in obj:
+            return dict(items)
+
+        dict_class = _import_object(obj['class'], modules)
+        instance = dict_class.__new__(dict_class)
+        if 'default_factory' in obj:
+            instance.default_factory = _decode(obj['default_factory'], arrays, modules, owner)
+
+        if 'state' in obj:
+            instance.__dict__.update({
+                key: _decode(value, arrays, modules, instance)
+                for key, value in obj['state'].items()
+            })
+
+        for key, value in items:
+            instance[key] = value
+
+        return instance
+
+    if '__import__' in obj:
+        return _import_object(obj['__import__'], modules)
+
+    if '__method__' in obj:
+        return getattr(owner, obj['__method__'])
+
+    if '__object__' in obj:
+        object_class = _import_object(obj['__object__'], modules)
+        if 'dict' in obj:
+            return object_class.from_dict(_decode(obj['dict'], arrays, modules))
+
+        instance = object_class.__new__(object_class)
+        state = obj['state']
+        instance.__dict__.update({
+            key: _decode(value, arrays, modules, instance)
+            for key, value in state.items()
+        })
+        return instance
+
+    return {key: _decode(value, arrays, modules, owner) for key, value in obj.items()}
+
+
+def dump(obj, path):
+    """Store an object in ``<path>.json`` and ``<path>.npz``.
+
+    Args:
+        obj (object):
+            Object to store.
+        path (str):
+            Path of the files to write, without extension.
+
+    Raises:
+        TypeError:
+            If the object contains values that cannot be serialized,
+            such as lambda functions.
+    """
+    arrays = dict()
+    content = {
+        'format_version': FORMAT_VERSION,
+        'content': _encode(obj, arrays),
+    }
+    with open(path + '.json', 'w') as json_file:
+        json.dump(content, json_file)
+
+    np.savez(path + '.npz', **arrays)
+
+
+def load(path, allowed_modules=None):
+    """Load an object previously stored with ``dump``.
+
+    Args:
+        path (str):
+            Path of the files to read, without extension.
+        allowed_modules (list[str]):
+            Names of additional modules, such as the one that defines custom
+            constraint functions, from which classes and functions can be
+            imported besides ``ALLOWED_MODULES``. Defaults to ``None``.
+
+    Returns:
+        object:
+            The loaded object.
+
+    Raises:
+        ValueError:
+            If the files were written with a newer format version, or if they
+            reference objects from modules that are not allowed.
+    """
+    with open(path + '.json', 'r') as json_file:
+        content = json.load(json_file)
+
+    format_version = content['format_version']
+    if format_version > FORMAT_VERSION:
+        raise ValueError('Unsupported serialization format version {}'.format(format_version))
+
+    with np.load(path + '.npz', allow_pickle=False) as arrays:
+        modules = ALLOWED_MODULES + tuple(allowed_modules or ())
+        return _decode(content['content'], arrays, modules)
+
+
+class LazyStore(Mapping):
+    """Read-only mapping that loads objects stored with ``dump`` on first access.
+
+    At most ``max_loaded`` objects are kept in memory, discarding the least
+    recently used ones when the limit is exceeded.
+
+    Args:
+        paths (dict):
+            Mapping of names and paths of the stored objects, without extension.
+        max_loaded (int):
+            Maximum number of objects to keep loaded. If ``None``, objects
+            are never discarded.
+        allowed_modules (list[str]):
+            Additional modules from which objects can be loaded. See ``load``.
+    """
+
+    def __init__(self, paths, max_loaded=None, allowed_modules=None):
+        self._paths = paths
+        self._max_loaded = max_loaded
+        self._allowed_modules = allowed_modules
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        with self._lock:
+            if name in self._loaded:
+                self._loaded.move_to_end(name)
+                return self._loaded[name]
+
+            value = load(self._paths[name], self._allowed_modules)
+            self._loaded[name] = value
+            if self._max_loaded is not None and len(self._loaded) > self._max_loaded:
+                self._loaded.popitem(last=False)
+
+            return value
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, name):
+        return name in self._paths
+
+    def get_loaded(self):
+        """Get the names of the objects currently loaded, least recently used first."""
+        return list(self._loaded)
+
+    def view(self, key, names=None):
+        """Get a mapping over one of the keys of the stored dicts.
+
+        Args:
+            key (str):
+                Key to extract from each stored dict. Names whose value
+                is ``None`` are reported as missing when accessed.
+            names (list[str]):
+                Names of the stored dicts whose value for ``key`` is not ``None``,
+                which lets the view check for them without loading anything.
+                If ``None``, all the names of the store are assumed to have a value.
+
+        Returns:
+            LazyStoreView
+        """
+        return LazyStoreView(self, key, names)
+
+
+class LazyStoreView(MutableMapping):
+    """Mapping over one of the keys of the dicts of a ``LazyStore``.
+
+    Values set on the view are kept in memory and take precedence over the
+    stored ones, which are never modified. Checking whether a name is in the
+    view, iterating over it and getting its length never load the stored dicts.
+    """
+
+    def __init__(self, store, key, names=None):
+        self._store = store
+        self._key = key
+        names = None if names is None else set(names)
+        self._names = [name for name in store if names is None or name in names]
+        self._overrides = dict()
+
+    def __getitem__(self, name):
+        if name in self._overrides:
+            return self._overrides[name]
+
+        if name not in self._names:
+            raise KeyError(name)
+
+        value = self._store[name][self._key]
+        if value is None:
+            raise KeyError(name)
+
+        return value
+
+    def __contains__(self, name):
+        return name in self._overrides or name in self._names
+
+    def __setitem__(self, name, value):
+        self._overrides[name] = value
+
+    def __delitem__(self, name):
+        del self._overrides[name]
+
+    def __iter__(self):
+        yield from self._names
+        for name in self._overrides:
+            if name not in self._names:
+                yield name
+
+    def __len__(self):
+        return len(set(self._names) | set(self._overrides))
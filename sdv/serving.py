@@ -0,0 +1,530 @@
+"""Serve synthetic data sampling with low latency.
+
+The ``SamplingServer`` keeps a fitted model warm in memory and coalesces the
+concurrent sampling requests that arrive within a short window into a single
+larger draw, which is then split back and returned to each requester.
+
+The ``SamplePool`` keeps a buffer of rows sampled in advance by a background
+thread so that they can be handed out without waiting for the model.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+LOGGER = logging.getLogger(__name__)
+
+
+class SamplingServer:
+    """Asynchronous sampling server with request batching.
+
+    The server exposes two HTTP endpoints:
+
+        * ``GET /sample?num_rows=<int>[&table_name=<str>]``: Returns the sampled
+          rows as a JSON list of records.
+        * ``GET /stats``: Returns the latency and throughput counters as JSON.
+
+    Args:
+        model (BaseTabularModel or SDV):
+            Fitted model to sample from. If it is an ``SDV`` instance, the
+            ``table_name`` needs to be given on each request.
+        host (str):
+            Host to listen on. Defaults to ``127.0.0.1``.
+        port (int):
+            Port to listen on. If ``0``, a free port is used. Defaults to ``0``.
+        max_batch_rows (int):
+            Maximum number of rows to draw at once. Defaults to ``10000``.
+        batch_delay (float):
+            Number of seconds to wait for more requests to join a batch
+            before drawing it. Defaults to ``0.005``.
+    """
+
+    _server = None
+    _worker = None
+    _queue = None
+    _loop = None
+    _thread = None
+
+    def __init__(self, model, host='127.0.0.1', port=0, max_batch_rows=10000,
+                 batch_delay=0.005):
+        self.model = model
+        self.host = host
+        self.port = port
+        self.max_batch_rows = max_batch_rows
+        self.batch_delay = batch_delay
+        self._stats = {
+            'requests': 0,
+            'rows': 0,
+            'batches': 0,
+            'draws': 0,
+            'errors': 0,
+            'total_latency': 0.0,
+            'max_latency': 0.0,
+        }
+        self._start_time = None
+
+    def _sample_rows(self, table_name, num_rows):
+        if table_name is None:
+            return self.model.sample(num_rows)
+
+        return self.model.sample(table_name, num_rows, sample_children=False)
+
+    def _record(self, num_rows, latency):
+        stats = self._stats
+        stats['requests'] += 1
+        stats['rows'] += num_rows
+        stats['total_latency'] += latency
+        stats['max_latency'] = max(stats['max_latency'], latency)
+
+    def get_stats(self):
+        """Get the latency and throughput counters of this server.
+
+        Returns:
+            dict:
+                Number of requests, rows, batches, draws and errors served,
+                mean and max latency in seconds and rows per second since start.
+        """
+        stats = dict(self._stats)
+        requests = stats['requests']
+        stats['mean_latency'] = stats.pop('total_latency') / requests if requests else 0.0
+        elapsed = time.monotonic() - self._start_time if self._start_time else 0.0
+        stats['rows_per_second'] = stats['rows'] / elapsed if elapsed else 0.0
+        return stats
+
+    async def _draw(self, loop, table_name, requests):
+        total = sum(num_rows for num_rows, _, _ in requests)
+        try:
+            sampled = await loop.run_in_executor(None, self._sample_rows, table_name, total)
+        except Exception as error:
+            self._stats['errors'] += len(requests)
+            for _, future, _ in requests:
+                if not future.done():
+                    future.set_exception(error)
+
+            return
+
+        self._stats['draws'] += 1
+        offset = 0
+        for num_rows, future, start in requests:
+            rows = sampled.iloc[offset:offset + num_rows].reset_index(drop=True)
+            offset += num_rows
+            if not future.done():
+                future.set_result(rows)
+                self._record(num_rows, loop.time() - start)
+
+    async def _collect_batch(self, loop, batch):
+        total = batch[0][1]
+        deadline = loop.time() + self.batch_delay
+        while total < self.max_batch_rows:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+
+            try:
+                request = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+            batch.append(request)
+            total += request[1]
+
+    async def _batch_worker(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                await self._collect_batch(loop, batch)
+
+                self._stats['batches'] += 1
+                groups = OrderedDict()
+                for table_name, num_rows, future, start in batch:
+                    groups.setdefault(table_name, []).append((num_rows, future, start))
+
+                for table_name, requests in groups.items():
+                    await self._draw(loop, table_name, requests)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as error:
+                # Fail the pending requests of this batch but keep serving the next ones.
+                LOGGER.exception('Error processing a batch of %s requests', len(batch))
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        self._stats['errors'] += 1
+                        future.set_exception(error)
+
+    async def sample(self, num_rows, table_name=None):
+        """Sample rows, sharing the draw with other concurrent requests.
+
+        Args:
+            num_rows (int):
+                Number of rows to sample.
+            table_name (str):
+                Name of the table to sample from, if the model is an ``SDV``.
+
+        Returns:
+            pandas.DataFrame:
+                Sampled rows.
+
+        Raises:
+            ValueError:
+                If ``num_rows`` is not positive.
+        """
+        if num_rows < 1:
+            raise ValueError('num_rows must be positive, got {}'.format(num_rows))
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        await self._queue.put((table_name, num_rows, future, loop.time()))
+        return await future
+
+    @staticmethod
+    def _response(status, body):
+        reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+        body = body.encode('utf-8')
+        headers = (
+            'HTTP/1.1 {} {}\r\n'
+            'Content-Type: application/json\r\n'
+            'Content-Length: {}\r\n'
+            'Connection: close\r\n\r\n'
+        ).format(status, reason[status], len(body))
+        return headers.encode('latin-1') + body
+
+    async def _handle_request(self, target):
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        if url.path == '/stats':
+            return self._response(200, json.dumps(self.get_stats()))
+
+        if url.path != '/sample':
+            return self._response(404, json.dumps({'error': 'Not found'}))
+
+        try:
+            num_rows = int(query['num_rows'][0])
+        except (KeyError, ValueError):
+            num_rows = 0
+
+        if num_rows < 1:
+            return self._response(400, json.dumps({'error': 'Invalid num_rows'}))
+
+        table_name = query.get('table_name', [None])[0]
+        try:
+            sampled = await self.sample(num_rows, table_name)
+        except Exception as error:
+            LOGGER.exception('Error sampling %s rows', num_rows)
+            return self._response(500, json.dumps({'error': str(error)}))
+
+        return self._response(200, sampled.to_json(orient='records', date_format='iso'))
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+
+            if len(request_line) < 2 or request_line[0] != 'GET':
+                response = self._response(400, json.dumps({'error': 'Invalid request'}))
+            else:
+                response = await self._handle_request(request_line[1])
+
+            writer.write(response)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    @property
+    def address(self):
+        """Tuple with the host and port where the server is listening."""
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self):
+        """Start listening and processing the sampling requests."""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.ensure_future(self._batch_worker())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self._start_time = time.monotonic()
+        LOGGER.info('Sampling server listening on %s:%s', *self.address)
+
+    async def stop(self):
+        """Stop listening and cancel the pending sampling requests."""
+        self._server.close()
+        await self._server.wait_closed()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+    def start_in_thread(self):
+        """Run the server in a background thread with its own event loop.
+
+        Returns:
+            tuple:
+                Host and port where the server is listening.
+        """
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            finally:
+                started.set()
+
+            loop.run_forever()
+            loop.run_until_complete(self.stop())
+            loop.close()
+
+        self._loop = loop
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+
+        return self.address
+
+    def stop_thread(self):
+        """Stop a server started with ``start_in_thread``."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+class SamplePool:
+    """Buffer of sampled rows refilled in the background.
+
+    The rows are sampled using the ``sample`` method of the model, so they are
+    already reverse transformed and valid according to the table constraints.
+    Whenever the number of buffered rows falls below ``refill_threshold``, a
+    background thread samples ``refill_rows`` new rows. Requests that cannot be
+    fully served from the buffer sample the missing rows directly from the model.
+    If a refill fails, the background thread stops and the error is raised by
+    the following calls to ``take`` and ``wait_until_full``. The model is never
+    sampled by more than one thread at a time, since its id generators and
+    constraints are not thread safe.
+
+    Args:
+        model (BaseTabularModel):
+            Fitted model to sample from.
+        pool_size (int):
+            Maximum number of rows to keep buffered. Defaults to ``10000``.
+        refill_rows (int):
+            Number of rows to sample on each refill. Defaults to ``pool_size``.
+        refill_threshold (int):
+            Number of buffered rows below which a refill is triggered.
+            Defaults to half of ``pool_size``.
+
+    Raises:
+        ValueError:
+            If ``pool_size``, ``refill_rows`` or ``refill_threshold`` are not
+            positive, or ``refill_threshold`` is greater than ``pool_size``.
+    """
+
+    _thread = None
+    _error = None
+
+    def __init__(self, model, pool_size=10000, refill_rows=None, refill_threshold=None):
+        if refill_threshold is None:
+            refill_threshold = max(pool_size // 2, 1)
+
+        if pool_size < 1:
+            raise ValueError('pool_size must be positive, got {}'.format(pool_size))
+
+        if refill_rows is not None and refill_rows < 1:
+            raise ValueError('refill_rows must be positive, got {}'.format(refill_rows))
+
+        if not 0 < refill_threshold <= pool_size:
+            raise ValueError('refill_threshold must be between 1 and pool_size ({}), got {}'
+                             .format(pool_size, refill_threshold))
+
+        self.model = model
+        self.pool_size = pool_size
+        self.refill_rows = refill_rows or pool_size
+        self.refill_threshold = refill_threshold
+
+        self._chunks = deque()
+        self._sample_lock = threading.Lock()
+        self._num_buffered = 0
+        self._condition = threading.Condition()
+        self._stopped = True
+        self._refill_requested = None
+        self._stats = {
+            'requests': 0,
+            'hits': 0,
+            'rows': 0,
+            'buffered_rows_served': 0,
+            'refills': 0,
+            'total_refill_lag': 0.0,
+            'max_refill_lag': 0.0,
+        }
+
+    def _sample(self, num_rows):
+        with self._sample_lock:
+            return self.model.sample(num_rows)
+
+    def _needs_refill(self):
+        return self._num_buffered < self.refill_threshold
+
+    def _refill_loop(self):
+        while True:
+            with self._condition:
+                while not self._stopped and not self._needs_refill():
+                    self._condition.wait()
+
+                if self._stopped:
+                    return
+
+                requested = self._refill_requested or time.monotonic()
+                num_rows = min(self.refill_rows, self.pool_size - self._num_buffered)
+
+            try:
+                sampled = self._sample(num_rows)
+            except Exception as error:
+                LOGGER.exception('Error refilling the sample pool with %s rows', num_rows)
+                with self._condition:
+                    self._error = error
+                    self._condition.notify_all()
+
+                return
+
+            with self._condition:
+                self._chunks.append(sampled.reset_index(drop=True))
+                self._num_buffered += len(sampled)
+                self._refill_requested = None
+
+                lag = time.monotonic() - requested
+                stats = self._stats
+                stats['refills'] += 1
+                stats['total_refill_lag'] += lag
+                stats['max_refill_lag'] = max(stats['max_refill_lag'], lag)
+                self._condition.notify_all()
+
+    def start(self):
+        """Start the background thread that fills the buffer."""
+        with self._condition:
+            self._stopped = False
+            self._error = None
+            self._refill_requested = time.monotonic()
+
+        self._thread = threading.Thread(target=self._refill_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread, waiting for the current refill to finish."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def wait_until_full(self, timeout=None):
+        """Wait until the buffer has at least ``refill_threshold`` rows.
+
+        Args:
+            timeout (float):
+                Maximum number of seconds to wait. If ``None``, wait until full.
+
+        Returns:
+            bool:
+                Whether the buffer got filled before the timeout.
+
+        Raises:
+            Exception:
+                The error raised by the model if a refill failed.
+        """
+        with self._condition:
+            full = self._condition.wait_for(
+                lambda: self._error is not None or not self._needs_refill(), timeout)
+            self._raise_error()
+            return full
+
+    def _take_buffered(self, num_rows):
+        taken = list()
+        while num_rows and self._chunks:
+            chunk = self._chunks.popleft()
+            if len(chunk) > num_rows:
+                self._chunks.appendleft(chunk.iloc[num_rows:])
+                chunk = chunk.iloc[:num_rows]
+
+            taken.append(chunk)
+            num_rows -= len(chunk)
+            self._num_buffered -= len(chunk)
+
+        return taken
+
+    def take(self, num_rows):
+        """Get ``num_rows`` sampled rows, using the buffered ones first.
+
+        Args:
+            num_rows (int):
+                Number of rows to get.
+
+        Returns:
+            pandas.DataFrame:
+                Sampled rows.
+
+        Raises:
+            Exception:
+                The error raised by the model if a refill failed.
+        """
+        with self._condition:
+            self._raise_error()
+            taken = self._take_buffered(num_rows)
+            num_buffered = sum(len(chunk) for chunk in taken)
+            if self._needs_refill():
+                if self._refill_requested is None:
+                    self._refill_requested = time.monotonic()
+
+                self._condition.notify_all()
+
+            stats = self._stats
+            stats['requests'] += 1
+            stats['rows'] += num_rows
+            stats['buffered_rows_served'] += num_buffered
+            if num_buffered == num_rows:
+                stats['hits'] += 1
+
+        if num_buffered < num_rows:
+            taken.append(self._sample(num_rows - num_buffered))
+
+        if not taken:
+            return pd.DataFrame()
+
+        if len(taken) == 1:
+            return taken[0].reset_index(drop=True)
+
+        return pd.concat(taken, ignore_index=True)
+
+    def get_stats(self):
+        """Get the hit rate and refill lag counters of this pool.
+
+        Returns:
+            dict:
+                Number of requests and rows served, fraction of requests fully
+                served from the buffer (``hit_rate``) and of rows served from the
+                buffer, number of refills, mean and max seconds between a refill
+                being needed and being completed, and rows currently buffered.
+        """
+        with self._condition:
+            stats = dict(self._stats)
+            stats['buffered_rows'] = self._num_buffered
+
+        requests = stats['requests']
+        refills = stats['refills']
+        stats['hit_rate'] = stats['hits'] / requests if requests else 0.0
+        stats['buffered_rows_rate'] = (
+            stats['buffered_rows_served'] / stats['rows'] if stats['rows'] else 0.0)
+        stats['mean_refill_lag'] = stats.pop('total_refill_lag') / refills if refills else 0.0
+        return stats
@@ -1,9 +1,18 @@
 """Base Class for tabular models."""
 
+import itertools
 import logging
+import os
 import pickle
 
+import numpy as np
+import pandas as pd
+
+from sdv import serialization
 from sdv.metadata import Table
+from sdv.tabular.utils import (
+    add_missing_levels, get_random_generator, random_state, read_chunks, reservoir_sample,
+    stratified_sample_index, track_levels)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -39,9 +48,27 @@ class BaseTabularModel():
             exception will be raised.
             If not given at all, it will be built using the other
             arguments or learned from the data.
+        random_state (int or numpy.random.Generator):
+            Seed or ``Generator`` used for all the random draws made while
+            fitting and sampling, including the ones made by the transformers.
+            If ``None``, the global random state is used.
+        anonymization_key (str):
+            Secret key used to generate the fake value of each original value of
+            the fields to anonymize from its keyed hash, so that the same values
+            get the same pseudonyms on every fit that uses the same key. If ``None``,
+            the fake values are drawn at random and stored in the metadata.
+            If ``table_metadata`` is given, its own key is used instead.
+        n_jobs (int):
+            Number of processes used to generate the fake values of the fields
+            to anonymize that have many unique values. If ``-1``, one process per
+            CPU is used. Defaults to ``None``, which generates them in this process.
     """
 
     TRANSFORMER_TEMPLATES = None
+    MIN_AUTO_FIT_ROWS = 10000
+    AUTO_FIT_ROWS_PER_COLUMN = 1000
+    CHUNK_SIZE = 100000
+    MIN_ACCEPTANCE_RATE = 0.01
 
     _metadata = None
     _field_names = None
@@ -49,9 +76,15 @@ class BaseTabularModel():
     _field_types = None
     _anonymize_fields = None
     _constraints = None
+    _random_state = None
+    _anonymization_key = None
+    _n_jobs = None
+    _num_fit_rows = None
+    _sample_chunk_size = None
 
     def __init__(self, field_names=None, primary_key=None, field_types=None,
-                 anonymize_fields=None, table_metadata=None, constraints=None):
+                 anonymize_fields=None, table_metadata=None, constraints=None,
+                 random_state=None, anonymization_key=None, n_jobs=None):
         if table_metadata is not None:
             if isinstance(table_metadata, dict):
                 table_metadata = Table(table_metadata)
@@ -69,6 +102,31 @@ class BaseTabularModel():
             self._field_types = field_types
             self._anonymize_fields = anonymize_fields
             self._constraints = constraints
+            self._anonymization_key = anonymization_key
+
+        self._random_state = get_random_generator(random_state)
+        self._n_jobs = n_jobs
+
+    def _get_anonymization_seed(self):
+        """Draw the seed of the ``Faker`` used to anonymize the data, if seeded."""
+        if self._random_state is None:
+            return None
+
+        return int(self._random_state.integers(2 ** 32))
+
+    def _build_metadata(self):
+        """Generate a new Table metadata with the information provided."""
+        return Table(
+            field_names=self._field_names,
+            primary_key=self._primary_key,
+            field_types=self._field_types,
+            anonymize_fields=self._anonymize_fields,
+            constraints=self._constraints,
+            transformer_templates=self.TRANSFORMER_TEMPLATES,
+            random_state=self._get_anonymization_seed(),
+            anonymization_key=self._anonymization_key,
+            n_jobs=self._n_jobs,
+        )
 
     def _fit_metadata(self, data):
         """Generate a new Table metadata and fit it to the data.
@@ -81,19 +139,155 @@ class BaseTabularModel():
             data (pandas.DataFrame):
                 Data to learn from.
         """
-        metadata = Table(
-            field_names=self._field_names,
-            primary_key=self._primary_key,
-            field_types=self._field_types,
-            anonymize_fields=self._anonymize_fields,
-            constraints=self._constraints,
-            transformer_templates=self.TRANSFORMER_TEMPLATES,
-        )
-        metadata.fit(data)
+        metadata = self._build_metadata()
+        with random_state(self._random_state):
+            metadata.fit(data)
 
         self._metadata = metadata
 
-    def fit(self, data):
+    def _transform(self, data):
+        """Transform the data with the metadata.
+
+        Some transformers, like ``categorical_fuzzy``, draw from the global ``numpy``
+        random state, so it is seeded from ``random_state`` while transforming.
+        """
+        with random_state(self._random_state):
+            return self._metadata.transform(data)
+
+    def _reverse_transform(self, data):
+        """Reverse transform the data with the metadata.
+
+        The global ``numpy`` random state is seeded from ``random_state`` as in
+        ``_transform``.
+        """
+        with random_state(self._random_state):
+            return self._metadata.reverse_transform(data)
+
+    def _get_max_fit_rows(self, data, max_fit_rows):
+        """Get the number of rows to fit on, computing it from the data columns if ``'auto'``.
+
+        The original columns are used instead of the transformed ones because, when
+        fitting from a path, the sample size is needed before fitting the metadata.
+        """
+        if max_fit_rows == 'auto':
+            num_columns = len(data.columns)
+            return max(self.MIN_AUTO_FIT_ROWS, self.AUTO_FIT_ROWS_PER_COLUMN * num_columns)
+
+        return max_fit_rows
+
+    def _subsample(self, data, transformed, max_fit_rows):
+        """Select a stratified sample of the transformed rows to fit the model on.
+
+        The strata are built from the categorical and boolean fields found in the
+        original data, so that every combination is kept, as long as ``max_fit_rows``
+        allows it, and the rest of the rows keep their original proportions.
+
+        Args:
+            data (pandas.DataFrame):
+                Original data.
+            transformed (pandas.DataFrame):
+                Transformed data, with the same rows as ``data``.
+            max_fit_rows (int or str):
+                Maximum number of rows to use, or ``'auto'``.
+
+        Returns:
+            pandas.DataFrame:
+                Transformed rows to fit the model on.
+        """
+        max_fit_rows = self._get_max_fit_rows(data, max_fit_rows)
+        if max_fit_rows is None or len(transformed) <= max_fit_rows:
+            return transformed
+
+        strata = [
+            name
+            for name, meta in self._metadata.get_fields().items()
+            if meta['type'] in ('categorical', 'boolean') and name in data
+        ]
+        index = stratified_sample_index(data, strata, max_fit_rows, self._random_state)
+
+        return transformed.iloc[index].reset_index(drop=True)
+
+    def _fit_chunks(self, chunks):
+        """Update the fitted model with statistics computed over all the data.
+
+        When fitting from a path, ``_fit`` only sees a sample of the rows.
+        Subclasses can overwrite this method to refine the learned parameters
+        with a single pass over the transformed chunks of the complete data.
+
+        Args:
+            chunks (iterable[pandas.DataFrame]):
+                Transformed chunks of the complete data.
+        """
+        pass
+
+    def _fit_path(self, path, max_fit_rows, chunk_size):
+        """Fit this model streaming the data from a CSV or Parquet file.
+
+        A first pass over the file keeps a uniform random sample of at most
+        ``max_fit_rows`` rows, which is used to learn the metadata and fit
+        the transformers and the model. The distinct values of the categorical
+        and boolean fields are collected in the same pass, and rows with the ones
+        missing from the sample are added to it, so that the transformers know
+        all the values found in the file. A second pass transforms the file
+        chunk by chunk to let the model refine its parameters using all the rows.
+
+        Fields with more than ``max_fit_rows`` distinct values are not collected,
+        to keep the memory bounded, and the second pass is then skipped since
+        their transformers may not know all the values.
+
+        Args:
+            path (str):
+                Path to the CSV or Parquet file.
+            max_fit_rows (int or str):
+                Maximum number of random rows to keep in memory, or ``'auto'``.
+            chunk_size (int):
+                Number of rows to read at a time.
+
+        Raises:
+            ValueError:
+                If the file does not contain any rows.
+        """
+        chunks = read_chunks(path, chunk_size)
+        first_chunk = next(chunks, pd.DataFrame())
+        max_fit_rows = self._get_max_fit_rows(first_chunk, max_fit_rows or 'auto')
+        chunks = itertools.chain([first_chunk], chunks)
+
+        metadata = self._metadata
+        levels = dict()
+        if metadata is None:
+            metadata = self._build_metadata()
+            level_columns = metadata.get_level_columns(first_chunk)
+            chunks = track_levels(chunks, level_columns, levels, max_fit_rows)
+
+        data, num_rows = reservoir_sample(chunks, max_fit_rows, self._random_state)
+        if not num_rows:
+            raise ValueError('No rows found in {}'.format(path))
+
+        data = add_missing_levels(data, levels, self._random_state)
+        self._num_rows = num_rows
+        self._num_fit_rows = len(data)
+        LOGGER.info('Fitting %s on a sample of %s out of %s rows from %s',
+                    self.__class__.__name__, self._num_fit_rows, self._num_rows, path)
+
+        if self._metadata is None:
+            with random_state(self._random_state):
+                metadata.fit(data)
+
+            self._metadata = metadata
+
+        self._fit(self._transform(data))
+
+        untracked = [list(group) for group, values in levels.items() if values is None]
+        if untracked:
+            LOGGER.warning('Skipping the pass over the complete data of %s because the '
+                           'columns %s have more than %s distinct values',
+                           path, untracked, max_fit_rows)
+            return
+
+        chunks = read_chunks(path, chunk_size)
+        self._fit_chunks(self._transform(chunk) for chunk in chunks)
+
+    def fit(self, data, max_fit_rows=None, chunk_size=None):
         """Fit this model to the data.
 
         If the table metadata has not been given, learn it from the data.
@@ -102,18 +296,53 @@ class BaseTabularModel():
             data (pandas.DataFrame or str):
                 Data to fit the model to. It can be passed as a
                 ``pandas.DataFrame`` or as an ``str``.
-                If an ``str`` is passed, it is assumed to be
-                the path to a CSV file which can be loaded using
-                ``pandas.read_csv``.
+                If an ``str`` is passed, it is assumed to be the path to a
+                CSV file, or a Parquet file if it ends in ``.parquet``,
+                which will be read in chunks without loading it in memory.
+                The metadata, the transformers and the model are fitted on a
+                random sample of the rows plus one row with each category
+                missing from it, and models that support it update their
+                parameters with a second pass over the complete file.
+            max_fit_rows (int or str):
+                If given, the metadata and transformers are fitted on the complete
+                data but the model is fitted on a sample of at most this many rows,
+                stratified by the categorical and boolean fields. If ``'auto'``,
+                the sample size is chosen based on the number of columns of the data.
+                The number of rows used is logged and can be retrieved with
+                ``get_num_fit_rows``. Defaults to ``None``, which uses all the rows
+                of a ``pandas.DataFrame`` and ``'auto'`` when reading from a path.
+            chunk_size (int):
+                Number of rows to read at a time when ``data`` is a path.
+                Defaults to ``CHUNK_SIZE``.
         """
+        if isinstance(data, str):
+            self._fit_path(data, max_fit_rows, chunk_size or self.CHUNK_SIZE)
+            return
+
         if self._metadata is None:
             self._fit_metadata(data)
 
         self._num_rows = len(data)
 
-        transformed = self._metadata.transform(data)
+        transformed = self._transform(data)
+        transformed = self._subsample(data, transformed, max_fit_rows)
+        self._num_fit_rows = len(transformed)
+        if self._num_fit_rows < self._num_rows:
+            LOGGER.info('Fitting %s on a sample of %s out of %s rows',
+                        self.__class__.__name__, self._num_fit_rows, self._num_rows)
+
         self._fit(transformed)
 
+    def get_num_fit_rows(self):
+        """Get the number of rows that the model was fitted on.
+
+        Returns:
+            int:
+                Number of rows used to fit the model, which will be smaller
+                than the number of rows in the data if ``max_fit_rows`` was used.
+        """
+        return self._num_fit_rows
+
     def get_metadata(self):
         """Get metadata about the table.
 
@@ -152,9 +381,74 @@ class BaseTabularModel():
                 Sampled data.
         """
         num_rows = num_rows or self._num_rows
-        num_to_sample = num_rows
+        chunk_size = self._sample_chunk_size
+        if not chunk_size or num_rows <= chunk_size:
+            return self._sample_valid_rows(num_rows, max_retries)
+
+        return self._sample_chunks(num_rows, chunk_size, max_retries)
+
+    def _sample_chunks(self, num_rows, chunk_size, max_retries):
+        """Sample valid rows in chunks of at most ``chunk_size`` rows.
+
+        Each chunk is sampled, reverse transformed and filtered before moving
+        on to the next one, so the intermediate data never exceeds the chunk
+        size. The ids of each chunk are then numbered after the ones of the
+        previous chunks, so they are unique within the sampled rows.
+
+        Args:
+            num_rows (int):
+                Number of valid rows to sample.
+            chunk_size (int):
+                Maximum number of rows to sample at once.
+            max_retries (int):
+                Number of times to retry sampling discarded rows in each chunk.
+
+        Returns:
+            pandas.DataFrame:
+                Sampled data.
+        """
+        chunks = list()
+        num_sampled = 0
+        for start in range(0, num_rows, chunk_size):
+            num_chunk_rows = min(chunk_size, num_rows - start)
+            chunk = self._sample_valid_rows(num_chunk_rows, max_retries)
+            chunks.append(self._metadata.set_ids(chunk, num_sampled))
+            num_sampled += len(chunk)
+
+        return pd.concat(chunks, ignore_index=True)
+
+    def _get_num_rows_to_sample(self, num_rows):
+        """Get the number of rows to sample expected to produce ``num_rows`` valid ones.
+
+        The number is based on the acceptance rate of the constraints estimated from
+        all the rows evaluated so far, bounded below by ``MIN_ACCEPTANCE_RATE``.
+        """
+        acceptance_rate = self._metadata.get_acceptance_rate()
+        if acceptance_rate is None:
+            return num_rows
+
+        acceptance_rate = max(acceptance_rate, self.MIN_ACCEPTANCE_RATE)
+        return int(np.ceil(num_rows / acceptance_rate))
+
+    def _sample_valid_rows(self, num_rows, max_retries):
+        """Sample rows and reject the invalid ones until ``num_rows`` are valid.
+
+        The number of rows sampled at each trial is computed from the estimated
+        acceptance rate of the constraints, so that usually a single trial is needed.
+
+        Args:
+            num_rows (int):
+                Number of valid rows to sample.
+            max_retries (int):
+                Number of times to retry sampling discarded rows.
+
+        Returns:
+            pandas.DataFrame:
+                Sampled data.
+        """
+        num_to_sample = self._get_num_rows_to_sample(num_rows)
         sampled = self._sample(num_to_sample)
-        sampled = self._metadata.reverse_transform(sampled)
+        sampled = self._reverse_transform(sampled)
         sampled = self._metadata.filter_valid(sampled)
         num_valid = len(sampled)
 
@@ -162,19 +456,18 @@ class BaseTabularModel():
         while num_valid < num_rows:
             counter += 1
             if counter >= max_retries:
-                raise ValueError('Could not get enough valid rows within %s trials', max_retries)
+                raise ValueError(
+                    'Could not get enough valid rows within {} trials'.format(max_retries))
 
-            invalid = num_rows - num_valid
             remaining = num_rows - num_valid
-            proportion = counter * num_rows / num_valid
-            num_to_sample = int(remaining * proportion)
+            num_to_sample = self._get_num_rows_to_sample(remaining)
 
-            LOGGER.info('%s invalid rows found. Resampling %s rows', invalid, num_to_sample)
+            LOGGER.info('%s valid rows missing. Resampling %s rows', remaining, num_to_sample)
             resampled = self._sample(num_to_sample)
-            resampled = self._metadata.reverse_transform(resampled)
+            resampled = self._reverse_transform(resampled)
+            resampled = self._metadata.filter_valid(resampled)
 
-            sampled = sampled.append(resampled)
-            sampled = self._metadata.filter_valid(sampled)
+            sampled = pd.concat([sampled, resampled])
             num_valid = len(sampled)
 
         return sampled.head(num_rows)
@@ -222,27 +515,51 @@ class BaseTabularModel():
         """
         raise NotImplementedError()
 
-    def save(self, path):
-        """Save this model instance to the given path using pickle.
+    def save(self, path, compact=False):
+        """Save this model instance to the given path.
+
+        By default the instance is serialized using pickle. If ``compact``
+        is ``True``, ``path`` is used as a directory where the instance is
+        stored as a ``model.json`` file alongside a ``model.npz`` file which
+        contains all its arrays, without pickling anything. ``CTGAN`` models
+        cannot be stored in the compact format.
 
         Args:
             path (str):
                 Path where the SDV instance will be serialized.
+            compact (bool):
+                Whether to use the compact format instead of pickle.
+                Defaults to ``False``.
         """
+        if compact:
+            os.makedirs(path, exist_ok=True)
+            serialization.dump(self, os.path.join(path, 'model'))
+            return
+
         with open(path, 'wb') as output:
             pickle.dump(self, output)
 
     @classmethod
-    def load(cls, path):
+    def load(cls, path, allowed_modules=None):
         """Load a TabularModel instance from a given path.
 
+        If ``path`` is a directory, the instance is loaded from the
+        compact format, and otherwise it is unpickled.
+
         Args:
             path (str):
                 Path from which to load the instance.
+            allowed_modules (list[str]):
+                Names of additional modules from which the compact format can
+                import classes and functions, such as the one that defines the
+                functions of a custom constraint. Defaults to ``None``.
 
         Returns:
             TabularModel:
                 The loaded tabular model.
         """
+        if os.path.isdir(path):
+            return serialization.load(os.path.join(path, 'model'), allowed_modules)
+
         with open(path, 'rb') as f:
             return pickle.load(f)
@@ -1,13 +1,25 @@
 """Wrappers around copulas models."""
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import copulas
+import copulas.multivariate
+import copulas.univariate
 import numpy as np
 import rdt
 
 from sdv.tabular.base import BaseTabularModel
 from sdv.tabular.utils import (
-    check_matrix_symmetric_positive_definite, flatten_dict, make_positive_definite, square_matrix,
-    unflatten_dict)
+    check_matrix_symmetric_positive_definite, flatten_dict, make_positive_definite,
+    sample_gaussian_multivariate, square_matrix, unflatten_dict)
+
+
+def _select_univariate(column_data):
+    """Fit a ``copulas.univariate.Univariate`` and return the name of the selected family."""
+    univariate = copulas.univariate.Univariate()
+    univariate.fit(column_data)
+    return univariate.to_dict()['type']
 
 
 class GaussianCopula(BaseTabularModel):
@@ -44,9 +56,27 @@ class GaussianCopula(BaseTabularModel):
             Type of transformer to use for the categorical variables, to choose
             from ``one_hot_encoding``, ``label_encoding``, ``categorical`` and
             ``categorical_fuzzy``.
+        random_state (int or numpy.random.Generator):
+            Seed or ``Generator`` used for all the random draws made while
+            fitting and sampling. If ``None``, the global random state is used.
+        n_jobs (int):
+            Number of processes used to search the best univariate distribution
+            of each column when ``distribution`` is ``copulas.univariate.Univariate``
+            and to generate the fake values of the fields to anonymize that have
+            many unique values. If ``-1``, one process per CPU is used. Defaults
+            to ``None``, which does both in this process.
+        anonymization_key (str):
+            Secret key used to generate the fake values of the fields to anonymize
+            from the keyed hash of each original value. If ``None``, the fake values
+            are drawn at random and stored in the metadata.
     """
 
     DEFAULT_DISTRIBUTION = copulas.univariate.Univariate
+    SEARCH_DISTRIBUTIONS = (
+        copulas.univariate.Univariate,
+        'copulas.univariate.Univariate',
+        'copulas.univariate.base.Univariate',
+    )
     _distribution = None
     _categorical_transformer = None
     _model = None
@@ -76,6 +106,11 @@ class GaussianCopula(BaseTabularModel):
                 'one_hot_encoding',
                 'label_encoding'
             ]
+        },
+        'n_jobs': {
+            'type': 'int',
+            'default': None,
+            'description': 'Number of processes used to search the univariate distributions',
         }
     }
     DEFAULT_TRANSFORMER = 'one_hot_encoding'
@@ -91,14 +126,18 @@ class GaussianCopula(BaseTabularModel):
 
     def __init__(self, field_names=None, primary_key=None, field_types=None, anonymize_fields=None,
                  constraints=None, table_metadata=None, distribution=None,
-                 categorical_transformer=None):
+                 categorical_transformer=None, random_state=None, n_jobs=None,
+                 anonymization_key=None):
         super().__init__(
             field_names=field_names,
             primary_key=primary_key,
             field_types=field_types,
             anonymize_fields=anonymize_fields,
             constraints=constraints,
-            table_metadata=table_metadata
+            table_metadata=table_metadata,
+            random_state=random_state,
+            anonymization_key=anonymization_key,
+            n_jobs=n_jobs,
         )
 
         if self._metadata is not None:
@@ -110,7 +149,11 @@ class GaussianCopula(BaseTabularModel):
                 if categorical_transformer is None:
                     categorical_transformer = model_kwargs['categorical_transformer']
 
+                if n_jobs is None:
+                    n_jobs = model_kwargs.get('n_jobs')
+
         self._distribution = distribution or self.DEFAULT_DISTRIBUTION
+        self._n_jobs = n_jobs
 
         categorical_transformer = categorical_transformer or self.DEFAULT_TRANSFORMER
         self._categorical_transformer = categorical_transformer
@@ -123,6 +166,7 @@ class GaussianCopula(BaseTabularModel):
         Additional arguments include:
             - Distribution found for each column
             - categorical_transformer
+            - n_jobs
         """
         class_name = self.__class__.__name__
         model_kwargs = self._metadata.get_model_kwargs(class_name)
@@ -138,8 +182,63 @@ class GaussianCopula(BaseTabularModel):
             self._metadata.set_model_kwargs(class_name, {
                 'distribution': distributions,
                 'categorical_transformer': self._categorical_transformer,
+                'n_jobs': self._n_jobs,
             })
 
+    def _select_distributions(self, data):
+        """Find the best univariate distribution for each column of the data.
+
+        The search over the candidate families is run for each column
+        independently, across ``n_jobs`` processes if indicated.
+
+        Args:
+            data (pandas.DataFrame):
+                Data to be fitted.
+
+        Returns:
+            dict:
+                Mapping of column names and distribution names.
+        """
+        columns = list(data.columns)
+        column_data = [data[column] for column in columns]
+
+        n_jobs = self._n_jobs
+        if n_jobs is None or n_jobs == 1 or len(columns) < 2:
+            selected = list(map(_select_univariate, column_data))
+        else:
+            if n_jobs < 0:
+                n_jobs = os.cpu_count()
+
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(columns))) as executor:
+                selected = list(executor.map(_select_univariate, column_data))
+
+        return dict(zip(columns, selected))
+
+    def _get_distribution(self, data):
+        """Get the distribution argument for the ``GaussianMultivariate``.
+
+        If the distribution needs to be searched, the families previously found
+        and stored in the metadata ``model_kwargs`` are reused if they cover the
+        same columns, and otherwise they are searched per column.
+
+        Args:
+            data (pandas.DataFrame):
+                Data to be fitted.
+
+        Returns:
+            copulas.univariate.Univariate, str or dict:
+                Distribution to use.
+        """
+        if self._distribution not in self.SEARCH_DISTRIBUTIONS:
+            return self._distribution
+
+        model_kwargs = self._metadata.get_model_kwargs(self.__class__.__name__) or {}
+        distribution = model_kwargs.get('distribution')
+        if isinstance(distribution, dict) and set(distribution) == set(data.columns):
+            return distribution
+
+        return self._select_distributions(data)
+
     def _fit(self, data):
         """Fit the model to the table.
 
@@ -147,10 +246,43 @@ class GaussianCopula(BaseTabularModel):
             table_data (pandas.DataFrame):
                 Data to be fitted.
         """
-        self._model = copulas.multivariate.GaussianMultivariate(distribution=self._distribution)
+        distribution = self._get_distribution(data)
+        self._model = copulas.multivariate.GaussianMultivariate(distribution=distribution)
         self._model.fit(data)
         self._update_metadata()
 
+    def _fit_chunks(self, chunks):
+        """Recompute the copula correlation matrix over all the data.
+
+        The univariate distributions fitted on the sample are kept, and each chunk
+        is mapped to the standard normal space to accumulate the sums and cross
+        products needed to compute the correlation matrix of the complete data.
+
+        Args:
+            chunks (iterable[pandas.DataFrame]):
+                Transformed chunks of the complete data.
+        """
+        num_rows = 0
+        sums = 0
+        cross_products = 0
+        for chunk in chunks:
+            normal = np.nan_to_num(self._model._transform_to_normal(chunk))
+            num_rows += len(normal)
+            sums = sums + normal.sum(axis=0)
+            cross_products = cross_products + normal.T.dot(normal)
+
+        if num_rows < 2:
+            return
+
+        means = sums / num_rows
+        covariance = cross_products / num_rows - np.outer(means, means)
+        stds = np.sqrt(np.diag(covariance))
+        stds[stds == 0] = 1
+
+        correlation = covariance / np.outer(stds, stds)
+        np.fill_diagonal(correlation, 1)
+        self._model.covariance = correlation
+
     def _sample(self, num_rows):
         """Sample the indicated number of rows from the model.
 
@@ -162,7 +294,10 @@ class GaussianCopula(BaseTabularModel):
             pandas.DataFrame:
                 Sampled data.
         """
-        return self._model.sample(num_rows)
+        if self._random_state is None:
+            return self._model.sample(num_rows)
+
+        return sample_gaussian_multivariate(self._model, num_rows, self._random_state)
 
     def get_parameters(self, flatten=False):
         """Get copula model parameters.
@@ -1,8 +1,237 @@
 """Wrapper around CTGAN model."""
 
+import contextlib
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
 import rdt
 
 from sdv.tabular.base import BaseTabularModel
+from sdv.tabular.utils import random_state
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _CTGANTrainer:
+    """Train a ``CTGANSynthesizer`` one epoch at a time.
+
+    This reproduces the training loop of ``CTGANSynthesizer.fit`` while keeping
+    the discriminator and the optimizers around, so that training can be
+    stopped at any epoch boundary, checkpointed and resumed afterwards.
+
+    Args:
+        synthesizer (ctgan.CTGANSynthesizer):
+            Synthesizer whose ``transformer``, ``cond_generator`` and
+            ``generator`` will be created and trained.
+        data (pandas.DataFrame):
+            Data to be learned.
+        discrete_columns (list[str]):
+            Names of the discrete columns.
+        log_frequency (bool):
+            Whether to use log frequency of categorical levels in conditional sampling.
+        checkpoint (dict):
+            Checkpoint obtained from ``get_checkpoint`` to resume the training
+            from. If ``None``, the training starts from scratch.
+    """
+
+    def __init__(self, synthesizer, data, discrete_columns, log_frequency, checkpoint=None):
+        import torch
+        from ctgan.conditional import ConditionalGenerator
+        from ctgan.models import Discriminator, Generator
+        from ctgan.sampler import Sampler
+        from ctgan.transformer import DataTransformer
+
+        self._torch = torch
+        self.synthesizer = synthesizer
+        device = synthesizer.device
+
+        if checkpoint is None:
+            synthesizer.transformer = DataTransformer()
+            synthesizer.transformer.fit(data, discrete_columns)
+        else:
+            synthesizer.transformer = checkpoint['transformer']
+
+        transformer = synthesizer.transformer
+        train_data = transformer.transform(data)
+        self.data_sampler = Sampler(train_data, transformer.output_info)
+        synthesizer.cond_generator = ConditionalGenerator(
+            train_data, transformer.output_info, log_frequency)
+
+        data_dim = transformer.output_dimensions
+        n_opt = synthesizer.cond_generator.n_opt
+        synthesizer.generator = Generator(
+            synthesizer.embedding_dim + n_opt, synthesizer.gen_dim, data_dim).to(device)
+        self.discriminator = Discriminator(data_dim + n_opt, synthesizer.dis_dim).to(device)
+
+        self.optimizer_g = torch.optim.Adam(
+            synthesizer.generator.parameters(), lr=2e-4, betas=(0.5, 0.9),
+            weight_decay=synthesizer.l2scale
+        )
+        self.optimizer_d = torch.optim.Adam(
+            self.discriminator.parameters(), lr=2e-4, betas=(0.5, 0.9))
+
+        self.epoch = 0
+        self._sampling_time = 0.0
+        self._compute_time = 0.0
+        if checkpoint is not None:
+            synthesizer.generator.load_state_dict(checkpoint['generator'])
+            self.discriminator.load_state_dict(checkpoint['discriminator'])
+            self.optimizer_g.load_state_dict(checkpoint['optimizer_g'])
+            self.optimizer_d.load_state_dict(checkpoint['optimizer_d'])
+            self.epoch = checkpoint['epoch']
+
+        synthesizer.trained_epoches = self.epoch
+
+        batch_size = synthesizer.batch_size
+        self.steps_per_epoch = max(len(train_data) // batch_size, 1)
+        self._mean = torch.zeros(batch_size, synthesizer.embedding_dim, device=device)
+        self._std = self._mean + 1
+
+    def _sample_noise(self):
+        """Sample the generator input and its condition vectors."""
+        torch = self._torch
+        synthesizer = self.synthesizer
+        fakez = torch.normal(mean=self._mean, std=self._std)
+        condvec = synthesizer.cond_generator.sample(synthesizer.batch_size)
+        if condvec is None:
+            return fakez, None, None, None, None
+
+        c1, m1, col, opt = condvec
+        c1 = torch.from_numpy(c1).to(synthesizer.device)
+        m1 = torch.from_numpy(m1).to(synthesizer.device)
+        fakez = torch.cat([fakez, c1], dim=1)
+
+        return fakez, c1, m1, col, opt
+
+    def _discriminator_step(self):
+        torch = self._torch
+        synthesizer = self.synthesizer
+        batch_size = synthesizer.batch_size
+
+        start = time.perf_counter()
+        fakez, c1, _, col, opt = self._sample_noise()
+        if c1 is None:
+            real = self.data_sampler.sample(batch_size, col, opt)
+        else:
+            perm = np.arange(batch_size)
+            np.random.shuffle(perm)
+            real = self.data_sampler.sample(batch_size, col[perm], opt[perm])
+            c2 = c1[perm]
+
+        sampled = time.perf_counter()
+        self._sampling_time += sampled - start
+
+        fake = synthesizer.generator(fakez)
+        fakeact = synthesizer._apply_activate(fake)
+        real = torch.from_numpy(real.astype('float32')).to(synthesizer.device)
+
+        if c1 is not None:
+            fake_cat = torch.cat([fakeact, c1], dim=1)
+            real_cat = torch.cat([real, c2], dim=1)
+        else:
+            real_cat = real
+            fake_cat = fake
+
+        y_fake = self.discriminator(fake_cat)
+        y_real = self.discriminator(real_cat)
+
+        pen = self.discriminator.calc_gradient_penalty(real_cat, fake_cat, synthesizer.device)
+        loss_d = -(torch.mean(y_real) - torch.mean(y_fake))
+
+        self.optimizer_d.zero_grad()
+        pen.backward(retain_graph=True)
+        loss_d.backward()
+        self.optimizer_d.step()
+
+        self._compute_time += time.perf_counter() - sampled
+
+        return loss_d
+
+    def _generator_step(self):
+        torch = self._torch
+        synthesizer = self.synthesizer
+
+        start = time.perf_counter()
+        fakez, c1, m1, _, _ = self._sample_noise()
+        sampled = time.perf_counter()
+        self._sampling_time += sampled - start
+
+        fake = synthesizer.generator(fakez)
+        fakeact = synthesizer._apply_activate(fake)
+
+        if c1 is None:
+            y_fake = self.discriminator(fakeact)
+            cross_entropy = 0
+        else:
+            y_fake = self.discriminator(torch.cat([fakeact, c1], dim=1))
+            cross_entropy = synthesizer._cond_loss(fake, c1, m1)
+
+        loss_g = -torch.mean(y_fake) + cross_entropy
+
+        self.optimizer_g.zero_grad()
+        loss_g.backward()
+        self.optimizer_g.step()
+
+        self._compute_time += time.perf_counter() - sampled
+
+        return loss_g
+
+    def train_epoch(self):
+        """Run one training epoch.
+
+        Returns:
+            dict:
+                Epoch number, generator and discriminator losses of the last step
+                and their means over the epoch, number of seconds spent, rows
+                processed per second, and seconds spent sampling the training data
+                and noise versus running the forward and backward passes.
+        """
+        self._sampling_time = 0.0
+        self._compute_time = 0.0
+        total_g = 0.0
+        total_d = 0.0
+        start = time.perf_counter()
+        for _ in range(self.steps_per_epoch):
+            loss_d = self._discriminator_step()
+            loss_g = self._generator_step()
+            total_d += loss_d.detach()
+            total_g += loss_g.detach()
+
+        elapsed = time.perf_counter() - start
+        self.epoch += 1
+        self.synthesizer.trained_epoches = self.epoch
+
+        return {
+            'epoch': self.epoch,
+            'loss_g': float(loss_g.detach().cpu()),
+            'loss_d': float(loss_d.detach().cpu()),
+            'mean_loss_g': float(total_g) / self.steps_per_epoch,
+            'mean_loss_d': float(total_d) / self.steps_per_epoch,
+            'seconds': elapsed,
+            'rows_per_second': self.steps_per_epoch * self.synthesizer.batch_size / elapsed,
+            'sampling_seconds': self._sampling_time,
+            'compute_seconds': self._compute_time,
+        }
+
+    def get_checkpoint(self):
+        """Get the state needed to resume the training later on.
+
+        Returns:
+            dict:
+                Epoch number, fitted ``DataTransformer`` and state dicts
+                of the generator, discriminator and optimizers.
+        """
+        return {
+            'epoch': self.epoch,
+            'transformer': self.synthesizer.transformer,
+            'generator': self.synthesizer.generator.state_dict(),
+            'discriminator': self.discriminator.state_dict(),
+            'optimizer_g': self.optimizer_g.state_dict(),
+            'optimizer_d': self.optimizer_d.state_dict(),
+        }
 
 
 class CTGAN(BaseTabularModel):
@@ -56,10 +285,66 @@ class CTGAN(BaseTabularModel):
             Wheight Decay for the Adam Optimizer. Defaults to 1e-6.
         batch_size (int):
             Number of data samples to process in each step.
+        random_state (int or numpy.random.Generator):
+            Seed or ``Generator`` used to seed ``numpy`` and ``torch`` while
+            fitting and sampling. If ``None``, the global random state is used.
+        checkpoint_path (str):
+            Path of the file where the training state is periodically stored,
+            so that it can be resumed by calling ``fit`` with ``resume=True``.
+            If ``None``, no checkpoints are stored. Defaults to ``None``.
+        checkpoint_frequency (int):
+            Number of epochs between checkpoints. Defaults to 1.
+        max_fit_time (float):
+            Maximum number of seconds to spend training. Training stops at the
+            last epoch boundary expected to finish within the budget, storing a
+            checkpoint if ``checkpoint_path`` is given. If ``None``, all the
+            ``epochs`` are run. Defaults to ``None``.
+        num_threads (int):
+            Number of threads used by ``torch`` for intra-op parallelism while
+            fitting and sampling. If ``None``, the ``torch`` default is kept.
+        interop_threads (int):
+            Number of threads used by ``torch`` for inter-op parallelism. It can
+            only be changed before ``torch`` runs any parallel work, otherwise a
+            warning is logged. If ``None``, the ``torch`` default is kept.
+        sample_chunk_size (int):
+            Maximum number of rows to generate, reverse transform and filter
+            at once when sampling, which bounds the memory used by the
+            intermediate data. Defaults to ``SAMPLE_CHUNK_BATCHES`` batches.
+        early_stopping_patience (int):
+            Number of epochs without improvement of the monitored score after
+            which the training is stopped. The score is the validation score if
+            ``validation_split`` is given, or the absolute value of the mean
+            discriminator loss of the epoch otherwise, which estimates the distance
+            between the real and the synthetic data. If ``None``, all the
+            ``epochs`` are run. Defaults to ``None``.
+        early_stopping_min_delta (float):
+            Minimum decrease of the monitored score to count as an improvement.
+            Defaults to 0.
+        validation_split (float):
+            Fraction of the rows held out from the training data to compute the
+            validation score after every epoch. The score is the average, over all
+            the columns, of the standardized differences between the means and the
+            standard deviations of the held out and the sampled data. If ``None``,
+            no rows are held out. Defaults to ``None``.
+        anonymization_key (str):
+            Secret key used to generate the fake values of the fields to anonymize
+            from the keyed hash of each original value. If ``None``, the fake values
+            are drawn at random and stored in the metadata.
+        n_jobs (int):
+            Number of processes used to generate the fake values of the fields
+            to anonymize that have many unique values. If ``-1``, one process per
+            CPU is used. Defaults to ``None``, which generates them in this process.
     """
 
     _CTGAN_CLASS = None
     _model = None
+    _resume = False
+    _fitted_epochs = None
+    _fit_report = None
+    _validation_data = None
+
+    SAMPLE_CHUNK_BATCHES = 100
+    MAX_VALIDATION_ROWS = 10000
 
     HYPERPARAMETERS = {
         'TBD'
@@ -71,14 +356,21 @@ class CTGAN(BaseTabularModel):
     def __init__(self, field_names=None, primary_key=None, field_types=None,
                  anonymize_fields=None, constraints=None, table_metadata=None,
                  epochs=300, log_frequency=True, embedding_dim=128, gen_dim=(256, 256),
-                 dis_dim=(256, 256), l2scale=1e-6, batch_size=500):
+                 dis_dim=(256, 256), l2scale=1e-6, batch_size=500, random_state=None,
+                 checkpoint_path=None, checkpoint_frequency=1, max_fit_time=None,
+                 num_threads=None, interop_threads=None, sample_chunk_size=None,
+                 early_stopping_patience=None, early_stopping_min_delta=0,
+                 validation_split=None, anonymization_key=None, n_jobs=None):
         super().__init__(
             field_names=field_names,
             primary_key=primary_key,
             field_types=field_types,
             anonymize_fields=anonymize_fields,
             constraints=constraints,
-            table_metadata=table_metadata
+            table_metadata=table_metadata,
+            random_state=random_state,
+            anonymization_key=anonymization_key,
+            n_jobs=n_jobs,
         )
         try:
             from ctgan import CTGANSynthesizer  # Lazy import to make dependency optional
@@ -98,6 +390,76 @@ class CTGAN(BaseTabularModel):
         self._batch_size = batch_size
         self._epochs = epochs
         self._log_frequency = log_frequency
+        self._checkpoint_path = checkpoint_path
+        self._checkpoint_frequency = checkpoint_frequency
+        self._max_fit_time = max_fit_time
+        self._num_threads = num_threads
+        self._interop_threads = interop_threads
+        self._sample_chunk_size = sample_chunk_size or batch_size * self.SAMPLE_CHUNK_BATCHES
+        self._early_stopping_patience = early_stopping_patience
+        self._early_stopping_min_delta = early_stopping_min_delta
+        self._validation_split = validation_split
+
+    def fit(self, data, max_fit_rows=None, chunk_size=None, resume=False):
+        """Fit this model to the data.
+
+        If the table metadata has not been given, learn it from the data.
+
+        Args:
+            data (pandas.DataFrame or str):
+                Data to fit the model to. See ``BaseTabularModel.fit``.
+            max_fit_rows (int or str):
+                Maximum number of rows to fit the model on. See ``BaseTabularModel.fit``.
+            chunk_size (int):
+                Number of rows to read at a time when ``data`` is a path.
+            resume (bool):
+                Whether to resume the training from the checkpoint stored in
+                ``checkpoint_path``, if it exists, instead of starting from
+                scratch. Defaults to ``False``.
+        """
+        self._resume = resume
+        try:
+            super().fit(data, max_fit_rows=max_fit_rows, chunk_size=chunk_size)
+        finally:
+            self._resume = False
+
+    @contextlib.contextmanager
+    def _set_threads(self):
+        """Apply the ``torch`` thread settings, restoring the intra-op ones afterwards."""
+        import torch
+
+        interop_threads = self._interop_threads
+        if interop_threads is not None and torch.get_num_interop_threads() != interop_threads:
+            try:
+                torch.set_num_interop_threads(interop_threads)
+            except RuntimeError as error:
+                LOGGER.warning('Could not set the number of interop threads: %s', error)
+
+        num_threads = torch.get_num_threads()
+        if self._num_threads is not None:
+            torch.set_num_threads(self._num_threads)
+
+        try:
+            yield
+        finally:
+            torch.set_num_threads(num_threads)
+
+    def _load_checkpoint(self):
+        import torch
+
+        if self._resume and self._checkpoint_path and os.path.exists(self._checkpoint_path):
+            LOGGER.info('Resuming training from %s', self._checkpoint_path)
+            # Load the tensors on the device of this model, whatever the one they were saved from.
+            return torch.load(self._checkpoint_path, map_location=self._model.device)
+
+        return None
+
+    def _save_checkpoint(self, trainer):
+        import torch
+
+        tmp_path = self._checkpoint_path + '.tmp'
+        torch.save(trainer.get_checkpoint(), tmp_path)
+        os.replace(tmp_path, self._checkpoint_path)
 
     def _fit(self, data):
         """Fit the model to the table.
@@ -118,12 +480,141 @@ class CTGAN(BaseTabularModel):
             for field, meta in self._metadata.get_fields().items()
             if meta['type'] == 'categorical'
         ]
-        self._model.fit(
-            data,
-            epochs=self._epochs,
-            discrete_columns=categoricals,
-            log_frequency=self._log_frequency,
-        )
+        validation = None
+        if self._validation_split:
+            num_validation = min(
+                int(len(data) * self._validation_split), self.MAX_VALIDATION_ROWS)
+            if num_validation > 1:
+                index = (self._random_state or np.random).permutation(len(data))
+                validation = data.iloc[index[:num_validation]]
+                data = data.iloc[index[num_validation:]]
+
+        self._validation_data = validation
+        try:
+            # ctgan draws from the global numpy and torch random states.
+            with random_state(self._random_state), self._set_threads():
+                self._train(data, categoricals)
+        finally:
+            self._validation_data = None
+
+    def _get_validation_score(self):
+        """Compare the held out rows with as many rows sampled from the generator.
+
+        Returns:
+            float:
+                Average over all the columns of the absolute differences between the
+                means and the standard deviations of the held out and the sampled
+                data, divided by the standard deviation of the held out data.
+        """
+        import torch
+
+        validation = self._validation_data
+        with torch.no_grad():
+            sampled = self._model.sample(len(validation))
+
+        real_mean = validation.mean()
+        real_std = validation.std()
+        scale = real_std.where(real_std > 0, 1)
+        mean_diff = (sampled.mean() - real_mean).abs() / scale
+        std_diff = (sampled.std() - real_std).abs() / scale
+
+        return float((mean_diff + std_diff).mean())
+
+    def _train(self, data, categoricals):
+        """Run the training epochs, checkpointing and stopping as configured.
+
+        Args:
+            data (pandas.DataFrame):
+                Data to be learned.
+            categoricals (list[str]):
+                Names of the categorical columns.
+        """
+        trainer = _CTGANTrainer(
+            self._model, data, categoricals, self._log_frequency, self._load_checkpoint())
+
+        self._fit_report = list()
+        start = time.monotonic()
+        start_epoch = trainer.epoch
+        best_score = np.inf
+        stalled_epochs = 0
+        while trainer.epoch < self._epochs:
+            epoch_report = trainer.train_epoch()
+            if self._validation_data is not None:
+                epoch_report['validation_score'] = self._get_validation_score()
+                score = epoch_report['validation_score']
+            else:
+                score = abs(epoch_report['mean_loss_d'])
+
+            self._fit_report.append(epoch_report)
+            LOGGER.info('Epoch %s, Loss G: %.4f, Loss D: %.4f, %.1f rows/s',
+                        trainer.epoch, epoch_report['loss_g'], epoch_report['loss_d'],
+                        epoch_report['rows_per_second'])
+
+            if score < best_score - self._early_stopping_min_delta:
+                best_score = score
+                stalled_epochs = 0
+            else:
+                stalled_epochs += 1
+
+            stop = False
+            patience = self._early_stopping_patience
+            if patience is not None and stalled_epochs >= patience:
+                stop = trainer.epoch < self._epochs
+                if stop:
+                    LOGGER.info('Stopping training after epoch %s: no improvement in %s epochs',
+                                trainer.epoch, patience)
+
+            if self._max_fit_time is not None:
+                elapsed = time.monotonic() - start
+                epoch_time = elapsed / (trainer.epoch - start_epoch)
+                if not stop and elapsed + epoch_time > self._max_fit_time:
+                    stop = trainer.epoch < self._epochs
+                    if stop:
+                        LOGGER.info('Stopping training after epoch %s to stay within %s seconds',
+                                    trainer.epoch, self._max_fit_time)
+
+            if self._checkpoint_path:
+                if stop or trainer.epoch % self._checkpoint_frequency == 0:
+                    self._save_checkpoint(trainer)
+
+            if stop:
+                break
+
+        self._fitted_epochs = trainer.epoch
+
+    def get_fitted_epochs(self):
+        """Get the total number of epochs that the model has been trained for.
+
+        Returns:
+            int:
+                Number of epochs, including those run before resuming.
+        """
+        return self._fitted_epochs
+
+    def get_fit_report(self):
+        """Get the per epoch report of the last call to ``fit``.
+
+        Returns:
+            pandas.DataFrame:
+                Table with one row per epoch containing the generator and
+                discriminator losses of the last step and their means over the
+                epoch, the validation score if ``validation_split`` was given,
+                the number of seconds spent, the rows
+                processed per second and the seconds spent sampling the training
+                data versus running the forward and backward passes.
+        """
+        return pd.DataFrame(self._fit_report)
+
+    def get_loss_history(self):
+        """Get the per epoch losses and validation scores of the last call to ``fit``.
+
+        Returns:
+            pandas.DataFrame:
+                The loss and validation score columns of ``get_fit_report``.
+        """
+        report = self.get_fit_report()
+        columns = ['epoch', 'loss_g', 'loss_d', 'mean_loss_g', 'mean_loss_d', 'validation_score']
+        return report[[column for column in columns if column in report.columns]]
 
     def _sample(self, size):
         """Sample ``size`` rows from the model.
@@ -136,4 +627,5 @@ class CTGAN(BaseTabularModel):
             pandas.DataFrame:
                 Sampled data.
         """
-        return self._model.sample(size)
+        with random_state(self._random_state), self._set_threads():
+            return self._model.sample(size)
@@ -1,9 +1,16 @@
 """Utility functions for tabular models."""
 
+import contextlib
+import sys
+import threading
+
 import numpy as np
+import pandas as pd
 
 IGNORED_DICT_KEYS = ['fitted', 'distribution', 'type']
 
+_RANDOM_STATE_LOCK = threading.RLock()
+
 
 def flatten_array(nested, prefix=''):
     """Flatten an array as a dict.
@@ -149,6 +156,234 @@ def impute(data):
     return data
 
 
+def _allocate_rows(counts, num_rows):
+    """Split ``num_rows`` proportionally to ``counts`` with the largest remainder method."""
+    quotas = counts * num_rows / counts.sum()
+    allocation = np.floor(quotas).astype(int)
+    missing = num_rows - allocation.sum()
+    if missing:
+        allocation[np.argsort(allocation - quotas)[:missing]] += 1
+
+    return allocation
+
+
+def stratified_sample_index(data, columns, num_rows, random_state=None):
+    """Select the positions of a stratified random sample of the data rows.
+
+    The strata are the combinations of values found in the given columns, and
+    each one of them gets a number of rows proportional to its size, with the
+    remainders assigned to the strata with the largest fractional parts. If
+    ``num_rows`` allows it, the strata too small to get a row get one anyway, so
+    that the rare combinations are not lost, and the rest of the rows are split
+    proportionally among the other strata.
+
+    Args:
+        data (pandas.DataFrame):
+            Data to sample from.
+        columns (list[str]):
+            Columns whose value combinations define the strata. If empty,
+            a simple random sample is taken.
+        num_rows (int):
+            Number of rows to select.
+        random_state (numpy.random.Generator):
+            Generator to use. If ``None``, the global random state is used.
+
+    Returns:
+        numpy.ndarray:
+            Sorted positions of the selected rows.
+    """
+    total = len(data)
+    if num_rows >= total:
+        return np.arange(total)
+
+    if columns:
+        codes = np.column_stack([pd.factorize(data[column])[0] for column in columns])
+        _, strata = np.unique(codes, axis=0, return_inverse=True)
+        strata = strata.ravel()
+    else:
+        strata = np.zeros(total, dtype=int)
+
+    counts = np.bincount(strata)
+    allocation = _allocate_rows(counts, num_rows)
+    if num_rows >= len(counts):
+        single = allocation == 0
+        while single.any():
+            allocation[single] = 1
+            others = ~single
+            allocation[others] = _allocate_rows(counts[others], num_rows - single.sum())
+            empty = others & (allocation == 0)
+            if not empty.any():
+                break
+
+            single |= empty
+
+    keys = (random_state or np.random).random(total)
+    order = np.lexsort((keys, strata))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    ranks = np.arange(total) - starts[strata[order]]
+    selected = order[ranks < allocation[strata[order]]]
+
+    return np.sort(selected)
+
+
+def read_chunks(path, chunk_size):
+    """Iterate over the rows of a CSV or Parquet file in chunks.
+
+    Parquet files are read one row group at a time, which requires ``pyarrow``.
+
+    Args:
+        path (str):
+            Path to the file. Files ending in ``.parquet`` are read as
+            Parquet and everything else as CSV.
+        chunk_size (int):
+            Number of rows of each CSV chunk.
+
+    Yields:
+        pandas.DataFrame:
+            Consecutive chunks of the file.
+    """
+    if path.endswith('.parquet'):
+        try:
+            from pyarrow import parquet  # Lazy import to make dependency optional
+        except ImportError as ie:
+            ie.msg += (
+                '\n\nIt seems like `pyarrow` is not installed.\n'
+                'Please install it using:\n\n    pip install pyarrow'
+            )
+            raise
+
+        parquet_file = parquet.ParquetFile(path)
+        for row_group in range(parquet_file.num_row_groups):
+            yield parquet_file.read_row_group(row_group).to_pandas()
+
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def track_levels(chunks, level_columns, levels, max_levels):
+    """Collect the distinct values of groups of columns while iterating over chunks.
+
+    Only the distinct combinations of values are kept, not the rows. Groups with
+    more than ``max_levels`` distinct combinations stop being tracked, so the
+    memory used is bounded by ``max_levels`` values per group.
+
+    Args:
+        chunks (iterable[pandas.DataFrame]):
+            Chunks of data.
+        level_columns (list[list[str]]):
+            Groups of columns whose combinations of values are tracked.
+        levels (dict):
+            Dict filled with the distinct combinations of each group, as a
+            ``pandas.DataFrame`` keyed by the tuple of column names, or ``None``
+            if the group has more than ``max_levels`` of them.
+        max_levels (int):
+            Maximum number of distinct combinations to track per group.
+
+    Yields:
+        pandas.DataFrame:
+            The given chunks, unmodified.
+    """
+    groups = [tuple(columns) for columns in level_columns]
+    for chunk in chunks:
+        for group in groups:
+            values = chunk[list(group)]
+            if group in levels:
+                if levels[group] is None:
+                    continue
+
+                values = pd.concat([levels[group], values], ignore_index=True)
+
+            values = values.drop_duplicates().reset_index(drop=True)
+            levels[group] = values if len(values) <= max_levels else None
+
+        yield chunk
+
+
+def add_missing_levels(sample, levels, random_state=None):
+    """Add rows to a sample so that it contains every tracked combination of values.
+
+    Each added row is a copy of a random row of the sample where the columns of
+    every group get one of the combinations missing from the sample, so the
+    number of added rows is the largest number of missing combinations of a group.
+
+    Args:
+        sample (pandas.DataFrame):
+            Sampled rows, with a default index.
+        levels (dict):
+            Distinct combinations of each group of columns, as filled by
+            ``track_levels``. Groups with ``None`` are skipped.
+        random_state (numpy.random.Generator):
+            Generator to use. If ``None``, the global random state is used.
+
+    Returns:
+        pandas.DataFrame:
+            Sample with the added rows at the end.
+    """
+    missing = dict()
+    for group, values in levels.items():
+        if values is None:
+            continue
+
+        seen = sample[list(group)].drop_duplicates()
+        duplicated = pd.concat([seen, values], ignore_index=True).duplicated().values
+        missing[group] = values[~duplicated[len(seen):]]
+
+    num_added = max([len(values) for values in missing.values()], default=0)
+    if not num_added:
+        return sample
+
+    positions = (random_state or np.random).random(num_added) * len(sample)
+    added = sample.iloc[positions.astype(int)].reset_index(drop=True)
+    for group, values in missing.items():
+        for column in group:
+            column_values = added[column].astype(object)
+            column_values.iloc[:len(values)] = values[column].values
+            added[column] = column_values.infer_objects()
+
+    return pd.concat([sample, added], ignore_index=True)
+
+
+def reservoir_sample(chunks, num_rows, random_state=None):
+    """Take a uniform random sample of rows from a stream of chunks.
+
+    Each row gets a random key and the rows with the ``num_rows`` smallest
+    keys seen so far are kept, so memory usage is bounded by the sample
+    size plus one chunk.
+
+    Args:
+        chunks (iterable[pandas.DataFrame]):
+            Chunks of data to sample from.
+        num_rows (int):
+            Number of rows to keep.
+        random_state (numpy.random.Generator):
+            Generator to use. If ``None``, the global random state is used.
+
+    Returns:
+        tuple (pandas.DataFrame, int):
+            Sampled rows and total number of rows seen.
+    """
+    random_state = random_state or np.random
+    sample = None
+    keys = None
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+        chunk_keys = random_state.random(len(chunk))
+        if sample is None:
+            sample = chunk.reset_index(drop=True)
+            keys = chunk_keys
+        else:
+            sample = pd.concat([sample, chunk], ignore_index=True)
+            keys = np.concatenate([keys, chunk_keys])
+
+        if len(sample) > num_rows:
+            keep = np.sort(np.argpartition(keys, num_rows)[:num_rows])
+            sample = sample.iloc[keep].reset_index(drop=True)
+            keys = keys[keep]
+
+    return sample, total
+
+
 def square_matrix(triangular_matrix):
     """Fill with zeros a triangular matrix to reshape it to a square one.
 
@@ -220,3 +455,89 @@ def make_positive_definite(matrix):
         iterations += 1
 
     return A3
+
+
+def get_random_generator(random_state):
+    """Build a ``numpy.random.Generator`` from the given random state.
+
+    Args:
+        random_state (int, numpy.random.Generator or None):
+            Seed or ``Generator`` to use. If ``None`` is given, ``None``
+            is returned so the global random state keeps being used.
+
+    Returns:
+        numpy.random.Generator or None
+    """
+    if random_state is None or isinstance(random_state, np.random.Generator):
+        return random_state
+
+    return np.random.default_rng(random_state)
+
+
+def sample_gaussian_multivariate(model, num_rows, random_state):
+    """Sample rows from a fitted ``copulas`` ``GaussianMultivariate`` using a ``Generator``.
+
+    This reproduces ``GaussianMultivariate.sample``, which draws from the global
+    ``numpy`` random state, so that seeded models can sample without touching it.
+
+    Args:
+        model (copulas.multivariate.GaussianMultivariate):
+            Fitted model to sample from.
+        num_rows (int):
+            Amount of rows to sample.
+        random_state (numpy.random.Generator):
+            Generator to draw the samples from.
+
+    Returns:
+        pandas.DataFrame:
+            Sampled data, with the columns in the order they were fitted.
+    """
+    from scipy import stats  # Lazy import to speed up importing sdv
+
+    covariance = np.nan_to_num(np.asarray(model.covariance, dtype=float))
+    means = np.zeros(covariance.shape[0])
+    samples = stats.norm.cdf(random_state.multivariate_normal(means, covariance, size=num_rows))
+    sampled = pd.DataFrame(index=range(num_rows))
+    for position, (column, univariate) in enumerate(zip(model.columns, model.univariates)):
+        sampled[column] = univariate.percent_point(samples[:, position])
+
+    return sampled
+
+
+@contextlib.contextmanager
+def random_state(generator):
+    """Run the enclosed code with the global random state seeded from ``generator``.
+
+    ``ctgan`` and some ``rdt`` transformers, like ``categorical_fuzzy``, draw from
+    the global ``numpy`` and ``torch`` random states, which cannot be replaced by a
+    ``Generator``, so they are seeded with a value drawn from ``generator`` and
+    restored afterwards. A lock is held while inside the context so that concurrent
+    threads do not interleave their draws, which means that only one seeded block
+    runs at a time: code that can draw from a ``Generator`` directly, like
+    ``sample_gaussian_multivariate``, should do so instead. If ``generator`` is
+    ``None`` the global random state is left untouched.
+
+    Args:
+        generator (numpy.random.Generator or None):
+            Generator used to seed the global random states.
+    """
+    if generator is None:
+        yield
+        return
+
+    with _RANDOM_STATE_LOCK:
+        seed = int(generator.integers(2**32))
+        numpy_state = np.random.get_state()
+        np.random.seed(seed)
+
+        torch = sys.modules.get('torch')
+        if torch is not None:
+            torch_state = torch.random.get_rng_state()
+            torch.manual_seed(seed)
+
+        try:
+            yield
+        finally:
+            np.random.set_state(numpy_state)
+            if torch is not None:
+                torch.random.set_rng_state(torch_state)
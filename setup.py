@@ -13,7 +13,7 @@ with open('HISTORY.md', encoding='utf-8') as history_file:
 
 install_requires = [
     'exrex>=0.9.4,<0.11',
-    'numpy>=1.15.4,<2',
+    'numpy>=1.17.0,<2',
     'pandas>=0.23.4,<0.25',
     'copulas>=0.3.1,<0.4',
     'rdt>=0.2.3,<0.3',
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from sdv.constraints.plan import ConstraintPlan
+from sdv.constraints.tabular import GreaterThan, UniqueCombinations
+
+
+def test_filter_valid():
+    """Rows are kept only if they fulfill every constraint and rejections are counted."""
+    data = pd.DataFrame({
+        'low': [1, 2, 3, 4],
+        'high': [2, 1, 4, 3],
+        'a': ['x', 'x', 'y', 'z'],
+        'b': ['x', 'x', 'y', 'z'],
+    })
+    unique = UniqueCombinations(['a', 'b'], handling_strategy='reject_sampling')
+    unique.fit(data.iloc[:3])
+    greater = GreaterThan('low', 'high', handling_strategy='reject_sampling')
+    greater.fit(data)
+    transformed = GreaterThan('low', 'high', handling_strategy='transform')
+    plan = ConstraintPlan([unique, greater, transformed])
+
+    filtered = plan.filter_valid(data)
+
+    pd.testing.assert_frame_equal(filtered, data.iloc[[0, 2]])
+    assert plan.get_rejections() == {
+        'evaluated': 4,
+        'valid': 2,
+        'rejected': {'UniqueCombinations_0': 1, 'GreaterThan_1': 2},
+    }
+    assert plan.get_acceptance_rate() == 0.5
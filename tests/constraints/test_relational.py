@@ -0,0 +1,43 @@
+import pandas as pd
+
+from sdv.constraints.relational import ChildGreaterThan, ChildSumLessThan
+
+
+class TestChildGreaterThan:
+
+    def test_is_valid(self):
+        """Each child row is compared with the parent row."""
+        instance = ChildGreaterThan('accounts', 'transactions', 'created', 'date')
+        parent_row = pd.Series({'created': 2})
+        child_rows = pd.DataFrame({'date': [1, 2, 3]})
+
+        valid = instance.is_valid(parent_row, child_rows)
+
+        pd.testing.assert_series_equal(valid, pd.Series([False, True, True], name='date'))
+
+    def test_is_valid_strict(self):
+        """With ``strict``, equal values are not valid."""
+        instance = ChildGreaterThan('accounts', 'transactions', 'created', 'date', strict=True)
+        parent_row = pd.Series({'created': 2})
+        child_rows = pd.DataFrame({'date': [1, 2, 3]})
+
+        valid = instance.is_valid(parent_row, child_rows)
+
+        pd.testing.assert_series_equal(valid, pd.Series([False, False, True], name='date'))
+
+
+class TestChildSumLessThan:
+
+    def test_is_valid(self):
+        """Only the child rows that make the sum exceed the limit are invalid."""
+        instance = ChildSumLessThan('accounts', 'transactions', 'limit', 'amount')
+        child_rows = pd.DataFrame({'amount': [1, 2, 3, 1]})
+
+        valid = instance.is_valid(pd.Series({'limit': 7}), child_rows)
+        strict = ChildSumLessThan('accounts', 'transactions', 'limit', 'amount', strict=True)
+
+        assert valid.tolist() == [True, True, True, True]
+        assert instance.is_valid(pd.Series({'limit': 5}), child_rows).tolist() == [
+            True, True, False, True]
+        assert strict.is_valid(pd.Series({'limit': 7}), child_rows).tolist() == [
+            True, True, True, False]
@@ -0,0 +1,425 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sdv.constraints.tabular import (
+    Between, Chain, ColumnFormula, CustomConstraint, GreaterThan, UniqueCombinations)
+
+
+def _combinations_data():
+    return pd.DataFrame({
+        'country': ['US', 'US', 'ES', 'ES', 'FR'],
+        'city': ['Boston', 'Paris', 'Madrid', 'Paris', 'Paris'],
+        'value': [1, 2, 3, 4, 5],
+    })
+
+
+class TestUniqueCombinations:
+
+    def test_is_valid(self):
+        """Only the combinations seen during fit are valid, including unseen values."""
+        constraint = UniqueCombinations(columns=['country', 'city'])
+        constraint.fit(_combinations_data())
+        data = pd.DataFrame({
+            'country': ['US', 'ES', 'FR', 'FR', 'IT'],
+            'city': ['Paris', 'Boston', 'Paris', 'Rome', 'Paris'],
+            'value': [1, 2, 3, 4, 5],
+        }, index=[10, 11, 12, 13, 14])
+
+        valid = constraint.is_valid(data)
+
+        expected = pd.Series([True, False, True, False, False], index=[10, 11, 12, 13, 14])
+        pd.testing.assert_series_equal(valid, expected)
+
+    def test_is_valid_many_rows(self):
+        """The lookup gives the same result as comparing the row tuples."""
+        random_state = np.random.RandomState(0)
+        data = pd.DataFrame({
+            'a': random_state.choice(list('abcde'), 1000),
+            'b': random_state.choice(list('fghij'), 1000),
+            'c': random_state.choice(list('klmno'), 1000),
+        })
+        constraint = UniqueCombinations(columns=['a', 'b', 'c'])
+        constraint.fit(data.iloc[:100])
+
+        valid = constraint.is_valid(data)
+
+        seen = set(data.iloc[:100].itertuples(index=False))
+        expected = [row in seen for row in data.itertuples(index=False)]
+        assert valid.tolist() == expected
+
+    def test_transform_reverse_transform(self):
+        """The columns are replaced by a combination code and gathered back."""
+        data = _combinations_data()
+        constraint = UniqueCombinations(columns=['country', 'city'])
+
+        transformed = constraint.fit_transform(data)
+        reverted = constraint.reverse_transform(transformed)
+
+        assert list(transformed.columns) == ['value', 'country#city']
+        assert transformed['country#city'].tolist() == [0, 1, 2, 3, 4]
+        pd.testing.assert_frame_equal(reverted[data.columns], data, check_dtype=False)
+
+    def test_reverse_transform_unknown_code(self):
+        """Codes that are not in the lookup table are reverted as ``NaN``."""
+        constraint = UniqueCombinations(columns=['country', 'city'])
+        constraint.fit(_combinations_data())
+        transformed = pd.DataFrame({'value': [1, 2], 'country#city': [4, np.nan]})
+
+        reverted = constraint.reverse_transform(transformed)
+
+        assert reverted['country'].tolist()[0] == 'FR'
+        assert reverted[['country', 'city']].iloc[1].isnull().all()
+
+    def test_make_valid(self):
+        """Unseen combinations are replaced by seen ones with the same first value if any."""
+        constraint = UniqueCombinations(
+            columns=['country', 'city'], handling_strategy='conditional_sampling')
+        constraint.fit(_combinations_data())
+        sampled = pd.DataFrame({
+            'country': ['US', 'FR', 'IT', 'ES'],
+            'city': ['Boston', 'Rome', 'Rome', 'Madrid'],
+            'value': [1, 2, 3, 4],
+        })
+
+        reverted = constraint.reverse_transform(sampled)
+
+        assert constraint.is_valid(reverted).all()
+        assert reverted['country'].tolist()[:2] == ['US', 'FR']
+        assert reverted['city'].tolist()[:2] == ['Boston', 'Paris']
+        assert reverted['country'][3] == 'ES'
+        assert reverted['value'].tolist() == [1, 2, 3, 4]
+
+
+def _add(a, b):
+    return a + b
+
+
+class TestColumnFormula:
+
+    def test_reverse_transform_columns(self):
+        """With ``columns`` the formula only gets the columns it reads."""
+        data = pd.DataFrame({'a': [1, 2], 'b': [3, 4], 'c': ['x', 'y']})
+
+        def formula(columns):
+            assert list(columns.columns) == ['a', 'b']
+            return columns['a'] + columns['b']
+
+        constraint = ColumnFormula('total', formula, columns=['a', 'b'])
+
+        reverted = constraint.reverse_transform(data)
+
+        assert reverted['total'].tolist() == [4, 6]
+        assert 'total' not in data
+
+    def test_is_valid_vectorized_parallel(self):
+        """Vectorized formulas get column arrays and can run in chunks across processes."""
+        data = pd.DataFrame({'a': np.arange(1000), 'b': np.arange(1000)})
+        data['total'] = data['a'] + data['b']
+        data.loc[10, 'total'] = -1
+        constraint = ColumnFormula(
+            'total', _add, handling_strategy='reject_sampling', columns=['a', 'b'],
+            vectorized=True, n_jobs=3)
+        constraint.MIN_PARALLEL_ROWS = 100
+
+        valid = constraint.is_valid(data)
+
+        assert valid.sum() == 999
+        assert not valid[10]
+
+    def test___init___n_jobs_not_picklable(self):
+        """Formulas that cannot be sent to other processes are rejected with ``n_jobs``."""
+        with pytest.raises(ValueError, match='picklable'):
+            ColumnFormula('total', lambda data: data.sum(axis=1), columns=['a'], n_jobs=2)
+
+
+def _double(columns):
+    return columns * 2
+
+
+def _is_positive(columns):
+    return (columns > 0).all(axis=1)
+
+
+class TestCustomConstraint:
+
+    def test_columns(self):
+        """With ``columns`` the functions get only those columns, which they replace."""
+        data = pd.DataFrame({'a': [1, 2], 'b': [3, 4]})
+        constraint = CustomConstraint(
+            transform=lambda columns: columns * 2,
+            reverse_transform=lambda columns: columns // 2,
+            is_valid=lambda columns: columns['a'] > 1,
+            columns=['a'],
+        )
+
+        transformed = constraint.transform(data)
+        reverted = constraint.reverse_transform(transformed)
+
+        assert transformed['a'].tolist() == [2, 4]
+        assert data['a'].tolist() == [1, 2]
+        pd.testing.assert_frame_equal(reverted, data)
+        assert constraint.is_valid(data).tolist() == [False, True]
+
+    def test_columns_inplace(self):
+        """With ``inplace`` the returned columns overwrite the given table in their position."""
+        data = pd.DataFrame({'low': [1.0, 2.0], 'high': [3.0, 4.0], 'other': ['x', 'y']})
+        constraint = CustomConstraint(transform=_double, columns=['low'])
+
+        transformed = constraint.transform(data, inplace=True)
+
+        assert transformed is data
+        assert list(transformed.columns) == ['low', 'high', 'other']
+        assert transformed['low'].tolist() == [2.0, 4.0]
+
+    def test_columns_pickle(self):
+        """Constraints restricted to some columns can be pickled."""
+        data = pd.DataFrame({'low': [1.0, 2.0], 'high': [3.0, 4.0]})
+        constraint = CustomConstraint(
+            transform=_double, reverse_transform='numpy.sqrt', is_valid=_is_positive,
+            columns=['low'])
+
+        loaded = pickle.loads(pickle.dumps(constraint))
+
+        pd.testing.assert_frame_equal(loaded.transform(data), constraint.transform(data))
+        pd.testing.assert_frame_equal(
+            loaded.reverse_transform(data), constraint.reverse_transform(data))
+        assert loaded.is_valid(data).tolist() == [True, True]
+
+
+class TestGreaterThan:
+
+    def test_make_valid(self):
+        """With conditional sampling, invalid rows get a valid ``high`` value."""
+        data = pd.DataFrame({'low': np.arange(100), 'high': np.arange(100) + 5})
+        constraint = GreaterThan('low', 'high', strict=True,
+                                 handling_strategy='conditional_sampling')
+        constraint.fit(data)
+        sampled = pd.DataFrame({'low': [1, 2, 3], 'high': [10, 0, -5]})
+
+        reverted = constraint.reverse_transform(sampled)
+
+        assert reverted['high'].tolist() == [10, 7, 8]
+        assert reverted['high'].dtype == data['high'].dtype
+        assert constraint.filter_valid(sampled) is sampled
+
+    def test_make_valid_random_state(self):
+        """The values drawn by ``make_valid`` come from the given generator."""
+        data = pd.DataFrame({'low': np.arange(100), 'high': np.arange(100) * 2 + 5})
+        constraint = GreaterThan('low', 'high', handling_strategy='conditional_sampling')
+        constraint.fit(data)
+        sampled = pd.DataFrame({'low': np.arange(20), 'high': np.zeros(20, dtype=int)})
+        global_state = np.random.get_state()
+
+        constraint.set_random_state(np.random.default_rng(0))
+        first = constraint.reverse_transform(sampled)
+        constraint.set_random_state(np.random.default_rng(0))
+        second = constraint.reverse_transform(sampled)
+
+        pd.testing.assert_frame_equal(first, second)
+        np.testing.assert_array_equal(np.random.get_state()[1], global_state[1])
+
+    def test_transform_reverse_transform_datetime(self):
+        """Datetime columns are transformed through their nanosecond differences."""
+        data = pd.DataFrame({
+            'low': pd.to_datetime(['2020-01-01', '2020-01-05', None]),
+            'high': pd.to_datetime(
+                ['2020-01-02 10:30:00', '2020-01-05 00:00:00', '2020-01-03 00:00:00']),
+        })
+        constraint = GreaterThan('low', 'high')
+
+        transformed = constraint.fit_transform(data)
+        reverted = constraint.reverse_transform(transformed)
+
+        assert transformed['high'].dtype == float
+        assert reverted['high'].dtype == data['high'].dtype
+        pd.testing.assert_series_equal(reverted['high'][:2], data['high'][:2])
+        assert reverted['high'].isnull()[2]
+
+    def test_transform_reverse_transform_datetime_exact(self):
+        """Long datetime differences are kept as integers and reverted exactly."""
+        data = pd.DataFrame({
+            'low': pd.to_datetime(['2010-01-01', '2020-01-01']) + pd.to_timedelta([1, 0], 'ns'),
+            'high': pd.to_datetime(['2020-01-05', '2020-01-05']),
+        })
+        constraint = GreaterThan('low', 'high')
+
+        transformed = constraint.fit_transform(data)
+        reverted = constraint.reverse_transform(transformed)
+
+        assert transformed['high'].dtype == np.int64
+        pd.testing.assert_frame_equal(reverted, data)
+
+    def test_transform_reverse_transform_datetime_tz(self):
+        """Timezone aware datetime columns keep their timezone."""
+        data = pd.DataFrame({
+            'low': pd.to_datetime(['2020-01-01', '2020-06-01']).tz_localize('Europe/Madrid'),
+            'high': pd.to_datetime(['2020-01-05', '2020-07-01']).tz_localize('Europe/Madrid'),
+        })
+        constraint = GreaterThan('low', 'high', handling_strategy='conditional_sampling')
+        constraint.fit(data)
+
+        reverted = GreaterThan('low', 'high')
+        reverted.fit(data)
+        reverted = reverted.reverse_transform(reverted.transform(data))
+        swapped = data['low'].iloc[::-1].reset_index(drop=True)
+        made_valid = constraint.reverse_transform(data.assign(high=swapped))
+
+        pd.testing.assert_frame_equal(reverted, data)
+        assert made_valid['high'].dtype == data['high'].dtype
+        assert constraint.is_valid(made_valid).all()
+
+    def test_make_valid_timedelta(self):
+        """Timedelta columns get valid values with conditional sampling."""
+        data = pd.DataFrame({
+            'low': pd.to_timedelta([1, 2, 3], unit='h'),
+            'high': pd.to_timedelta([2, 3, 4], unit='h'),
+        })
+        constraint = GreaterThan('low', 'high', handling_strategy='conditional_sampling')
+        constraint.fit(data)
+        sampled = data.assign(high=pd.to_timedelta([0, 3, 0], unit='h'))
+
+        reverted = constraint.reverse_transform(sampled)
+
+        assert reverted['high'].tolist() == data['high'].tolist()
+
+
+def test_transform_inplace():
+    """With ``inplace=True`` the given table is modified, otherwise it is left untouched."""
+    data = pd.DataFrame({'low': [1, 2], 'high': [3, 5], 'total': [4, 7]})
+    constraints = [
+        GreaterThan('low', 'high'),
+        ColumnFormula('total', _add, columns=['low', 'high'], vectorized=True),
+    ]
+    for constraint in constraints:
+        constraint.fit(data)
+
+    original = data.copy()
+    transformed = data
+    for constraint in constraints:
+        transformed = constraint.transform(transformed)
+
+    pd.testing.assert_frame_equal(data, original)
+
+    owned = data.copy()
+    for constraint in constraints:
+        result = constraint.transform(owned, inplace=True)
+        assert result is owned
+
+    pd.testing.assert_frame_equal(owned, transformed)
+
+
+def test_transform_inplace_column_order():
+    """Transforming in place keeps the order of the columns."""
+    data = pd.DataFrame({'low': [1, 2], 'high': [3, 5], 'x': [0, 1]})
+    constraint = GreaterThan('low', 'high')
+    constraint.fit(data)
+
+    transformed = constraint.transform(data.copy(), inplace=True)
+    reverted = constraint.reverse_transform(transformed, inplace=True)
+
+    assert list(transformed.columns) == ['low', 'high', 'x']
+    pd.testing.assert_frame_equal(reverted, data)
+
+
+class TestChain:
+
+    def test_transform_reverse_transform(self):
+        """Any transformed values are reverted into ascending rows."""
+        data = pd.DataFrame({'start': [1, 5], 'pay': [3, 5], 'end': [10, 6], 'other': [0, 1]})
+        constraint = Chain(['start', 'pay', 'end'])
+
+        transformed = constraint.fit_transform(data)
+        reverted = constraint.reverse_transform(transformed)
+        random = transformed.copy()
+        random[['pay', 'end']] = np.random.normal(size=(2, 2)) * 5
+
+        pd.testing.assert_frame_equal(reverted, data)
+        assert constraint.is_valid(constraint.reverse_transform(random)).all()
+
+    def test_reverse_transform_mixed_dtypes(self):
+        """Only the integer columns are rounded, and they keep the order."""
+        data = pd.DataFrame({'a': [0, 1, 2], 'b': [1.3, 2.7, 3.2], 'c': [4.5, 4.5, 9.1]})
+        constraint = Chain(['a', 'b', 'c'])
+
+        transformed = constraint.fit_transform(data)
+        reverted = constraint.reverse_transform(transformed)
+
+        np.testing.assert_allclose(reverted['b'], data['b'])
+        np.testing.assert_allclose(reverted['c'], data['c'])
+
+        integer = Chain(['b', 'a'], strict=True)
+        integer.fit(data.assign(a=[2, 3, 4]))
+        reverted = integer.reverse_transform(pd.DataFrame({'b': [1.3, 2.7], 'a': [-50.0, 0.5]}))
+
+        assert reverted['a'].tolist() == [2, 4]
+
+    def test_transform_reverse_transform_datetime(self):
+        """Datetime chains are reverted exactly and stay in ascending order."""
+        data = pd.DataFrame({
+            'start': pd.to_datetime(['2010-01-01', '2020-01-01']),
+            'pay': pd.to_datetime(['2015-06-01', '2020-01-03']) + pd.to_timedelta(1, 'ns'),
+            'end': pd.to_datetime(['2020-01-05', None]),
+        })
+        constraint = Chain(['start', 'pay', 'end'])
+
+        transformed = constraint.fit_transform(data)
+        reverted = constraint.reverse_transform(transformed)
+        random = transformed.assign(pay=[-1e15, 1e15], end=[1e15, 1e15])
+
+        pd.testing.assert_frame_equal(reverted, data)
+        assert constraint.is_valid(constraint.reverse_transform(random)).all()
+
+    def test_is_valid_strict(self):
+        """With ``strict`` equal values are not valid."""
+        data = pd.DataFrame({'a': [1, 1, 2], 'b': [2, 1, 1], 'c': [3, 3, 3]})
+        constraint = Chain(['a', 'b', 'c'], strict=True)
+
+        assert constraint.is_valid(data).tolist() == [True, False, False]
+
+
+class TestBetween:
+
+    def test_transform_reverse_transform(self):
+        """Values are reverted within the bounds, which can be columns or constants."""
+        data = pd.DataFrame({'low': [0.0, 1.0, 2.0], 'x': [0.5, 1.0, 9.0]})
+        constraint = Between('x', low='low', high=10.0)
+
+        transformed = constraint.fit_transform(data)
+        reverted = constraint.reverse_transform(transformed)
+        extreme = transformed.assign(x=[-100.0, 0.0, 100.0])
+
+        np.testing.assert_allclose(reverted['x'], data['x'], atol=1e-6)
+        assert constraint.is_valid(constraint.reverse_transform(extreme)).all()
+
+    def test_transform_reverse_transform_datetime(self):
+        """Datetime values are reverted within datetime bounds."""
+        data = pd.DataFrame({
+            'low': pd.to_datetime(['2020-01-01', '2020-02-01', None]),
+            'x': pd.to_datetime(['2020-01-02', '2020-03-01', '2020-03-01']),
+        })
+        constraint = Between('x', low='low', high=pd.Timestamp('2021-01-01'))
+
+        transformed = constraint.fit_transform(data)
+        reverted = constraint.reverse_transform(transformed)
+        extreme = constraint.reverse_transform(transformed.assign(x=[-100.0, 100.0, 0.0]))
+
+        assert transformed['x'].dtype == float
+        assert reverted['x'].dtype == data['x'].dtype
+        assert (reverted['x'][:2] - data['x'][:2]).abs().max() < pd.Timedelta(1, 'ms')
+        assert reverted['x'].isnull()[2]
+        assert constraint.is_valid(extreme).tolist() == [True, True, False]
+
+
+def test_conditional_sampling_not_supported():
+    """Constraints without ``make_valid`` reject conditional sampling when created."""
+    with pytest.raises(ValueError, match='Chain does not support conditional sampling'):
+        Chain(['a', 'b'], handling_strategy='conditional_sampling')
+
+    with pytest.raises(ValueError):
+        Between('a', 0, 1, handling_strategy='conditional_sampling')
+
+    with pytest.raises(ValueError):
+        ColumnFormula('a', _add, handling_strategy='conditional_sampling')
@@ -1,3 +1,7 @@
+import numpy as np
+import pandas as pd
+import pytest
+
 from sdv.demo import load_demo
 from sdv.tabular.copulas import GaussianCopula
 
@@ -55,3 +59,46 @@ def test_gaussian_copula():
 
     assert 'model_kwargs' in metadata
     assert 'GaussianCopula' in metadata['model_kwargs']
+
+
+@pytest.mark.parametrize('categorical_transformer', [
+    'one_hot_encoding', 'label_encoding', 'categorical', 'categorical_fuzzy'])
+def test_gaussian_copula_fit_path_rare_category(tmpdir, categorical_transformer):
+    data = pd.DataFrame({
+        'id': range(1000),
+        'category': ['a', 'b'] * 500,
+        'value': np.random.normal(size=1000),
+    })
+    data.loc[777, 'category'] = 'rare'
+    path = str(tmpdir.join('data.csv'))
+    data.to_csv(path, index=False)
+
+    gc = GaussianCopula(primary_key='id', categorical_transformer=categorical_transformer)
+    gc.fit(path, max_fit_rows=20, chunk_size=100)
+
+    transformed = gc.get_metadata().transform(data)
+    assert not transformed.isnull().any().any()
+    assert gc.get_num_fit_rows() == 21
+
+    sampled = gc.sample(50)
+    assert sampled.shape == (50, 3)
+    assert set(sampled.category) <= {'a', 'b', 'rare'}
+
+
+def test_gaussian_copula_categorical_fuzzy_random_state():
+    data = pd.DataFrame({
+        'category': ['a', 'b', 'c'] * 100,
+        'value': np.random.normal(size=300),
+    })
+
+    def fit_sample(global_seed):
+        np.random.seed(global_seed)
+        gc = GaussianCopula(categorical_transformer='categorical_fuzzy', random_state=0)
+        gc.fit(data)
+        return gc.get_parameters(), gc.sample(50)
+
+    parameters, sampled = fit_sample(1)
+    other_parameters, other_sampled = fit_sample(2)
+
+    assert parameters == other_parameters
+    pd.testing.assert_frame_equal(sampled, other_sampled)
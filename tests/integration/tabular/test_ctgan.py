@@ -27,5 +27,41 @@ def test_ctgan():
             'age': {'type': 'numerical', 'subtype': 'integer'}
         },
         'constraints': [],
-        'model_kwargs': {}
+        'model_kwargs': {},
+        'anonymization_key': None,
+        'n_jobs': None,
     }
+
+
+def test_ctgan_checkpoint_resume(tmpdir):
+    users = load_demo(metadata=False)['users']
+    checkpoint_path = str(tmpdir.join('checkpoint.pt'))
+
+    ctgan = CTGAN(primary_key='user_id', epochs=2, checkpoint_path=checkpoint_path)
+    ctgan.fit(users)
+
+    resumed = CTGAN(primary_key='user_id', epochs=3, checkpoint_path=checkpoint_path)
+    resumed.fit(users, resume=True)
+
+    assert ctgan.get_fitted_epochs() == 2
+    assert ctgan._model.trained_epoches == 2
+    assert resumed.get_fitted_epochs() == 3
+    assert resumed._model.trained_epoches == 3
+    assert resumed.get_fit_report()['epoch'].tolist() == [3]
+    assert resumed.sample(10).shape == (10, users.shape[1])
+
+
+def test_ctgan_fit_report():
+    users = load_demo(metadata=False)['users']
+
+    ctgan = CTGAN(primary_key='user_id', epochs=2, validation_split=0.2)
+    ctgan.fit(users)
+
+    report = ctgan.get_fit_report()
+    history = ctgan.get_loss_history()
+
+    assert report['epoch'].tolist() == [1, 2]
+    assert report['validation_score'].notnull().all()
+    assert list(history.columns) == [
+        'epoch', 'loss_g', 'loss_d', 'mean_loss_g', 'mean_loss_d', 'validation_score']
+    assert len(history) == 2
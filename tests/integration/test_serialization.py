@@ -0,0 +1,48 @@
+import pandas as pd
+
+from sdv import SDV, load_demo, serialization
+from sdv.metadata import Table
+from sdv.tabular.copulas import GaussianCopula
+
+
+def test_gaussian_copula_compact(tmpdir):
+    users = load_demo(metadata=False)['users']
+    path = str(tmpdir.join('model'))
+
+    model = GaussianCopula(primary_key='user_id', random_state=0)
+    model.fit(users)
+    model.save(path, compact=True)
+    loaded = GaussianCopula.load(path)
+
+    assert loaded.get_parameters() == model.get_parameters()
+    pd.testing.assert_frame_equal(loaded.sample(20), model.sample(20))
+
+
+def test_table_compact(tmpdir):
+    users = load_demo(metadata=False)['users']
+    path = str(tmpdir.join('table'))
+
+    table = Table(primary_key='user_id', anonymize_fields={'country': 'country_code'},
+                  random_state=0)
+    table.fit(users)
+    serialization.dump(table, path)
+    loaded = serialization.load(path)
+
+    transformed = table.transform(users)
+    pd.testing.assert_frame_equal(loaded.transform(users), transformed)
+    pd.testing.assert_frame_equal(
+        loaded.reverse_transform(transformed), table.reverse_transform(transformed))
+
+
+def test_sdv_compact(tmpdir):
+    metadata, tables = load_demo(metadata=True)
+    path = str(tmpdir.join('sdv'))
+
+    sdv = SDV(random_state=0)
+    sdv.fit(metadata, tables)
+    sdv.save(path, compact=True)
+    loaded = SDV.load(path)
+
+    sampled = loaded.sample_all()
+    for name, table in sdv.sample_all().items():
+        pd.testing.assert_frame_equal(sampled[name], table)
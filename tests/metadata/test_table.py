@@ -0,0 +1,195 @@
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+from faker import Faker
+
+from sdv.metadata.table import Table
+
+
+def _anonymization_table(**kwargs):
+    table = Table(**kwargs)
+    table._fields_metadata = {
+        'email': {'type': 'categorical', 'pii': True, 'pii_category': 'email'},
+        'flag': {'type': 'categorical', 'pii': True, 'pii_category': 'boolean'},
+        'value': {'type': 'numerical', 'subtype': 'integer'},
+    }
+    return table
+
+
+def test__make_fake_values_unique():
+    """Fake values are unique as long as the category has enough distinct values."""
+    table = Table()
+
+    values = table._make_fake_values(Faker(), 'email', 'email', 1000)
+
+    assert len(values) == 1000
+    assert len(set(values)) == 1000
+
+
+def test__make_fake_values_small_category():
+    """If the category runs out of distinct values, some are repeated."""
+    table = Table()
+
+    values = table._make_fake_values(Faker(), 'flag', 'boolean', 5)
+
+    assert len(values) == 5
+    assert set(values) == {True, False}
+
+
+def _anonymization_data(num_rows):
+    return pd.DataFrame({
+        'email': ['email_{}'.format(i) for i in range(num_rows)],
+        'flag': [i % 3 for i in range(num_rows)],
+        'value': range(num_rows),
+    })
+
+
+def test__anonymize_random_state():
+    """The same ``random_state`` produces the same fake values."""
+    data = _anonymization_data(100)
+
+    table = _anonymization_table(random_state=0)
+    table._make_anonymization_mappings(data)
+    other = _anonymization_table(random_state=0)
+    other._make_anonymization_mappings(data)
+
+    anonymized = table._anonymize(data)
+
+    assert set(table._anonymization_mappings) == {'email', 'flag'}
+    pd.testing.assert_frame_equal(anonymized, other._anonymize(data))
+    assert anonymized['email'].nunique() == 100
+    assert not anonymized['email'].isin(data['email']).any()
+    pd.testing.assert_series_equal(anonymized['value'], data['value'])
+
+
+def test__anonymize_unseen_values():
+    """Values not seen during fit are anonymized as ``NaN``."""
+    table = _anonymization_table()
+    table._make_anonymization_mappings(_anonymization_data(10))
+
+    anonymized = table._anonymize(_anonymization_data(20))
+
+    assert anonymized['email'][:10].notnull().all()
+    assert anonymized['email'][10:].isnull().all()
+
+
+def test__anonymize_anonymization_key():
+    """With a key, overlapping data gets the same pseudonyms and no mapping is stored."""
+    table = _anonymization_table(anonymization_key='secret')
+    table._make_anonymization_mappings(_anonymization_data(20))
+
+    anonymized = table._anonymize(_anonymization_data(20))
+    overlapping = table._anonymize(_anonymization_data(30).iloc[10:])
+    other_key = _anonymization_table(anonymization_key='other')._anonymize(
+        _anonymization_data(20))
+
+    assert table._anonymization_mappings == {}
+    assert (anonymized['email'][10:] == overlapping['email'][:10]).all()
+    assert (anonymized['email'] != other_key['email']).any()
+
+
+def test__anonymize_legacy_mappings():
+    """Mappings stored as dicts by older versions are still applied."""
+    table = _anonymization_table()
+    table._anonymization_mappings = {
+        'email': {'email_0': 'a@example.com', 'email_1': 'b@example.com'},
+    }
+
+    anonymized = table._anonymize(_anonymization_data(3))
+
+    assert list(anonymized['email'][:2]) == ['a@example.com', 'b@example.com']
+    assert pd.isnull(anonymized['email'][2])
+
+
+def test_to_dict_anonymization_key():
+    """The ``anonymization_key`` is stored in the metadata dict and loaded back."""
+    table = _anonymization_table(anonymization_key='secret')
+
+    metadata_dict = table.to_dict()
+    loaded = Table.from_dict(metadata_dict)
+
+    assert metadata_dict['anonymization_key'] == 'secret'
+    pd.testing.assert_frame_equal(
+        loaded._anonymize(_anonymization_data(10)),
+        table._anonymize(_anonymization_data(10))
+    )
+
+
+def _id_table():
+    table = Table(field_names=['id', 'code', 'value'])
+    table._fields_metadata = {
+        'id': {'type': 'id', 'subtype': 'integer'},
+        'code': {'type': 'id', 'subtype': 'string', 'regex': '^[a-c]{2}$'},
+        'value': {'type': 'numerical', 'subtype': 'float'},
+    }
+    table._hyper_transformer = Mock()
+    table._hyper_transformer.reverse_transform.side_effect = lambda data: data.copy()
+    return table
+
+
+def test_reverse_transform_ids():
+    """The ids start at 0 on every call and string ids are generated from their regex."""
+    table = _id_table()
+
+    first = table.reverse_transform(pd.DataFrame({'value': [0.5, 1.5, 2.5]}))
+    second = table.reverse_transform(pd.DataFrame({'value': [3.5, 4.5]}))
+
+    assert first['id'].tolist() == [0, 1, 2]
+    assert second['id'].tolist() == [0, 1]
+    assert first['code'].tolist() == ['aa', 'ab', 'ac']
+    assert second['code'].tolist() == ['aa', 'ab']
+    assert list(first.columns) == ['id', 'code', 'value']
+
+
+def test_set_ids():
+    """The ids are replaced by new ones starting after the given offset."""
+    table = _id_table()
+    data = pd.DataFrame({'id': [0, 1], 'code': ['aa', 'ab'], 'value': [0.5, 1.5]}, index=[5, 6])
+
+    result = table.set_ids(data, offset=3)
+
+    assert result['id'].tolist() == [3, 4]
+    assert result['code'].tolist() == ['ba', 'bb']
+    assert result['value'].tolist() == [0.5, 1.5]
+
+
+def test_set_ids_exhausted():
+    """A regex that cannot generate enough ids raises an error."""
+    table = _id_table()
+    data = pd.DataFrame({'id': [0, 1], 'code': ['aa', 'ab'], 'value': [0.5, 1.5]})
+
+    with pytest.raises(ValueError, match='code'):
+        table.set_ids(data, offset=8)
+
+
+def test_get_level_columns():
+    """The categorical and boolean fields and the ``UniqueCombinations`` are returned."""
+    # Setup
+    data = pd.DataFrame({
+        'id': ['a', 'b'],
+        'category': ['x', 'y'],
+        'flag': [True, False],
+        'date': ['2020-01-01', '2020-01-02'],
+        'value': [1.0, 2.0],
+        'city': ['Paris', 'Rome'],
+        'country': ['France', 'Italy'],
+        'email': ['a@example.com', 'b@example.com'],
+        'ignored': ['z', 'z'],
+    })
+    table = Table(
+        field_names=['id', 'category', 'flag', 'date', 'value', 'city', 'country', 'email'],
+        field_types={'date': {'type': 'datetime', 'format': '%Y-%m-%d'}},
+        anonymize_fields={'email': 'email'},
+        primary_key='id',
+        constraints=[{
+            'constraint': 'sdv.constraints.tabular.UniqueCombinations',
+            'columns': ['city', 'country'],
+        }],
+    )
+
+    # Run
+    level_columns = table.get_level_columns(data)
+
+    # Assert
+    assert level_columns == [['category'], ['flag'], ['city', 'country']]
@@ -0,0 +1,295 @@
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sdv.constraints.tabular import CustomConstraint
+from sdv.metadata import Table
+from sdv.tabular.base import BaseTabularModel
+
+
+class _RecordingModel(BaseTabularModel):
+
+    def _fit(self, table_data):
+        self.fitted = table_data
+
+    def _fit_chunks(self, chunks):
+        self.chunks = list(chunks)
+
+
+def _write_csv(tmpdir):
+    data = pd.DataFrame({'category': ['a'] * 100, 'value': range(100)})
+    data.loc[77, 'category'] = 'rare'
+    path = str(tmpdir.join('data.csv'))
+    data.to_csv(path, index=False)
+    return data, path
+
+
+def test__fit_path(tmpdir):
+    """The metadata is fitted on the sample plus a rare category row and the model on all rows."""
+    # Setup
+    data, path = _write_csv(tmpdir)
+    metadata = Mock()
+    metadata.get_level_columns.return_value = [['category']]
+    metadata.transform.side_effect = lambda data: data
+    model = _RecordingModel(random_state=0)
+
+    # Run
+    with patch.object(_RecordingModel, '_build_metadata', return_value=metadata):
+        model.fit(path, max_fit_rows=10, chunk_size=30)
+
+    # Assert
+    fit_data = metadata.fit.call_args[0][0]
+    assert set(fit_data['category']) == {'a', 'rare'}
+    assert len(fit_data) == 11
+    assert fit_data['category'].tolist()[-1] == 'rare'
+    assert model.get_num_fit_rows() == 11
+    assert model._metadata is metadata
+    pd.testing.assert_frame_equal(model.fitted, fit_data)
+    assert [len(chunk) for chunk in model.chunks] == [30, 30, 30, 10]
+    pd.testing.assert_frame_equal(pd.concat(model.chunks), data)
+
+
+def test__fit_path_many_levels(tmpdir):
+    """Columns with more distinct values than ``max_fit_rows`` skip the second pass."""
+    # Setup
+    _, path = _write_csv(tmpdir)
+    metadata = Mock()
+    metadata.get_level_columns.return_value = [['category'], ['value']]
+    metadata.transform.side_effect = lambda data: data
+    model = _RecordingModel(random_state=0)
+    model.chunks = None
+
+    # Run
+    with patch.object(_RecordingModel, '_build_metadata', return_value=metadata):
+        model.fit(path, max_fit_rows=10, chunk_size=30)
+
+    # Assert
+    fit_data = metadata.fit.call_args[0][0]
+    assert set(fit_data['category']) == {'a', 'rare'}
+    assert model.chunks is None
+
+
+def test__fit_path_empty(tmpdir):
+    """A file without rows raises a ``ValueError``."""
+    # Setup
+    path = str(tmpdir.join('empty.csv'))
+    pd.DataFrame({'category': [], 'value': []}).to_csv(path, index=False)
+    model = _RecordingModel()
+
+    # Run
+    with pytest.raises(ValueError, match='No rows found'):
+        model.fit(path)
+
+
+def _category_data():
+    data = pd.DataFrame({'category': ['a'] * 990 + ['b'] * 9 + ['rare'], 'value': range(1000)})
+    transformed = pd.DataFrame({
+        'category#a': data['category'] == 'a',
+        'category#b': data['category'] == 'b',
+        'category#rare': data['category'] == 'rare',
+        'value': data['value'],
+    })
+    return data, transformed
+
+
+def _category_model(**kwargs):
+    model = _RecordingModel(random_state=0, **kwargs)
+    model._metadata = Mock()
+    model._metadata.get_fields.return_value = {
+        'category': {'type': 'categorical'},
+        'value': {'type': 'numerical', 'subtype': 'integer'},
+    }
+    return model
+
+
+def test__subsample():
+    """The stratified sample keeps every category, even if it does not get a full row."""
+    # Setup
+    data, transformed = _category_data()
+    model = _category_model()
+
+    # Run
+    sampled = model._subsample(data, transformed, 10)
+
+    # Assert
+    assert len(sampled) == 10
+    assert sampled[['category#a', 'category#b', 'category#rare']].sum().tolist() == [8, 1, 1]
+    assert list(sampled.columns) == list(transformed.columns)
+
+
+@patch.object(_RecordingModel, 'MIN_AUTO_FIT_ROWS', 5)
+@patch.object(_RecordingModel, 'AUTO_FIT_ROWS_PER_COLUMN', 4)
+def test_fit_max_fit_rows_auto(tmpdir):
+    """``'auto'`` uses the original columns, both for a ``DataFrame`` and a path.
+
+    When fitting from a path, the missing categories are added to the sample.
+    """
+    # Setup
+    data, transformed = _category_data()
+    path = str(tmpdir.join('data.csv'))
+    data.to_csv(path, index=False)
+    model = _category_model()
+    model._metadata.transform.return_value = transformed
+    path_model = _RecordingModel(random_state=0)
+    metadata = Mock()
+    metadata.get_level_columns.return_value = [['category']]
+    metadata.transform.side_effect = lambda data: data
+
+    # Run
+    model.fit(data, max_fit_rows='auto')
+    with patch.object(_RecordingModel, '_build_metadata', return_value=metadata):
+        path_model.fit(path, max_fit_rows='auto')
+
+    # Assert
+    assert model.get_num_fit_rows() == 8
+    assert model.fitted['category#rare'].any()
+    assert path_model.get_num_fit_rows() == 10
+    assert path_model.fitted['category'].value_counts().to_dict() == {'a': 8, 'b': 1, 'rare': 1}
+
+
+def test__build_metadata_anonymization_key():
+    """The ``anonymization_key`` of the model is passed to its metadata."""
+    model = _RecordingModel(anonymization_key='secret')
+
+    metadata = model._build_metadata()
+
+    assert metadata.to_dict()['anonymization_key'] == 'secret'
+
+
+def test_fit_n_jobs():
+    """The ``n_jobs`` of the model is used to generate the fake values in parallel."""
+    # Setup
+    data = pd.DataFrame({
+        'email': ['email_{}'.format(i) for i in range(20)],
+        'value': range(20),
+    })
+    model = _RecordingModel(anonymize_fields={'email': 'email'}, n_jobs=2)
+    fake_values = ['fake_{}'.format(i) for i in range(20)]
+
+    # Run
+    with patch.object(Table, 'MIN_PARALLEL_FAKE_VALUES', 10), \
+            patch.object(Table, '_generate_fake_values_parallel',
+                         return_value=fake_values) as generate_mock:
+        model.fit(data)
+
+    # Assert
+    generate_mock.assert_called_once_with('email', 20)
+    metadata = model.get_metadata()
+    assert metadata.to_dict()['n_jobs'] == 2
+    assert list(metadata._anonymization_mappings['email'][1][:-1]) == fake_values
+
+
+def _fuzzy_metadata():
+    """Metadata that draws from the global random state, like ``categorical_fuzzy``."""
+    metadata = Mock()
+    metadata.transform.side_effect = lambda data: data.add(np.random.random(len(data)), axis=0)
+    metadata.reverse_transform.side_effect = metadata.transform.side_effect
+    metadata.filter_valid.side_effect = lambda data: data
+    metadata.get_acceptance_rate.return_value = None
+    return metadata
+
+
+class _FuzzyModel(_RecordingModel):
+
+    def _sample(self, num_rows):
+        return pd.DataFrame({'value': np.zeros(num_rows)})
+
+
+def _fit_sample_fuzzy(global_seed):
+    np.random.seed(global_seed)
+    model = _FuzzyModel(table_metadata=_fuzzy_metadata(), random_state=0)
+    model.fit(pd.DataFrame({'value': np.zeros(10)}))
+    return model.fitted, model.sample(10)
+
+
+def test_random_state_transformers():
+    """The draws made by the transformers only depend on ``random_state``."""
+    # Run
+    fitted, sampled = _fit_sample_fuzzy(1)
+    global_state = np.random.get_state()[1].copy()
+    other_fitted, other_sampled = _fit_sample_fuzzy(2)
+
+    # Assert
+    pd.testing.assert_frame_equal(fitted, other_fitted)
+    pd.testing.assert_frame_equal(sampled, other_sampled)
+    np.random.seed(1)
+    assert (np.random.get_state()[1] == global_state).all()
+
+
+class _CountingModel(BaseTabularModel):
+
+    def _fit(self, table_data):
+        pass
+
+    def _sample(self, num_rows):
+        return pd.DataFrame({'value': range(num_rows)})
+
+
+def _counting_model(constraints=None):
+    table = Table(field_names=['id', 'value'], constraints=constraints)
+    table._fields_metadata = {
+        'id': {'type': 'id', 'subtype': 'integer'},
+        'value': {'type': 'numerical', 'subtype': 'integer'},
+    }
+    table._hyper_transformer = Mock()
+    table._hyper_transformer.reverse_transform.side_effect = lambda data: data.copy()
+    model = _CountingModel(table_metadata=table)
+    model._sample_chunk_size = 4
+    return model
+
+
+def test_sample_chunks_ids():
+    """The ids of the rows sampled in chunks are unique across chunks and restart on each call."""
+    model = _counting_model()
+
+    first = model.sample(10)
+    second = model.sample(10)
+    unchunked = model.sample(3)
+
+    assert first['id'].tolist() == list(range(10))
+    assert second['id'].tolist() == list(range(10))
+    assert unchunked['id'].tolist() == [0, 1, 2]
+    assert first['value'].tolist() == [0, 1, 2, 3, 0, 1, 2, 3, 0, 1]
+
+
+def _is_multiple_of_four(table_data):
+    return table_data['value'] % 4 == 0
+
+
+def _never_valid(table_data):
+    return pd.Series(False, index=table_data.index)
+
+
+def test__sample_valid_rows_acceptance_rate():
+    """Each trial samples the missing rows divided by the acceptance rate seen so far."""
+    # Setup
+    model = _counting_model([CustomConstraint(is_valid=_is_multiple_of_four)])
+    model._sample_chunk_size = None
+
+    # Run
+    with patch.object(_CountingModel, '_sample', wraps=model._sample) as sample_mock:
+        sampled = model.sample(10)
+
+    # Assert
+    assert [call[0][0] for call in sample_mock.call_args_list] == [10, 24, 4]
+    assert len(sampled) == 10
+    assert (sampled['value'] % 4 == 0).all()
+    assert model._metadata.get_acceptance_rate() == 10 / 38
+
+
+def test__sample_valid_rows_max_retries():
+    """Without valid rows, the rate is bounded by ``MIN_ACCEPTANCE_RATE`` until the retries end."""
+    # Setup
+    model = _counting_model([CustomConstraint(is_valid=_never_valid)])
+    model._sample_chunk_size = None
+
+    # Run
+    with patch.object(_CountingModel, '_sample', wraps=model._sample) as sample_mock:
+        with pytest.raises(ValueError, match='within 3 trials'):
+            model.sample(10, max_retries=3)
+
+    # Assert
+    assert [call[0][0] for call in sample_mock.call_args_list] == [10, 1000, 1000]
+    assert model._metadata.get_acceptance_rate() == 0
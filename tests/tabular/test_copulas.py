@@ -0,0 +1,108 @@
+"""Tests for the sdv.tabular.copulas module."""
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+
+from sdv.metadata import Table
+from sdv.tabular.copulas import GaussianCopula
+
+GAMMA = 'copulas.univariate.gamma.GammaUnivariate'
+BETA = 'copulas.univariate.beta.BetaUnivariate'
+
+
+def _distribution_data():
+    random_state = np.random.default_rng(0)
+    return pd.DataFrame({
+        'gamma': random_state.gamma(2, size=500),
+        'beta': random_state.beta(0.5, 0.5, size=500),
+    })
+
+
+def test__select_distributions():
+    """The best family is selected for each column."""
+    # Setup
+    model = GaussianCopula()
+
+    # Run
+    distributions = model._select_distributions(_distribution_data())
+
+    # Assert
+    assert distributions == {'gamma': GAMMA, 'beta': BETA}
+
+
+def test__select_distributions_n_jobs():
+    """Searching across processes selects the same families as sequentially."""
+    # Setup
+    data = _distribution_data()
+
+    # Run
+    sequential = GaussianCopula(n_jobs=1)._select_distributions(data)
+    with patch('sdv.tabular.copulas.ProcessPoolExecutor') as executor_mock, \
+            patch('sdv.tabular.copulas.os.cpu_count', return_value=4):
+        executor_mock.return_value.__enter__.return_value.map = map
+        parallel = GaussianCopula(n_jobs=-1)._select_distributions(data)
+
+    # Assert
+    assert parallel == sequential
+    assert executor_mock.call_args[1]['max_workers'] == 2
+
+
+def test__select_distributions_processes():
+    """The search runs in a real process pool."""
+    # Run
+    distributions = GaussianCopula(n_jobs=2)._select_distributions(_distribution_data())
+
+    # Assert
+    assert distributions == {'gamma': GAMMA, 'beta': BETA}
+
+
+def test__get_distribution():
+    """Fixed distributions are used as given and stored ones are reused for the same columns."""
+    # Setup
+    data = _distribution_data()
+    fixed = GaussianCopula(distribution='copulas.univariate.GaussianUnivariate')
+    stored = GaussianCopula()
+    stored._metadata = Mock()
+    stored._metadata.get_model_kwargs.return_value = {
+        'distribution': {'gamma': BETA, 'beta': GAMMA}}
+    other = GaussianCopula()
+    other._metadata = Mock()
+    other._metadata.get_model_kwargs.return_value = {'distribution': {'gamma': BETA}}
+
+    # Run
+    fixed_distribution = fixed._get_distribution(data)
+    stored_distribution = stored._get_distribution(data)
+    other_distribution = other._get_distribution(data)
+
+    # Assert
+    assert fixed_distribution == 'copulas.univariate.GaussianUnivariate'
+    assert stored_distribution == {'gamma': BETA, 'beta': GAMMA}
+    assert other_distribution == {'gamma': GAMMA, 'beta': BETA}
+
+
+def test_n_jobs_model_kwargs():
+    """``n_jobs`` is stored in the metadata and used by the models built from it."""
+    # Setup
+    model = GaussianCopula(n_jobs=2)
+    model._metadata = Table()
+    model._model = Mock()
+    model._model.to_dict.return_value = {'univariates': [{'type': GAMMA}], 'columns': ['a']}
+
+    # Run
+    model._update_metadata()
+    loaded = GaussianCopula(table_metadata=model._metadata)
+
+    # Assert
+    assert model._metadata.get_model_kwargs('GaussianCopula')['n_jobs'] == 2
+    assert loaded._n_jobs == 2
+
+
+def test__build_metadata_n_jobs():
+    """``n_jobs`` is also passed to the metadata to generate the fake values."""
+    model = GaussianCopula(n_jobs=2, anonymization_key='secret')
+
+    metadata = model._build_metadata()
+
+    assert metadata.to_dict()['n_jobs'] == 2
+    assert metadata.to_dict()['anonymization_key'] == 'secret'
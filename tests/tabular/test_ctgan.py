@@ -0,0 +1,281 @@
+"""Tests for the sdv.tabular.ctgan module."""
+import sys
+from unittest.mock import MagicMock, Mock, patch
+
+import pandas as pd
+import pytest
+
+from sdv.tabular.ctgan import CTGAN
+
+
+class _FakeTrainer:
+
+    def __init__(self, synthesizer, data, discrete_columns, log_frequency, checkpoint=None):
+        self.epoch = 0 if checkpoint is None else checkpoint['epoch']
+
+    def train_epoch(self):
+        self.epoch += 1
+        return {
+            'epoch': self.epoch,
+            'loss_g': 1.0,
+            'loss_d': -0.5,
+            'mean_loss_g': 1.0,
+            'mean_loss_d': -0.5,
+            'rows_per_second': 100.0,
+        }
+
+    def get_checkpoint(self):
+        return {'epoch': self.epoch}
+
+
+def _ctgan_mock(**kwargs):
+    model = Mock(spec=CTGAN)
+    model._log_frequency = True
+    model._epochs = 5
+    model._validation_data = None
+    model._early_stopping_patience = None
+    model._early_stopping_min_delta = 0
+    model._max_fit_time = None
+    model._checkpoint_path = None
+    model._checkpoint_frequency = 1
+    model._load_checkpoint.return_value = None
+    for name, value in kwargs.items():
+        setattr(model, '_' + name, value)
+
+    return model
+
+
+@patch('sdv.tabular.ctgan._CTGANTrainer', _FakeTrainer)
+def test__train():
+    """All the epochs are run and reported, without checkpoints if there is no path."""
+    # Setup
+    model = _ctgan_mock(epochs=3)
+
+    # Run
+    CTGAN._train(model, pd.DataFrame({'a': [1, 2]}), [])
+
+    # Assert
+    assert model._fitted_epochs == 3
+    assert [report['epoch'] for report in model._fit_report] == [1, 2, 3]
+    model._save_checkpoint.assert_not_called()
+
+
+@patch('sdv.tabular.ctgan._CTGANTrainer', _FakeTrainer)
+def test__train_checkpoint():
+    """Checkpoints are stored every ``checkpoint_frequency`` epochs."""
+    # Setup
+    model = _ctgan_mock(epochs=5, checkpoint_path='checkpoint.pt', checkpoint_frequency=2)
+    saved = list()
+    model._save_checkpoint.side_effect = lambda trainer: saved.append(trainer.epoch)
+
+    # Run
+    CTGAN._train(model, pd.DataFrame({'a': [1, 2]}), [])
+
+    # Assert
+    assert saved == [2, 4]
+
+
+@patch('sdv.tabular.ctgan._CTGANTrainer', _FakeTrainer)
+def test__train_resume():
+    """A resumed training runs only the epochs missing from the checkpoint."""
+    # Setup
+    model = _ctgan_mock(epochs=5)
+    model._load_checkpoint.return_value = {'epoch': 3}
+
+    # Run
+    CTGAN._train(model, pd.DataFrame({'a': [1, 2]}), [])
+
+    # Assert
+    assert model._fitted_epochs == 5
+    assert [report['epoch'] for report in model._fit_report] == [4, 5]
+
+
+def test__save_checkpoint__load_checkpoint(tmpdir):
+    """The stored checkpoint is loaded on the device of the model when resuming."""
+    # Setup
+    path = str(tmpdir.join('checkpoint.pt'))
+    model = _ctgan_mock(checkpoint_path=path, resume=True)
+    model._model = Mock(device='cpu')
+    trainer = _FakeTrainer(None, None, None, None, {'epoch': 2})
+    torch = Mock()
+    torch.save.side_effect = lambda checkpoint, tmp_path: open(tmp_path, 'w').close()
+
+    # Run
+    with patch.dict(sys.modules, {'torch': torch}):
+        CTGAN._save_checkpoint(model, trainer)
+        checkpoint = CTGAN._load_checkpoint(model)
+
+    # Assert
+    torch.save.assert_called_once_with({'epoch': 2}, path + '.tmp')
+    torch.load.assert_called_once_with(path, map_location='cpu')
+    assert checkpoint is torch.load.return_value
+    assert not tmpdir.join('checkpoint.pt.tmp').exists()
+    assert tmpdir.join('checkpoint.pt').exists()
+
+
+class _FakeTorch:
+
+    def __init__(self, started=False):
+        self.num_threads = 8
+        self.num_interop_threads = 4
+        self.started = started
+
+    def get_num_threads(self):
+        return self.num_threads
+
+    def set_num_threads(self, num_threads):
+        self.num_threads = num_threads
+
+    def get_num_interop_threads(self):
+        return self.num_interop_threads
+
+    def set_num_interop_threads(self, num_threads):
+        if self.started:
+            raise RuntimeError('cannot set number of interop threads after parallel work')
+
+        self.num_interop_threads = num_threads
+
+
+def _fit_ctgan_mock(torch, **kwargs):
+    attributes = {
+        'num_threads': 2,
+        'interop_threads': 3,
+        'validation_split': None,
+        'random_state': None,
+        'embedding_dim': 2,
+        'gen_dim': (2, ),
+        'dis_dim': (2, ),
+        'l2scale': 0,
+        'batch_size': 2,
+        'CTGAN_CLASS': Mock(),
+        'metadata': Mock(),
+    }
+    attributes.update(kwargs)
+    model = _ctgan_mock(**attributes)
+    model._metadata.get_fields.return_value = {}
+    model._set_threads.side_effect = lambda: CTGAN._set_threads(model)
+    threads = list()
+    model._train.side_effect = lambda data, categoricals: threads.append(
+        (torch.num_threads, torch.num_interop_threads))
+    return model, threads
+
+
+def test__set_threads():
+    """The torch threads are set while fitting and the intra-op ones restored afterwards."""
+    # Setup
+    torch = _FakeTorch()
+    model, threads = _fit_ctgan_mock(torch)
+
+    # Run
+    with patch.dict(sys.modules, {'torch': torch}):
+        CTGAN._fit(model, pd.DataFrame({'a': [1, 2]}))
+
+    # Assert
+    assert threads == [(2, 3)]
+    assert torch.num_threads == 8
+
+
+def test__set_threads_error():
+    """The intra-op threads are restored if the training fails."""
+    # Setup
+    torch = _FakeTorch()
+    model, _ = _fit_ctgan_mock(torch)
+    model._train.side_effect = ValueError()
+
+    # Run
+    with patch.dict(sys.modules, {'torch': torch}), pytest.raises(ValueError):
+        CTGAN._fit(model, pd.DataFrame({'a': [1, 2]}))
+
+    # Assert
+    assert torch.num_threads == 8
+
+
+def test__set_threads_interop_started(caplog):
+    """If torch already started parallel work, the interop threads are left as they are."""
+    # Setup
+    torch = _FakeTorch(started=True)
+    model, threads = _fit_ctgan_mock(torch)
+
+    # Run
+    with patch.dict(sys.modules, {'torch': torch}):
+        CTGAN._fit(model, pd.DataFrame({'a': [1, 2]}))
+
+    # Assert
+    assert threads == [(2, 4)]
+    assert 'Could not set the number of interop threads' in caplog.text
+
+
+def test__fit_validation_split():
+    """The validation rows are held out from the training data while training."""
+    # Setup
+    torch = _FakeTorch()
+    model, _ = _fit_ctgan_mock(torch, validation_split=0.25)
+    model.MAX_VALIDATION_ROWS = CTGAN.MAX_VALIDATION_ROWS
+    data = pd.DataFrame({'a': range(8)})
+    seen = list()
+    model._train.side_effect = lambda data, categoricals: seen.append(
+        (data, model._validation_data))
+
+    # Run
+    with patch.dict(sys.modules, {'torch': torch}):
+        CTGAN._fit(model, data)
+
+    # Assert
+    train, validation = seen[0]
+    assert len(train) == 6
+    assert len(validation) == 2
+    assert sorted(train['a'].tolist() + validation['a'].tolist()) == list(range(8))
+    assert model._validation_data is None
+
+
+def test__get_validation_score():
+    """The score adds up the standardized differences of the means and the stds."""
+    # Setup
+    model = _ctgan_mock()
+    model._validation_data = pd.DataFrame({'a': [1.0, 3.0], 'b': [5.0, 5.0]})
+    model._model.sample.return_value = pd.DataFrame({'a': [2.0, 6.0], 'b': [5.0, 7.0]})
+
+    # Run
+    with patch.dict(sys.modules, {'torch': MagicMock()}):
+        score = CTGAN._get_validation_score(model)
+
+    # Assert
+    assert score == pytest.approx(1 + 2 ** 0.5)
+    model._model.sample.assert_called_once_with(2)
+
+
+@patch('sdv.tabular.ctgan._CTGANTrainer', _FakeTrainer)
+def test_get_fit_report_get_loss_history():
+    """The report has one row per epoch and the history only its loss and score columns."""
+    # Setup
+    model = _ctgan_mock(epochs=3, validation_data=pd.DataFrame({'a': [1, 2]}))
+    model._get_validation_score.side_effect = [0.3, 0.2, 0.1]
+    CTGAN._train(model, pd.DataFrame({'a': [1, 2]}), [])
+    model.get_fit_report.side_effect = lambda: CTGAN.get_fit_report(model)
+
+    # Run
+    report = CTGAN.get_fit_report(model)
+    history = CTGAN.get_loss_history(model)
+
+    # Assert
+    assert report.shape == (3, 7)
+    assert report['validation_score'].tolist() == [0.3, 0.2, 0.1]
+    assert list(history.columns) == [
+        'epoch', 'loss_g', 'loss_d', 'mean_loss_g', 'mean_loss_d', 'validation_score']
+    assert history['epoch'].tolist() == [1, 2, 3]
+
+
+@patch('sdv.tabular.ctgan._CTGANTrainer', _FakeTrainer)
+def test_get_loss_history_without_validation():
+    """Without validation data there is no validation score column."""
+    # Setup
+    model = _ctgan_mock(epochs=2)
+    CTGAN._train(model, pd.DataFrame({'a': [1, 2]}), [])
+    model.get_fit_report.side_effect = lambda: CTGAN.get_fit_report(model)
+
+    # Run
+    history = CTGAN.get_loss_history(model)
+
+    # Assert
+    assert history.shape == (2, 5)
+    model._get_validation_score.assert_not_called()
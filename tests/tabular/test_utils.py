@@ -1,13 +1,16 @@
 """Tests for the sdv.models.utils module."""
-from unittest.mock import patch
+import tracemalloc
+from unittest.mock import Mock, patch
 
 import numpy as np
 import pandas as pd
 import pytest
 
 from sdv.tabular.utils import (
-    _key_order, check_matrix_symmetric_positive_definite, flatten_array, flatten_dict, impute,
-    make_positive_definite, square_matrix, unflatten_dict)
+    _key_order, check_matrix_symmetric_positive_definite, flatten_array, flatten_dict,
+    add_missing_levels, get_random_generator, impute, make_positive_definite, random_state,
+    reservoir_sample, sample_gaussian_multivariate, square_matrix, stratified_sample_index,
+    track_levels, unflatten_dict)
 
 
 def test_flatten_array_default():
@@ -219,3 +222,201 @@ def test_unflatten_dict():
         'tar': 'tar value',
     }
     assert result == expected
+
+
+def test_get_random_generator():
+    """Seeds are converted to Generators, Generators and None are returned as is."""
+    generator = np.random.default_rng(0)
+
+    assert get_random_generator(None) is None
+    assert get_random_generator(generator) is generator
+    assert isinstance(get_random_generator(0), np.random.Generator)
+
+
+def test_random_state_reproducible():
+    """Global draws inside the context depend only on the generator."""
+    # Run
+    with random_state(np.random.default_rng(42)):
+        first = np.random.random(5)
+
+    with random_state(np.random.default_rng(42)):
+        second = np.random.random(5)
+
+    # Assert
+    np.testing.assert_array_equal(first, second)
+
+
+def test_random_state_restores_global_state():
+    """The global numpy random state is restored when leaving the context."""
+    # Setup
+    np.random.seed(0)
+    expected = np.random.random(3)
+    np.random.seed(0)
+
+    # Run
+    with random_state(np.random.default_rng(1)):
+        np.random.random(10)
+
+    # Assert
+    np.testing.assert_array_equal(np.random.random(3), expected)
+
+
+class _ShiftedUnivariate:
+
+    def __init__(self, shift):
+        self.shift = shift
+
+    def percent_point(self, values):
+        return values + self.shift
+
+
+def _gaussian_multivariate():
+    model = Mock()
+    model.columns = ['b', 'a']
+    model.univariates = [_ShiftedUnivariate(10), _ShiftedUnivariate(0)]
+    model.covariance = np.array([[1, 0.5], [0.5, 1]])
+    return model
+
+
+def test_sample_gaussian_multivariate():
+    """Rows depend only on the generator, keep the column order and leave np.random alone."""
+    # Setup
+    model = _gaussian_multivariate()
+    global_state = np.random.get_state()
+
+    # Run
+    first = sample_gaussian_multivariate(model, 5, np.random.default_rng(0))
+    second = sample_gaussian_multivariate(model, 5, np.random.default_rng(0))
+
+    # Assert
+    pd.testing.assert_frame_equal(first, second)
+    assert list(first.columns) == ['b', 'a']
+    assert len(first) == 5
+    assert ((first['b'] >= 10) & (first['b'] <= 11)).all()
+    assert ((first['a'] >= 0) & (first['a'] <= 1)).all()
+    np.testing.assert_array_equal(np.random.get_state()[1], global_state[1])
+
+
+def test_stratified_sample_index():
+    """Every stratum keeps its proportion in the sample."""
+    # Setup
+    data = pd.DataFrame({
+        'a': ['x'] * 60 + ['y'] * 30 + ['z'] * 10,
+        'b': range(100),
+    })
+
+    # Run
+    index = stratified_sample_index(data, ['a'], 10, np.random.default_rng(0))
+
+    # Assert
+    assert len(index) == 10
+    assert len(set(index)) == 10
+    assert data.a.iloc[index].value_counts().to_dict() == {'x': 6, 'y': 3, 'z': 1}
+
+
+def test_stratified_sample_index_rare_strata():
+    """Strata too small for their proportion still get one row."""
+    # Setup
+    data = pd.DataFrame({'a': ['x'] * 900 + ['y'] * 95 + ['z'] * 4 + ['w']})
+
+    # Run
+    index = stratified_sample_index(data, ['a'], 10, np.random.default_rng(0))
+
+    # Assert
+    assert len(index) == 10
+    assert data.a.iloc[index].value_counts().to_dict() == {'x': 7, 'y': 1, 'z': 1, 'w': 1}
+
+
+def test_stratified_sample_index_all_rows():
+    """If more rows than available are requested, all of them are returned."""
+    data = pd.DataFrame({'a': [1, 2, 3]})
+
+    index = stratified_sample_index(data, [], 5)
+
+    np.testing.assert_array_equal(index, [0, 1, 2])
+
+
+def test_reservoir_sample():
+    """The sample is bounded and only contains rows from the chunks."""
+    # Setup
+    chunks = [pd.DataFrame({'a': range(start, start + 10)}) for start in range(0, 50, 10)]
+
+    # Run
+    sample, total = reservoir_sample(chunks, 7, np.random.default_rng(0))
+
+    # Assert
+    assert total == 50
+    assert len(sample) == 7
+    assert sample.a.is_unique
+    assert sample.a.isin(range(50)).all()
+
+
+def test_track_levels():
+    """The distinct combinations of each group are collected while the chunks pass through."""
+    # Setup
+    chunks = [
+        pd.DataFrame({'a': range(start, start + 10), 'b': ['x'] * 10, 'c': ['y'] * 10})
+        for start in range(0, 50, 10)
+    ]
+    chunks[3].loc[5, 'b'] = 'rare'
+    chunks[4].loc[2, 'c'] = np.nan
+    levels = dict()
+
+    # Run
+    passed = list(track_levels(chunks, [['a'], ['b'], ['b', 'c']], levels, 20))
+
+    # Assert
+    assert passed == chunks
+    assert levels[('a', )] is None
+    assert levels[('b', )]['b'].tolist() == ['x', 'rare']
+    assert levels[('b', 'c')].fillna('nan').values.tolist() == [
+        ['x', 'y'], ['rare', 'y'], ['x', 'nan']]
+
+
+def test_track_levels_bounded_memory():
+    """Columns with many distinct values do not keep them in memory."""
+    # Setup
+    def chunks():
+        for start in range(0, 100000, 1000):
+            yield pd.DataFrame({
+                'email': ['user{}@example.com'.format(value)
+                          for value in range(start, start + 1000)],
+                'category': ['x', 'y'] * 500,
+            })
+
+    levels = dict()
+
+    # Run
+    tracemalloc.start()
+    sample, total = reservoir_sample(
+        track_levels(chunks(), [['email'], ['category']], levels, 100), 100)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # Assert
+    assert total == 100000
+    assert len(sample) == 100
+    assert levels[('email', )] is None
+    assert sorted(levels[('category', )]['category']) == ['x', 'y']
+    assert peak < 2 * 1024 * 1024
+
+
+def test_add_missing_levels():
+    """A row is added for each combination missing from the sample, sharing rows across groups."""
+    # Setup
+    sample = pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 'x', 'y'], 'c': [True, True, True]})
+    levels = {
+        ('b', ): pd.DataFrame({'b': ['x', 'y', 'rare', 'other']}),
+        ('c', ): pd.DataFrame({'c': [True, False]}),
+        ('a', ): None,
+    }
+
+    # Run
+    result = add_missing_levels(sample, levels, np.random.default_rng(0))
+
+    # Assert
+    assert len(result) == 5
+    pd.testing.assert_frame_equal(result.iloc[:3], sample)
+    assert result['b'].tolist()[3:] == ['rare', 'other']
+    assert not result['c'].iloc[3]
+    assert result['a'].isin([1, 2, 3]).all()
@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from sdv.benchmark_constraints import (
+    METHODS, benchmark_constraints, check_regressions, get_benchmark_constraints,
+    get_benchmark_data)
+
+
+def test_get_benchmark_data():
+    """The generated data fulfills all the benchmark constraints."""
+    table_data = get_benchmark_data(num_rows=100, cardinality=5, random_state=0)
+
+    assert len(table_data) == 100
+    assert table_data['category'].nunique() <= 5
+    for constraint in get_benchmark_constraints().values():
+        constraint.fit(table_data)
+        assert constraint.is_valid(table_data).all()
+
+
+def test_benchmark_constraints():
+    """Every method of every constraint is measured."""
+    results = benchmark_constraints(num_rows=100, iterations=1)
+
+    assert len(results) == len(get_benchmark_constraints()) * len(METHODS)
+    assert (results['rows_per_second'] > 0).all()
+    assert (results['peak_memory'] >= 0).all()
+
+
+def _results(seconds):
+    return pd.DataFrame({
+        'constraint': ['GreaterThan', 'GreaterThan'],
+        'method': ['fit', 'transform'],
+        'rows': [1000, 1000],
+        'seconds': seconds,
+        'rows_per_second': [1000 / value for value in seconds],
+    })
+
+
+def test_check_regressions():
+    """Throughput drops within the threshold pass the check."""
+    comparison = check_regressions(_results([1.1, 1.1]), _results([1, 1]))
+
+    assert (comparison['change'] < 0).all()
+
+
+def test_check_regressions_raises():
+    """Throughput drops beyond the threshold fail the check."""
+    with pytest.raises(ValueError, match='GreaterThan.transform'):
+        check_regressions(_results([1, 2]), _results([1, 1]))
+
+
+def test_check_regressions_min_seconds():
+    """Methods faster than ``min_seconds`` are not checked."""
+    check_regressions(_results([1e-6, 1]), _results([1e-7, 1]))
@@ -0,0 +1,61 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ('copulas', 'ctgan', 'exrex', 'faker', 'graphviz', 'rdt', 'sdmetrics', 'torch')
+
+
+def _import_in_subprocess(statement):
+    """Run ``statement`` in a fresh interpreter and report the heavy modules it imported."""
+    code = (
+        'import json, sys\n'
+        '{}\n'
+        'print(json.dumps(sorted(name for name in {!r} if name in sys.modules)))\n'
+    ).format(statement, HEAVY_MODULES)
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='PEP 562 requires Python 3.7')
+def test_import_sdv_is_lazy():
+    """Importing sdv must not import any of the heavy dependencies."""
+    heavy = _import_in_subprocess('import sdv')
+
+    assert heavy == []
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='PEP 562 requires Python 3.7')
+def test_import_metadata_is_lazy():
+    """Metadata only needs rdt, not the anonymization, plotting or evaluation libraries."""
+    heavy = _import_in_subprocess('from sdv import Metadata')
+
+    assert heavy == ['rdt']
+
+
+def test_import_ctgan_is_lazy():
+    """torch and ctgan are only imported when a CTGAN model is created, not by importing it."""
+    heavy = _import_in_subprocess('import sdv\nfrom sdv.tabular import CTGAN')
+
+    assert 'ctgan' not in heavy
+    assert 'torch' not in heavy
+
+
+def test_lazy_attribute():
+    """The lazily imported names are the ones defined in their modules."""
+    import sdv
+    from sdv.sdv import SDV
+
+    assert sdv.SDV is SDV
+    assert 'SDV' in dir(sdv)
+
+    with pytest.raises(AttributeError):
+        sdv.missing
+
+
+def test_import_gaussian_copula():
+    """The tabular GaussianCopula imports the copulas submodules it needs by itself."""
+    heavy = _import_in_subprocess('from sdv.tabular.copulas import GaussianCopula')
+
+    assert 'copulas' in heavy
@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from sdv.constraints.relational import ChildGreaterThan, ChildSumLessThan
 from sdv.metadata import Metadata
 from sdv.models.base import SDVModel
 from sdv.sampler import Sampler
@@ -184,6 +185,7 @@ class TestSampler:
         """Test sample rows from model"""
         # Setup
         sampler = Mock(spec=Sampler)
+        sampler._random_state = None
         sampler._get_primary_keys.return_value = ('pk', [1, 2, 3, 4])
 
         model = Mock()
@@ -240,6 +242,7 @@ class TestSampler:
         sampler = Mock(spec=Sampler)
         sampler.model = model
         sampler.model_kwargs = dict()
+        sampler._constraints = []
 
         sampler._extract_parameters.return_value = {'child_rows': 5}
 
@@ -282,6 +285,7 @@ class TestSampler:
         sampler = Mock(spec=Sampler)
         sampler.model = model
         sampler.model_kwargs = dict()
+        sampler._constraints = []
         sampler._extract_parameters.return_value = {'child_rows': 5}
 
         table_model_mock = Mock()
@@ -321,6 +325,46 @@ class TestSampler:
             expected_sampled
         )
 
+    def test__apply_constraints(self):
+        """Child rows that break a constraint are sampled again until they are valid."""
+        # Setup
+        sampler = Mock(spec=Sampler)
+        sampler.MAX_CONSTRAINT_RETRIES = Sampler.MAX_CONSTRAINT_RETRIES
+        sampler._constraints = [ChildGreaterThan('parent', 'test', 'low', 'value')]
+        sampler._reverse_transform.side_effect = lambda table_name, data: data
+        sampler._sample_rows.side_effect = [
+            pd.DataFrame({'value': [0]}),
+            pd.DataFrame({'value': [5]}),
+        ]
+        table_rows = pd.DataFrame({'value': [3, 1, 4]})
+
+        # Run
+        result = Sampler._apply_constraints(
+            sampler, 'model', 'test', 'parent', pd.Series({'low': 2}), table_rows)
+
+        # Asserts
+        assert sampler._sample_rows.call_count == 2
+        sampler._sample_rows.assert_called_with('model', 1, 'test')
+        pd.testing.assert_frame_equal(result, pd.DataFrame({'value': [3, 4, 5]}))
+
+    def test__apply_constraints_max_retries(self):
+        """Only the child rows that are still invalid after the last retry are dropped."""
+        # Setup
+        sampler = Mock(spec=Sampler)
+        sampler.MAX_CONSTRAINT_RETRIES = 2
+        sampler._constraints = [ChildSumLessThan('parent', 'test', 'limit', 'value')]
+        sampler._reverse_transform.side_effect = lambda table_name, data: data
+        sampler._sample_rows.return_value = pd.DataFrame({'value': [10]})
+        table_rows = pd.DataFrame({'value': [10, 10]})
+
+        # Run
+        result = Sampler._apply_constraints(
+            sampler, 'model', 'test', 'parent', pd.Series({'limit': 15}), table_rows)
+
+        # Asserts
+        assert sampler._sample_rows.call_count == 2
+        pd.testing.assert_frame_equal(result, pd.DataFrame({'value': [10]}))
+
     def test_sample_all(self):
         """Test sample all regenerating the primary keys"""
         # Setup
@@ -410,3 +454,104 @@ class TestSampler:
         assert choice_mock.call_count == 1
         assert list(choice_mock.call_args[0][0]) == list(likelihoods.index)
         np.testing.assert_array_equal(choice_mock.call_args[1]['p'], expected_weights)
+
+    def test__find_parent_id_random_state(self):
+        """The parents are drawn from the given generator, not the global state."""
+        # Setup
+        likelihoods = pd.Series([0.1, 0.2, 0.3, 0.4])
+        num_rows = pd.Series([1, 2, 3, 4])
+        generator = np.random.default_rng(0)
+        expected_generator = np.random.default_rng(0)
+        global_state = np.random.get_state()
+
+        # Run
+        result = [
+            Sampler._find_parent_id(likelihoods, num_rows, generator)
+            for _ in range(10)
+        ]
+
+        # Assert
+        expected = [
+            expected_generator.choice(likelihoods.index, p=[0.1, 0.2, 0.3, 0.4])
+            for _ in range(10)
+        ]
+        assert result == expected
+        np.testing.assert_array_equal(np.random.get_state()[1], global_state[1])
+        assert np.random.get_state()[2] == global_state[2]
+
+    def test__sample_rows_random_state(self):
+        """The generator of the sampler is passed to the model."""
+        # Setup
+        sampler = Mock(spec=Sampler)
+        sampler._random_state = np.random.default_rng(0)
+        sampler._get_primary_keys.return_value = (None, None)
+
+        model = Mock()
+        model.sample.return_value = pd.DataFrame({'a': [1, 2]})
+
+        # Run
+        Sampler._sample_rows(sampler, model, num_rows=2, table_name='test')
+
+        # Assert
+        model.sample.assert_called_once_with(2, random_state=sampler._random_state)
+
+
+class _IdentityTransformer:
+
+    def reverse_transform(self, data):
+        return data
+
+
+class _UniformModel(SDVModel):
+
+    def __init__(self, parameters=None):
+        self.parameters = parameters
+
+    def set_parameters(self, parameters):
+        self.parameters = parameters
+
+    def sample(self, num_rows, random_state=None):
+        if self.parameters is None:
+            return pd.DataFrame({
+                'limit': np.full(num_rows, 10.0),
+                '__transactions__child_rows': np.full(num_rows, 5.0),
+            })
+
+        return pd.DataFrame({'amount': (random_state or np.random).uniform(0, 5, num_rows)})
+
+
+def test_sample_cross_table_constraints():
+    """The real ``Sampler`` regenerates the child rows that break the constraints."""
+    metadata = Metadata({'tables': {
+        'users': {
+            'primary_key': 'id',
+            'fields': {
+                'id': {'type': 'id', 'subtype': 'integer'},
+                'limit': {'type': 'numerical', 'subtype': 'float'},
+            },
+        },
+        'transactions': {
+            'primary_key': 'id',
+            'fields': {
+                'id': {'type': 'id', 'subtype': 'integer'},
+                'user_id': {'type': 'id', 'subtype': 'integer',
+                            'ref': {'table': 'users', 'field': 'id'}},
+                'amount': {'type': 'numerical', 'subtype': 'float'},
+            },
+        },
+    }})
+    metadata._hyper_transformers = {
+        'users': _IdentityTransformer(),
+        'transactions': _IdentityTransformer(),
+    }
+    constraint = ChildSumLessThan('users', 'transactions', 'limit', 'amount')
+    models = {'users': _UniformModel(), 'transactions': _UniformModel()}
+    sampler = Sampler(metadata, models, _UniformModel, {}, {'users': 10, 'transactions': 50},
+                      random_state=0, constraints=[constraint])
+
+    sampled = sampler.sample('users', 10)
+
+    totals = sampled['transactions'].groupby('user_id')['amount'].sum()
+    assert len(totals) == 10
+    assert (totals <= 10).all()
+    assert (sampled['transactions']['user_id'].value_counts() <= 5).all()
@@ -3,6 +3,9 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from sdv.metadata import Metadata
+from sdv.models.base import SDVModel
+from sdv.sampler import Sampler
 from sdv.sdv import DEFAULT_MODEL, DEFAULT_MODEL_KWARGS, SDV, NotFittedError
 
 
@@ -97,3 +100,65 @@ class TestSDV(TestCase):
         # Run
         with pytest.raises(NotFittedError):
             SDV.sample_all(sdv)
+
+
+def _save_relational_sdv(path):
+    metadata = Metadata({'tables': {
+        'users': {
+            'primary_key': 'id',
+            'fields': {'id': {'type': 'id', 'subtype': 'integer'}},
+        },
+        'sessions': {
+            'primary_key': 'id',
+            'fields': {
+                'id': {'type': 'id', 'subtype': 'integer'},
+                'user_id': {'type': 'id', 'subtype': 'integer',
+                            'ref': {'table': 'users', 'field': 'id'}},
+            },
+        },
+        'other': {'fields': {'x': {'type': 'numerical', 'subtype': 'float'}}},
+    }})
+    sdv = SDV(model=SDVModel, model_kwargs={})
+    sdv.metadata = metadata
+    models = {table_name: SDVModel() for table_name in metadata.get_tables()}
+    sdv.sampler = Sampler(metadata, models, SDVModel, {}, {'users': 1, 'sessions': 2, 'other': 3})
+    sdv.save(path, compact=True)
+
+
+def test_load_compact_lazy_set_hyper_transformer(tmpdir):
+    """Hyper transformers can be added to lazily loaded instances."""
+    path = str(tmpdir.join('sdv'))
+    _save_relational_sdv(path)
+
+    loaded = SDV.load(path, lazy=True)
+    loaded.metadata._hyper_transformers['users'] = 'transformer'
+
+    assert loaded.metadata._hyper_transformers['users'] == 'transformer'
+
+
+def test_load_compact_lazy_contains(tmpdir):
+    """Checking which tables have a model or a hyper transformer does not load them."""
+    path = str(tmpdir.join('sdv'))
+    _save_relational_sdv(path)
+
+    loaded = SDV.load(path, lazy=True)
+    models = loaded.sampler.models
+
+    assert 'users' in models
+    assert 'users' not in loaded.metadata._hyper_transformers
+    assert len(loaded.metadata._hyper_transformers) == 0
+    assert models._store.get_loaded() == []
+
+
+def test_load_compact_tables(tmpdir):
+    """The tables needed to sample the requested ones are loaded as well."""
+    path = str(tmpdir.join('sdv'))
+    _save_relational_sdv(path)
+
+    users = SDV.load(path, tables=['users'], lazy=True)
+    sessions = SDV.load(path, tables=['sessions'])
+
+    assert sorted(users.sampler.models) == ['sessions', 'users']
+    assert sorted(sessions.sampler.models) == ['sessions', 'users']
+    with pytest.raises(ValueError, match='other'):
+        users.sample('other')
@@ -0,0 +1,209 @@
+from collections import Counter, OrderedDict, defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sdv import serialization
+
+
+class Dummy:
+
+    def __init__(self):
+        self.array = np.arange(5.0)
+        self.mapping = {1: 'a', 'b': (1, 2)}
+        self.series = pd.Series([1.5, 2.5], index=[3, 4], name='values')
+        self.dtype = np.dtype('int64')
+        self.type = float
+        self.method = self.get_sum
+
+    def get_sum(self):
+        return self.array.sum()
+
+
+def test_dump_load(tmpdir):
+    """Objects are rebuilt with their attributes, arrays and bound methods."""
+    # Setup
+    dummy = Dummy()
+    path = str(tmpdir.join('dummy'))
+
+    # Run
+    serialization.dump(dummy, path)
+    loaded = serialization.load(path, allowed_modules=[Dummy.__module__])
+
+    # Assert
+    assert isinstance(loaded, Dummy)
+    np.testing.assert_array_equal(loaded.array, dummy.array)
+    assert loaded.mapping == {1: 'a', 'b': (1, 2)}
+    pd.testing.assert_series_equal(loaded.series, dummy.series)
+    assert loaded.dtype == np.dtype('int64')
+    assert loaded.type is float
+    assert loaded.method() == 10
+
+
+def test_load_not_allowed(tmpdir):
+    """Objects from modules that are not explicitly allowed are not imported."""
+    # Setup
+    path = str(tmpdir.join('dummy'))
+    serialization.dump(Dummy(), path)
+
+    # Run / Assert
+    with pytest.raises(ValueError, match='Cannot load'):
+        serialization.load(path)
+
+
+def test_dump_load_dict_subclasses(tmpdir):
+    """Dict subclasses keep their class, order and default factory."""
+    # Setup
+    ordered = OrderedDict([('b', 1), ('a', 2)])
+    default = defaultdict(list, {'x': [1]})
+    counter = Counter('abca')
+    path = str(tmpdir.join('dicts'))
+
+    # Run
+    serialization.dump([ordered, default, counter], path)
+    loaded_ordered, loaded_default, loaded_counter = serialization.load(path)
+
+    # Assert
+    assert type(loaded_ordered) is OrderedDict
+    assert list(loaded_ordered.items()) == [('b', 1), ('a', 2)]
+    assert type(loaded_default) is defaultdict
+    assert loaded_default.default_factory is list
+    assert loaded_default == {'x': [1]}
+    assert type(loaded_counter) is Counter
+    assert loaded_counter == counter
+
+
+def test_dump_torch_not_supported(tmpdir):
+    """Objects from ``torch`` or ``ctgan`` are rejected with a clear error."""
+    # Setup
+    module_class = type('Module', (), {'__module__': 'torch.nn.modules.module'})
+
+    # Run / Assert
+    with pytest.raises(TypeError, match='torch objects cannot be stored'):
+        serialization.dump({'model': module_class()}, str(tmpdir.join('model')))
+
+
+def test_dump_load_numerical_list(tmpdir):
+    """Long numerical lists are stored as arrays and loaded back as lists."""
+    # Setup
+    values = {'covariance': [[float(i)] * 20 for i in range(20)]}
+    path = str(tmpdir.join('values'))
+
+    # Run
+    serialization.dump(values, path)
+    loaded = serialization.load(path)
+
+    # Assert
+    assert loaded == values
+    with open(path + '.json') as json_file:
+        assert '__list__' in json_file.read()
+
+
+def test_dump_load_random_state(tmpdir):
+    """Generators keep their state."""
+    # Setup
+    generator = np.random.default_rng(0)
+    path = str(tmpdir.join('generator'))
+
+    # Run
+    serialization.dump(generator, path)
+    loaded = serialization.load(path)
+
+    # Assert
+    assert loaded.random() == generator.random()
+
+
+class StatefulDummy:
+
+    def __init__(self):
+        self.values = iter(range(5))
+        self.num_values = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['values']
+        return state
+
+
+def test_dump_load_getstate(tmpdir):
+    """Attributes left out by ``__getstate__`` are not stored."""
+    # Setup
+    dummy = StatefulDummy()
+    path = str(tmpdir.join('dummy'))
+
+    # Run
+    serialization.dump(dummy, path)
+    loaded = serialization.load(path, allowed_modules=[StatefulDummy.__module__])
+
+    # Assert
+    assert vars(loaded) == {'num_values': 0}
+
+
+def test_lazy_store(tmpdir):
+    """Objects are loaded on first access and the least recently used are discarded."""
+    # Setup
+    paths = dict()
+    for name in ('a', 'b', 'c'):
+        paths[name] = str(tmpdir.join(name))
+        serialization.dump({'model': name.upper(), 'transformer': None}, paths[name])
+
+    store = serialization.LazyStore(paths, max_loaded=2)
+    models = store.view('model')
+    transformers = store.view('transformer')
+
+    # Run
+    loaded_before = store.get_loaded()
+    values = [models['a'], models['b'], models['a'], models['c']]
+
+    # Assert
+    assert loaded_before == []
+    assert values == ['A', 'B', 'A', 'C']
+    assert store.get_loaded() == ['a', 'c']
+    assert transformers.get('a') is None
+    assert sorted(models) == ['a', 'b', 'c']
+
+
+def test_lazy_store_view_contains(tmpdir):
+    """Membership, iteration and length are answered without loading anything."""
+    # Setup
+    paths = dict()
+    for name in ('a', 'b'):
+        paths[name] = str(tmpdir.join(name))
+        serialization.dump({'model': name.upper(), 'transformer': None}, paths[name])
+
+    store = serialization.LazyStore(paths)
+    models = store.view('model')
+    transformers = store.view('transformer', names=[])
+    transformers['c'] = 'C'
+
+    # Run
+    contained = ('a' in models, 'c' in models, 'a' in transformers, 'c' in transformers)
+    iterated = (sorted(models), list(transformers), len(models), len(transformers))
+
+    # Assert
+    assert contained == (True, False, False, True)
+    assert iterated == (['a', 'b'], ['c'], 2, 1)
+    assert store.get_loaded() == []
+    with pytest.raises(KeyError):
+        transformers['a']
+
+    assert store.get_loaded() == []
+
+
+def test_lazy_store_view_set(tmpdir):
+    """Values can be set on a view without modifying the stored objects."""
+    # Setup
+    path = str(tmpdir.join('a'))
+    serialization.dump({'transformer': None}, path)
+    transformers = serialization.LazyStore({'a': path}).view('transformer')
+
+    # Run
+    transformers['a'] = 'A'
+    transformers['b'] = 'B'
+
+    # Assert
+    assert transformers['a'] == 'A'
+    assert sorted(transformers) == ['a', 'b']
+    assert 'c' not in transformers
+    assert serialization.load(path) == {'transformer': None}
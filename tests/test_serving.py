@@ -0,0 +1,247 @@
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import Mock
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pandas as pd
+import pytest
+
+from sdv.serving import SamplePool, SamplingServer
+
+
+def _get_model():
+    model = Mock()
+    model.sample.side_effect = lambda num_rows: pd.DataFrame({'a': range(num_rows)})
+    return model
+
+
+def test_sample_batches_concurrent_requests():
+    """Concurrent requests are served with a single draw and split back."""
+    # Setup
+    model = _get_model()
+    server = SamplingServer(model, batch_delay=0.05)
+    loop = asyncio.new_event_loop()
+
+    async def run():
+        await server.start()
+        try:
+            return await asyncio.gather(server.sample(2), server.sample(3), server.sample(1))
+        finally:
+            await server.stop()
+
+    # Run
+    results = loop.run_until_complete(run())
+    loop.close()
+
+    # Assert
+    model.sample.assert_called_once_with(6)
+    assert [list(result['a']) for result in results] == [[0, 1], [2, 3, 4], [5]]
+
+    stats = server.get_stats()
+    assert stats['requests'] == 3
+    assert stats['rows'] == 6
+    assert stats['draws'] == 1
+
+
+def test_http_loopback():
+    """Rows and stats can be requested over HTTP."""
+    # Setup
+    server = SamplingServer(_get_model())
+    host, port = server.start_in_thread()
+    url = 'http://{}:{}'.format(host, port)
+
+    # Run
+    try:
+        with urlopen(url + '/sample?num_rows=3') as response:
+            sampled = json.loads(response.read().decode())
+
+        with urlopen(url + '/stats') as response:
+            stats = json.loads(response.read().decode())
+
+    finally:
+        server.stop_thread()
+
+    # Assert
+    assert sampled == [{'a': 0}, {'a': 1}, {'a': 2}]
+    assert stats['requests'] == 1
+    assert stats['rows'] == 3
+
+
+def test_sample_invalid_num_rows():
+    """Zero or negative numbers of rows are rejected before joining a batch."""
+    # Setup
+    model = _get_model()
+    server = SamplingServer(model)
+    loop = asyncio.new_event_loop()
+
+    # Run
+    with pytest.raises(ValueError, match='positive'):
+        loop.run_until_complete(server.sample(-4))
+
+    loop.close()
+
+    # Assert
+    model.sample.assert_not_called()
+
+
+def test_http_invalid_num_rows():
+    """Requests with a missing, zero or negative number of rows get a 400."""
+    # Setup
+    model = _get_model()
+    server = SamplingServer(model)
+    host, port = server.start_in_thread()
+    url = 'http://{}:{}/sample'.format(host, port)
+
+    # Run
+    statuses = list()
+    try:
+        for query in ('', '?num_rows=0', '?num_rows=-4', '?num_rows=a'):
+            with pytest.raises(HTTPError) as error:
+                urlopen(url + query)
+
+            statuses.append(error.value.code)
+
+    finally:
+        server.stop_thread()
+
+    # Assert
+    assert statuses == [400, 400, 400, 400]
+    model.sample.assert_not_called()
+
+
+def test_batch_worker_error():
+    """An error processing a batch fails its requests and the next ones are still served."""
+    # Setup
+    model = _get_model()
+    server = SamplingServer(model, batch_delay=0.01)
+    draw = server._draw
+    server._draw = Mock(side_effect=ValueError('broken batch'))
+    loop = asyncio.new_event_loop()
+
+    async def run():
+        await server.start()
+        try:
+            with pytest.raises(ValueError, match='broken batch'):
+                await server.sample(2)
+
+            server._draw.side_effect = draw
+            return await server.sample(3)
+        finally:
+            await server.stop()
+
+    # Run
+    result = loop.run_until_complete(run())
+    loop.close()
+
+    # Assert
+    assert list(result['a']) == [0, 1, 2]
+    assert server.get_stats()['errors'] == 1
+
+
+def test_sample_pool():
+    """Rows are served from the buffer and the pool is refilled in the background."""
+    # Setup
+    model = _get_model()
+    pool = SamplePool(model, pool_size=10)
+    pool.start()
+
+    # Run
+    try:
+        assert pool.wait_until_full(timeout=5)
+        first = pool.take(4)
+        second = pool.take(8)
+        assert pool.wait_until_full(timeout=5)
+    finally:
+        pool.stop()
+
+    # Assert
+    assert list(first['a']) == [0, 1, 2, 3]
+    assert len(second) == 8
+
+    stats = pool.get_stats()
+    assert stats['requests'] == 2
+    assert stats['hits'] == 1
+    assert stats['hit_rate'] == 0.5
+    assert stats['refills'] >= 2
+
+
+def test_sample_pool_refill_error():
+    """Errors raised by the model in the background are raised by the pool."""
+    # Setup
+    model = Mock()
+    model.sample.side_effect = ValueError('broken model')
+    pool = SamplePool(model, pool_size=10)
+    pool.start()
+
+    # Run
+    try:
+        with pytest.raises(ValueError, match='broken model'):
+            pool.wait_until_full()
+
+        with pytest.raises(ValueError, match='broken model'):
+            pool.take(1)
+    finally:
+        pool.stop()
+
+
+def test_sample_pool_take_zero_rows():
+    """Taking zero rows from an empty buffer returns an empty table."""
+    pool = SamplePool(_get_model(), pool_size=10)
+
+    assert pool.take(0).empty
+
+
+def test_sample_pool_stop_not_started():
+    """Stopping a pool that was not started does nothing."""
+    pool = SamplePool(_get_model(), pool_size=10)
+
+    pool.stop()
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'pool_size': 0},
+    {'pool_size': 10, 'refill_rows': -1},
+    {'pool_size': 10, 'refill_threshold': 0},
+    {'pool_size': 10, 'refill_threshold': 11},
+])
+def test_sample_pool_invalid_sizes(kwargs):
+    """Non positive sizes and thresholds above ``pool_size`` raise a ``ValueError``."""
+    with pytest.raises(ValueError):
+        SamplePool(_get_model(), **kwargs)
+
+
+def test_sample_pool_sample_lock():
+    """The refill thread and the misses of ``take`` never sample at the same time."""
+    # Setup
+    active = []
+    overlaps = []
+
+    def sample(num_rows):
+        active.append(num_rows)
+        overlaps.append(len(active))
+        time.sleep(0.01)
+        active.pop()
+        return pd.DataFrame({'a': range(num_rows)})
+
+    model = Mock()
+    model.sample.side_effect = sample
+    pool = SamplePool(model, pool_size=10, refill_rows=2)
+    threads = [threading.Thread(target=pool.take, args=(15, )) for _ in range(4)]
+
+    # Run
+    pool.start()
+    try:
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+    finally:
+        pool.stop()
+
+    # Assert
+    assert max(overlaps) == 1
+    assert model.sample.call_count > 4